@@ -0,0 +1,24 @@
+-- =============================================================================
+-- Migration 005: Decklist Signatures Table
+-- Date: 2026-10-19
+-- Description: Persists MinHash signatures of classified decklists so the
+--              nearest-neighbour fallback classifier (scripts/decklist_similarity.py)
+--              can rebuild its LSH index incrementally instead of re-parsing
+--              every decklist_json on each run
+--
+-- Changes:
+--   1. Create decklist_signatures table
+--   2. Add index for archetype lookups
+-- =============================================================================
+
+-- 1. Create decklist_signatures table
+-- One row per classified result with a decklist; signature is NUM_PERM (64) MinHash values
+CREATE TABLE IF NOT EXISTS decklist_signatures (
+    result_id INTEGER PRIMARY KEY REFERENCES results(result_id) ON DELETE CASCADE,
+    archetype_id INTEGER REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    signature BIGINT[] NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 2. Create index for archetype lookups
+CREATE INDEX IF NOT EXISTS idx_decklist_signatures_archetype ON decklist_signatures(archetype_id);
@@ -0,0 +1,14 @@
+-- =============================================================================
+-- Migration 006: Clustered Deck Requests
+-- Date: 2026-10-19
+-- Description: Near-duplicate unclassifiable decklists are now grouped into a
+--              single deck request by run_classify_decklists(). The request
+--              records every member result so admins can see the cluster size;
+--              approval still resolves members via results.pending_deck_request_id.
+--
+-- Changes:
+--   1. Add member_result_ids column to deck_requests
+-- =============================================================================
+
+-- 1. JSON array of result_ids covered by this request (stored as text)
+ALTER TABLE deck_requests ADD COLUMN IF NOT EXISTS member_result_ids TEXT;
@@ -0,0 +1,28 @@
+-- =============================================================================
+-- Migration 007: Result Cards Table
+-- Date: 2026-10-19
+-- Description: Normalizes decklists into one row per (result, card, category)
+--              so card-usage and archetype-card queries can use indexed joins
+--              instead of re-parsing results.decklist_json. Populated at ingest
+--              by sync_limitless.py (COPY) and for existing rows with
+--              `sync_limitless.py --backfill-cards`
+--
+-- Changes:
+--   1. Create result_cards table
+--   2. Add indexes for result and card lookups
+-- =============================================================================
+
+-- 1. Create result_cards table
+-- card_id is NULL when the decklist entry carries no set/number; card_name is kept
+-- alongside because classification rules match on names
+CREATE TABLE IF NOT EXISTS result_cards (
+    result_id INTEGER NOT NULL REFERENCES results(result_id) ON DELETE CASCADE,
+    card_id VARCHAR,
+    card_name VARCHAR,
+    category VARCHAR NOT NULL,
+    count INTEGER NOT NULL DEFAULT 1
+);
+
+-- 2. Create indexes for result and card lookups
+CREATE INDEX IF NOT EXISTS idx_result_cards_result ON result_cards(result_id);
+CREATE INDEX IF NOT EXISTS idx_result_cards_card ON result_cards(card_id);
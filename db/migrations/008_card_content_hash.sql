@@ -0,0 +1,14 @@
+-- =============================================================================
+-- Migration 008: Card Content Hash
+-- Date: 2026-10-19
+-- Description: sync_cards.py hashes each card's synced columns and stores the
+--              hash, so upserts skip unchanged cards and each run can emit a
+--              delta manifest (logs/card_sync_delta_*.json) for downstream
+--              consumers. Existing rows get their hash on the next sync.
+--
+-- Changes:
+--   1. Add content_hash column to cards
+-- =============================================================================
+
+-- 1. 16-hex-digit SHA-1 prefix over the synced card columns
+ALTER TABLE cards ADD COLUMN IF NOT EXISTS content_hash VARCHAR;
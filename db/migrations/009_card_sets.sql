@@ -0,0 +1,26 @@
+-- =============================================================================
+-- Migration 009: Card Set Catalog
+-- Date: 2026-10-19
+-- Description: Persisted catalog of DigimonCard.io packs for sync_cards.py.
+--              A 7-request color scan records each set's current card count;
+--              --by-set syncs then fetch only packs that are new or whose count
+--              changed since their last fetch. New numbered sets (BT-25, ...)
+--              are added automatically; get_all_sets() only seeds the table.
+--
+-- Changes:
+--   1. Create card_sets table
+-- =============================================================================
+
+-- 1. Create card_sets table
+-- set_code is the card-id group the scan counts under ('BT13', 'ST1', 'LM', or 'P' for promo packs),
+-- so card_count is shared by every pack in a group
+CREATE TABLE IF NOT EXISTS card_sets (
+    pack VARCHAR PRIMARY KEY,
+    set_code VARCHAR NOT NULL,
+    sort_order INTEGER NOT NULL,
+    card_count INTEGER,
+    fetched_count INTEGER,
+    last_seen_at TIMESTAMP,
+    last_fetched_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,35 @@
+-- =============================================================================
+-- Migration 010: Weekly Meta Aggregates
+-- Date: 2026-10-19
+-- Description: Pre-aggregated archetype counts per format x scene x week, so
+--              the dashboard's meta share, top 3 conversion and win rate read
+--              a few summary rows instead of grouping all results per session.
+--              Maintained by scripts/meta_aggregates.py (after each Limitless
+--              sync) and refresh_meta_weekly_stats() in R/meta_aggregates.R
+--              (after manual result entry); only touched buckets are rebuilt.
+--
+-- Changes:
+--   1. Create meta_weekly_stats table
+-- =============================================================================
+
+-- 1. Create meta_weekly_stats table
+-- Counts are additive across buckets; the *_share/_rate columns are for a single bucket
+CREATE TABLE IF NOT EXISTS meta_weekly_stats (
+    format VARCHAR NOT NULL,
+    scene_id INTEGER NOT NULL,          -- stores.scene_id (0 = store without a scene)
+    week_start DATE NOT NULL,           -- Monday of the event week
+    archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    entries INTEGER NOT NULL,
+    first_places INTEGER NOT NULL,
+    top3 INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    meta_share NUMERIC(5, 1),           -- % of the bucket's entries (UNKNOWN excluded)
+    top3_rate NUMERIC(5, 1),            -- % of entries finishing top 3
+    win_rate NUMERIC(5, 1),             -- wins / (wins + losses)
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (format, scene_id, week_start, archetype_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_meta_weekly_stats_week ON meta_weekly_stats(week_start);
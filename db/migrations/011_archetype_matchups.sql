@@ -0,0 +1,28 @@
+-- =============================================================================
+-- Migration 011: Archetype Matchup Matrix
+-- Date: 2026-10-19
+-- Description: Per-format archetype-vs-archetype match records, built from
+--              matches joined to both players' results, with Wilson score
+--              intervals precomputed for display. Maintained by
+--              scripts/meta_aggregates.py after each Limitless sync; only the
+--              archetype pairs played in newly imported tournaments are rebuilt.
+--
+-- Changes:
+--   1. Create archetype_matchups table
+-- =============================================================================
+
+-- 1. Create archetype_matchups table
+-- One row per ordered pair, from archetype_id's perspective ((A, B) wins = (B, A) losses)
+CREATE TABLE IF NOT EXISTS archetype_matchups (
+    format VARCHAR NOT NULL,
+    archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    opponent_archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    win_rate NUMERIC(5, 1),             -- wins / (wins + losses), %
+    win_rate_low NUMERIC(5, 1),         -- 95% Wilson score interval, %
+    win_rate_high NUMERIC(5, 1),
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (format, archetype_id, opponent_archetype_id)
+);
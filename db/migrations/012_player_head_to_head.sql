@@ -0,0 +1,26 @@
+-- =============================================================================
+-- Migration 012: Player Head-to-Head Records
+-- Date: 2026-10-19
+-- Description: Per player pair match record (wins, losses, ties, last played),
+--              so head-to-head lookups are a single primary-key read instead of
+--              aggregating matches on every view. Maintained by
+--              scripts/meta_aggregates.py after each Limitless sync and by
+--              R/meta_aggregates.R after match history submission; only the
+--              pairs in newly inserted matches are rebuilt.
+--
+-- Changes:
+--   1. Create player_head_to_head table
+-- =============================================================================
+
+-- 1. Create player_head_to_head table
+-- One row per ordered pair, from player_id's perspective ((A, B) wins = (B, A) losses)
+CREATE TABLE IF NOT EXISTS player_head_to_head (
+    player_id INTEGER NOT NULL REFERENCES players(player_id) ON DELETE CASCADE,
+    opponent_id INTEGER NOT NULL REFERENCES players(player_id) ON DELETE CASCADE,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    last_played DATE,                   -- Latest event_date the pair met
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_id, opponent_id)
+);
@@ -0,0 +1,26 @@
+-- =============================================================================
+-- Migration 013: Result Tiebreakers
+-- Date: 2026-10-19
+-- Description: Swiss tiebreakers (OMW%, OOMW%, strength of schedule) for each
+--              result, computed from the tournament's match graph by
+--              scripts/tiebreakers.py after each Limitless sync, so
+--              tiebreak-aware analytics don't recompute them from matches.
+--
+-- Changes:
+--   1. Create result_tiebreakers table
+-- =============================================================================
+
+-- 1. Create result_tiebreakers table
+CREATE TABLE IF NOT EXISTS result_tiebreakers (
+    result_id INTEGER PRIMARY KEY REFERENCES results(result_id) ON DELETE CASCADE,
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(tournament_id) ON DELETE CASCADE,
+    match_points INTEGER NOT NULL,      -- 3 * wins + ties
+    mw_pct NUMERIC(5, 2),               -- Own match win %, floored at 33.33
+    omw_pct NUMERIC(5, 2),              -- Mean mw_pct of opponents faced
+    oomw_pct NUMERIC(5, 2),             -- Mean omw_pct of opponents faced
+    sos INTEGER,                        -- Sum of opponents' match points
+    opponents INTEGER NOT NULL,         -- Matches counted (byes excluded)
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_result_tiebreakers_tournament ON result_tiebreakers(tournament_id);
@@ -0,0 +1,32 @@
+-- =============================================================================
+-- Migration 014: Daily Meta Trend Store
+-- Date: 2026-10-19
+-- Description: Per format x scene x event day, each archetype's entries and
+--              top 3 finishes plus its trailing 7/30/90-day entry counts and
+--              meta shares, so trend charts read one row per day instead of
+--              grouping the results history by date. Maintained by
+--              scripts/meta_aggregates.py after each Limitless sync (new days
+--              are appended) and by R/meta_aggregates.R after result entry.
+--
+-- Changes:
+--   1. Create meta_trend_daily table
+-- =============================================================================
+
+-- 1. Create meta_trend_daily table
+-- One row per event day for every archetype seen in the trailing 90 days
+CREATE TABLE IF NOT EXISTS meta_trend_daily (
+    format VARCHAR NOT NULL,
+    scene_id INTEGER NOT NULL,          -- 0 = stores without a scene
+    event_date DATE NOT NULL,
+    archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    entries INTEGER NOT NULL,           -- Entries on event_date
+    top_finishes INTEGER NOT NULL,      -- Placements 1-3 on event_date
+    entries_7d INTEGER NOT NULL,        -- Entries in the 7 days ending on event_date
+    entries_30d INTEGER NOT NULL,
+    entries_90d INTEGER NOT NULL,
+    share_7d NUMERIC(5, 1),             -- entries_7d / all entries in the window, %
+    share_30d NUMERIC(5, 1),
+    share_90d NUMERIC(5, 1),
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (format, scene_id, event_date, archetype_id)
+);
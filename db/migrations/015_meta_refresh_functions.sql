@@ -0,0 +1,304 @@
+-- =============================================================================
+-- Migration 015: Meta Aggregate Refresh Functions
+-- Date: 2026-10-19
+-- Description: Moves the rebuilds of meta_weekly_stats, meta_trend_daily,
+--              archetype_matchups and player_head_to_head into the database,
+--              so scripts/meta_aggregates.py (after each Limitless sync) and
+--              R/meta_aggregates.R (after manual edits) run the same SQL.
+--
+--              Capture functions return the keys (weekly buckets, matchup
+--              cells, player pairs) a set of tournaments contributes to. Call
+--              them before deleting or changing tournaments, results or
+--              matches, then pass the keys to the rebuild functions together
+--              with the keys captured afterwards. A NULL key array rebuilds
+--              the whole table.
+--
+-- Changes:
+--   1. Create match_perspectives and archetype_match_rows views
+--   2. Create wilson_bound function
+--   3. Create capture functions
+--   4. Create rebuild functions
+-- =============================================================================
+
+-- 1. Create match_perspectives and archetype_match_rows views
+-- One row per match and perspective. A match stored for one player only
+-- (manual match history) is mirrored for the opponent, a loss with 0 points
+-- taken as the opponent's win
+CREATE OR REPLACE VIEW match_perspectives AS
+SELECT m.tournament_id, m.player_id, m.opponent_id, m.match_points
+FROM matches m
+UNION ALL
+SELECT m.tournament_id, m.opponent_id, m.player_id,
+       CASE m.match_points WHEN 3 THEN 0 WHEN 0 THEN 3 ELSE m.match_points END
+FROM matches m
+WHERE NOT EXISTS (
+    SELECT 1 FROM matches m2
+    WHERE m2.tournament_id = m.tournament_id
+      AND m2.round_number = m.round_number
+      AND m2.player_id = m.opponent_id
+);
+
+-- match_perspectives with both players' archetypes. UNKNOWN or unclassified
+-- decks on either side are left out
+CREATE OR REPLACE VIEW archetype_match_rows AS
+SELECT mp.tournament_id, t.format, pr.archetype_id, opr.archetype_id AS opponent_archetype_id, mp.match_points
+FROM match_perspectives mp
+JOIN tournaments t ON mp.tournament_id = t.tournament_id
+JOIN results pr ON pr.tournament_id = mp.tournament_id AND pr.player_id = mp.player_id
+JOIN results opr ON opr.tournament_id = mp.tournament_id AND opr.player_id = mp.opponent_id
+JOIN deck_archetypes da ON pr.archetype_id = da.archetype_id AND da.archetype_name != 'UNKNOWN'
+JOIN deck_archetypes oda ON opr.archetype_id = oda.archetype_id AND oda.archetype_name != 'UNKNOWN'
+WHERE t.format IS NOT NULL;
+
+-- 2. Create wilson_bound function
+-- Lower (sign -1) or upper (sign 1) bound of the 95% Wilson score interval, in %
+CREATE OR REPLACE FUNCTION wilson_bound(wins BIGINT, n BIGINT, sign INTEGER)
+RETURNS NUMERIC AS $$
+    SELECT CASE WHEN n > 0 THEN ROUND((100 * (
+        (p + z * z / 2 / n + sign * z * SQRT(p * (1 - p) / n + z * z / 4 / (n::float8 * n)))
+        / (1 + z * z / n)
+    ))::numeric, 1) END
+    FROM (SELECT wins::float8 / NULLIF(n, 0) AS p, 1.96::float8 AS z) c
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 3. Create capture functions (NULL tournament_ids = all tournaments)
+-- meta_weekly_stats buckets (format x scene x week) of tournaments, scene 0 =
+-- stores without a scene. Also the meta_trend_daily starting points.
+CREATE OR REPLACE FUNCTION meta_weekly_buckets(tournament_ids INTEGER[])
+RETURNS TABLE (format VARCHAR, scene_id INTEGER, week_start DATE) AS $$
+    SELECT DISTINCT t.format, COALESCE(s.scene_id, 0), date_trunc('week', t.event_date)::date
+    FROM tournaments t
+    JOIN stores s ON t.store_id = s.store_id
+    WHERE t.format IS NOT NULL
+      AND (tournament_ids IS NULL OR t.tournament_id = ANY(tournament_ids))
+$$ LANGUAGE sql STABLE;
+
+-- archetype_matchups cells played in tournaments
+CREATE OR REPLACE FUNCTION archetype_matchup_cells(tournament_ids INTEGER[])
+RETURNS TABLE (format VARCHAR, archetype_id INTEGER, opponent_archetype_id INTEGER) AS $$
+    SELECT DISTINCT x.format, x.archetype_id, x.opponent_archetype_id
+    FROM archetype_match_rows x
+    WHERE tournament_ids IS NULL OR x.tournament_id = ANY(tournament_ids)
+$$ LANGUAGE sql STABLE;
+
+-- player_head_to_head pairs that met in tournaments (both orientations)
+CREATE OR REPLACE FUNCTION head_to_head_pairs(tournament_ids INTEGER[])
+RETURNS TABLE (player_id INTEGER, opponent_id INTEGER) AS $$
+    SELECT DISTINCT mp.player_id, mp.opponent_id
+    FROM match_perspectives mp
+    WHERE tournament_ids IS NULL OR mp.tournament_id = ANY(tournament_ids)
+$$ LANGUAGE sql STABLE;
+
+-- player_head_to_head pairs involving players, stored or in matches (e.g. after a merge)
+CREATE OR REPLACE FUNCTION head_to_head_player_pairs(player_ids INTEGER[])
+RETURNS TABLE (player_id INTEGER, opponent_id INTEGER) AS $$
+    SELECT h.player_id, h.opponent_id
+    FROM player_head_to_head h
+    WHERE h.player_id = ANY(player_ids) OR h.opponent_id = ANY(player_ids)
+    UNION
+    SELECT mp.player_id, mp.opponent_id
+    FROM match_perspectives mp
+    WHERE mp.player_id = ANY(player_ids) OR mp.opponent_id = ANY(player_ids)
+$$ LANGUAGE sql STABLE;
+
+-- 4. Create rebuild functions (NULL key arrays = rebuild the whole table)
+-- Recount meta_weekly_stats buckets, returns rows written
+CREATE OR REPLACE FUNCTION rebuild_meta_weekly_stats(bucket_formats VARCHAR[], bucket_scene_ids INTEGER[],
+                                                     bucket_weeks DATE[])
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF bucket_formats IS NULL THEN
+        DELETE FROM meta_weekly_stats;
+    ELSE
+        DELETE FROM meta_weekly_stats m
+        USING unnest(bucket_formats, bucket_scene_ids, bucket_weeks) AS b(format, scene_id, week_start)
+        WHERE m.format = b.format AND m.scene_id = b.scene_id AND m.week_start = b.week_start;
+    END IF;
+
+    INSERT INTO meta_weekly_stats (format, scene_id, week_start, archetype_id,
+                                   entries, first_places, top3, wins, losses, ties,
+                                   meta_share, top3_rate, win_rate)
+    SELECT b.format, b.scene_id, b.week_start, r.archetype_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE r.placement = 1),
+           COUNT(*) FILTER (WHERE r.placement <= 3),
+           COALESCE(SUM(r.wins), 0),
+           COALESCE(SUM(r.losses), 0),
+           COALESCE(SUM(r.ties), 0),
+           ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY b.format, b.scene_id, b.week_start), 1),
+           ROUND(COUNT(*) FILTER (WHERE r.placement <= 3) * 100.0 / COUNT(*), 1),
+           ROUND(SUM(r.wins) * 100.0 / NULLIF(SUM(r.wins) + SUM(r.losses), 0), 1)
+    FROM (
+        SELECT t.tournament_id, t.format, COALESCE(s.scene_id, 0) AS scene_id,
+               date_trunc('week', t.event_date)::date AS week_start
+        FROM tournaments t
+        JOIN stores s ON t.store_id = s.store_id
+        WHERE t.format IS NOT NULL
+    ) b
+    JOIN results r ON r.tournament_id = b.tournament_id
+    JOIN deck_archetypes da ON r.archetype_id = da.archetype_id AND da.archetype_name != 'UNKNOWN'
+    WHERE bucket_formats IS NULL
+       OR (b.format, b.scene_id, b.week_start) IN (
+           SELECT * FROM unnest(bucket_formats, bucket_scene_ids, bucket_weeks))
+    GROUP BY b.format, b.scene_id, b.week_start, r.archetype_id;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute meta_trend_daily per format x scene from its earliest given date
+-- onward (7/30/90-day windows), returns event days and rows written
+CREATE OR REPLACE FUNCTION rebuild_meta_trend_daily(start_formats VARCHAR[], start_scene_ids INTEGER[],
+                                                    start_dates DATE[])
+RETURNS TABLE (trend_days INTEGER, trend_rows INTEGER) AS $$
+BEGIN
+    IF start_formats IS NULL THEN
+        DELETE FROM meta_trend_daily;
+        SELECT array_agg(b.format), array_agg(b.scene_id), array_agg(b.week_start)
+        INTO start_formats, start_scene_ids, start_dates
+        FROM meta_weekly_buckets(NULL) b;
+    ELSE
+        DELETE FROM meta_trend_daily m
+        USING unnest(start_formats, start_scene_ids, start_dates) AS st(format, scene_id, from_date)
+        WHERE m.format = st.format AND m.scene_id = st.scene_id AND m.event_date >= st.from_date;
+    END IF;
+
+    WITH starts AS (
+        SELECT st.format, st.scene_id, MIN(st.from_date) AS from_date
+        FROM unnest(start_formats, start_scene_ids, start_dates) AS st(format, scene_id, from_date)
+        GROUP BY st.format, st.scene_id
+    ),
+    daily AS (
+        SELECT st.format, st.scene_id, t.event_date, r.archetype_id,
+               COUNT(*) AS entries,
+               COUNT(*) FILTER (WHERE r.placement <= 3) AS top_finishes
+        FROM starts st
+        JOIN tournaments t ON t.format = st.format AND t.event_date > st.from_date - 90
+        JOIN stores s ON t.store_id = s.store_id AND COALESCE(s.scene_id, 0) = st.scene_id
+        JOIN results r ON r.tournament_id = t.tournament_id
+        JOIN deck_archetypes da ON r.archetype_id = da.archetype_id AND da.archetype_name != 'UNKNOWN'
+        GROUP BY st.format, st.scene_id, t.event_date, r.archetype_id
+    ),
+    days AS (
+        SELECT DISTINCT x.format, x.scene_id, x.event_date
+        FROM daily x
+        JOIN starts st ON x.format = st.format AND x.scene_id = st.scene_id
+        WHERE x.event_date >= st.from_date
+    ),
+    windows AS (
+        SELECT d.format, d.scene_id, d.event_date, x.archetype_id,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date = d.event_date), 0) AS entries,
+               COALESCE(SUM(x.top_finishes) FILTER (WHERE x.event_date = d.event_date), 0) AS top_finishes,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date > d.event_date - 7), 0) AS entries_7d,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date > d.event_date - 30), 0) AS entries_30d,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date > d.event_date - 90), 0) AS entries_90d
+        FROM days d
+        JOIN daily x ON x.format = d.format AND x.scene_id = d.scene_id
+                    AND x.event_date > d.event_date - 90 AND x.event_date <= d.event_date
+        GROUP BY d.format, d.scene_id, d.event_date, x.archetype_id
+    )
+    INSERT INTO meta_trend_daily (format, scene_id, event_date, archetype_id, entries, top_finishes,
+                                  entries_7d, entries_30d, entries_90d, share_7d, share_30d, share_90d)
+    SELECT w.format, w.scene_id, w.event_date, w.archetype_id, w.entries, w.top_finishes,
+           w.entries_7d, w.entries_30d, w.entries_90d,
+           ROUND(w.entries_7d * 100.0 / NULLIF(SUM(w.entries_7d) OVER p, 0), 1),
+           ROUND(w.entries_30d * 100.0 / NULLIF(SUM(w.entries_30d) OVER p, 0), 1),
+           ROUND(w.entries_90d * 100.0 / NULLIF(SUM(w.entries_90d) OVER p, 0), 1)
+    FROM windows w
+    WINDOW p AS (PARTITION BY w.format, w.scene_id, w.event_date);
+
+    GET DIAGNOSTICS trend_rows = ROW_COUNT;
+
+    SELECT COUNT(*) INTO trend_days
+    FROM (
+        SELECT DISTINCT m.format, m.scene_id, m.event_date
+        FROM meta_trend_daily m
+        JOIN unnest(start_formats, start_scene_ids, start_dates) AS st(format, scene_id, from_date)
+          ON m.format = st.format AND m.scene_id = st.scene_id AND m.event_date >= st.from_date
+    ) d;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recount archetype_matchups cells over their whole format, returns cells written
+CREATE OR REPLACE FUNCTION rebuild_archetype_matchups(cell_formats VARCHAR[], cell_archetype_ids INTEGER[],
+                                                      cell_opponent_ids INTEGER[])
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF cell_formats IS NULL THEN
+        DELETE FROM archetype_matchups;
+    ELSE
+        DELETE FROM archetype_matchups m
+        USING unnest(cell_formats, cell_archetype_ids, cell_opponent_ids)
+              AS c(format, archetype_id, opponent_archetype_id)
+        WHERE m.format = c.format
+          AND m.archetype_id = c.archetype_id
+          AND m.opponent_archetype_id = c.opponent_archetype_id;
+    END IF;
+
+    INSERT INTO archetype_matchups (format, archetype_id, opponent_archetype_id,
+                                    wins, losses, ties, win_rate, win_rate_low, win_rate_high)
+    SELECT x.format, x.archetype_id, x.opponent_archetype_id,
+           x.wins, x.losses, x.ties,
+           ROUND(x.wins * 100.0 / NULLIF(x.wins + x.losses, 0), 1),
+           wilson_bound(x.wins, x.wins + x.losses, -1),
+           wilson_bound(x.wins, x.wins + x.losses, 1)
+    FROM (
+        SELECT a.format, a.archetype_id, a.opponent_archetype_id,
+               COUNT(*) FILTER (WHERE a.match_points = 3) AS wins,
+               COUNT(*) FILTER (WHERE a.match_points = 0) AS losses,
+               COUNT(*) FILTER (WHERE a.match_points = 1) AS ties
+        FROM archetype_match_rows a
+        WHERE cell_formats IS NULL
+           OR (a.format = ANY(cell_formats)
+               AND (a.format, a.archetype_id, a.opponent_archetype_id) IN (
+                   SELECT * FROM unnest(cell_formats, cell_archetype_ids, cell_opponent_ids)))
+        GROUP BY a.format, a.archetype_id, a.opponent_archetype_id
+    ) x;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recount player_head_to_head pairs (both orientations) over all matches,
+-- returns rows written
+CREATE OR REPLACE FUNCTION rebuild_head_to_head(pair_player_ids INTEGER[], pair_opponent_ids INTEGER[])
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF pair_player_ids IS NULL THEN
+        DELETE FROM player_head_to_head;
+    ELSE
+        DELETE FROM player_head_to_head h
+        WHERE (h.player_id, h.opponent_id) IN (
+            SELECT * FROM unnest(pair_player_ids, pair_opponent_ids)
+            UNION ALL
+            SELECT * FROM unnest(pair_opponent_ids, pair_player_ids));
+    END IF;
+
+    INSERT INTO player_head_to_head (player_id, opponent_id, wins, losses, ties, last_played)
+    SELECT mp.player_id, mp.opponent_id,
+           COUNT(*) FILTER (WHERE mp.match_points = 3),
+           COUNT(*) FILTER (WHERE mp.match_points = 0),
+           COUNT(*) FILTER (WHERE mp.match_points = 1),
+           MAX(t.event_date)
+    FROM match_perspectives mp
+    JOIN tournaments t ON mp.tournament_id = t.tournament_id
+    WHERE pair_player_ids IS NULL
+       OR (mp.player_id, mp.opponent_id) IN (
+           SELECT * FROM unnest(pair_player_ids, pair_opponent_ids)
+           UNION ALL
+           SELECT * FROM unnest(pair_opponent_ids, pair_player_ids))
+    GROUP BY mp.player_id, mp.opponent_id;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
@@ -3,6 +3,9 @@
 -- Version: 1.4.0
 -- Created: January 2026
 -- Updated: 2026-03-06 - Added admin_requests, announcements, audit columns, schedule qualifiers
+-- Updated: 2026-10-19 - Added decklist_signatures, deck_requests.member_result_ids, result_cards, cards.content_hash, card_sets,
+--                      meta_weekly_stats, archetype_matchups, player_head_to_head, result_tiebreakers,
+--                      meta_trend_daily
 
 -- =============================================================================
 -- SCENES TABLE
@@ -125,6 +128,7 @@ CREATE TABLE IF NOT EXISTS cards (
     stage VARCHAR,                        -- e.g., "Mega"
     rarity VARCHAR,                       -- e.g., "SR"
     set_code VARCHAR,                     -- e.g., "BT13" (extracted from card_id)
+    content_hash VARCHAR,                 -- Hash of the synced columns (sync_cards.py change detection)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -135,6 +139,22 @@ CREATE INDEX IF NOT EXISTS idx_cards_type ON cards(card_type);
 CREATE INDEX IF NOT EXISTS idx_cards_color ON cards(color);
 CREATE INDEX IF NOT EXISTS idx_cards_set ON cards(set_code);
 
+-- =============================================================================
+-- CARD SETS TABLE
+-- DigimonCard.io pack catalog maintained by sync_cards.py
+-- Only packs that are new or whose card count changed are re-fetched
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS card_sets (
+    pack VARCHAR PRIMARY KEY,             -- API pack name, e.g., "BT-13", "Tamer Battle Pack 4"
+    set_code VARCHAR NOT NULL,            -- Card-id group: "BT13", "ST1", "LM", "P" (promo packs)
+    sort_order INTEGER NOT NULL,          -- Sync priority (earlier pack wins duplicate card_ids)
+    card_count INTEGER,                   -- Group card count from the latest color scan
+    fetched_count INTEGER,                -- Group card count when this pack was last fetched
+    last_seen_at TIMESTAMP,
+    last_fetched_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- =============================================================================
 -- PLAYERS TABLE
 -- Tracks players participating in local tournaments
@@ -215,7 +235,8 @@ CREATE TABLE IF NOT EXISTS deck_requests (
     suggested_archetype_name VARCHAR,  -- What classification thought it was (may not exist in DB yet)
     decklist_json TEXT,                -- The actual card list for admin review
     source VARCHAR DEFAULT 'manual',   -- 'manual', 'limitless_sync', 'classification'
-    result_id INTEGER                  -- Link back to result for updating after approval
+    result_id INTEGER,                 -- Link back to result for updating after approval
+    member_result_ids TEXT             -- JSON array of all result_ids covered (clustered requests)
 );
 
 -- Create index for pending requests lookup
@@ -376,10 +397,143 @@ CREATE TABLE IF NOT EXISTS rating_snapshots (
 
 CREATE INDEX IF NOT EXISTS idx_rating_snapshots_format ON rating_snapshots(format_id);
 
+-- =============================================================================
+-- DECKLIST SIGNATURES TABLE
+-- MinHash signatures of classified decklists for the nearest-neighbour
+-- fallback classifier (scripts/decklist_similarity.py), refreshed incrementally
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS decklist_signatures (
+    result_id INTEGER PRIMARY KEY REFERENCES results(result_id) ON DELETE CASCADE,
+    archetype_id INTEGER REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    signature BIGINT[] NOT NULL,      -- 64 MinHash values over the decklist's card names
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_decklist_signatures_archetype ON decklist_signatures(archetype_id);
+
+-- =============================================================================
+-- RESULT CARDS TABLE
+-- Normalized decklist contents, one row per (result, card, category)
+-- Written at ingest by sync_limitless.py (backfill with --backfill-cards)
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS result_cards (
+    result_id INTEGER NOT NULL REFERENCES results(result_id) ON DELETE CASCADE,
+    card_id VARCHAR,                  -- e.g., 'BT13-087' (NULL if the entry has no set/number)
+    card_name VARCHAR,
+    category VARCHAR NOT NULL,        -- 'digimon', 'tamer', 'option', 'egg'
+    count INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE INDEX IF NOT EXISTS idx_result_cards_result ON result_cards(result_id);
+CREATE INDEX IF NOT EXISTS idx_result_cards_card ON result_cards(card_id);
+
+-- =============================================================================
+-- META WEEKLY STATS TABLE
+-- Archetype counts per format x scene x week for the dashboard's meta charts
+-- Touched buckets are rebuilt by scripts/meta_aggregates.py and R/meta_aggregates.R
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS meta_weekly_stats (
+    format VARCHAR NOT NULL,
+    scene_id INTEGER NOT NULL,          -- stores.scene_id (0 = store without a scene)
+    week_start DATE NOT NULL,           -- Monday of the event week
+    archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    entries INTEGER NOT NULL,
+    first_places INTEGER NOT NULL,
+    top3 INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    meta_share NUMERIC(5, 1),           -- % of the bucket's entries (UNKNOWN excluded)
+    top3_rate NUMERIC(5, 1),            -- % of entries finishing top 3
+    win_rate NUMERIC(5, 1),             -- wins / (wins + losses)
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (format, scene_id, week_start, archetype_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_meta_weekly_stats_week ON meta_weekly_stats(week_start);
+
+-- =============================================================================
+-- ARCHETYPE MATCHUPS TABLE
+-- Per-format archetype-vs-archetype match records with Wilson intervals
+-- Pairs played in new tournaments are rebuilt by scripts/meta_aggregates.py
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS archetype_matchups (
+    format VARCHAR NOT NULL,
+    archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    opponent_archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    win_rate NUMERIC(5, 1),             -- wins / (wins + losses), %
+    win_rate_low NUMERIC(5, 1),         -- 95% Wilson score interval, %
+    win_rate_high NUMERIC(5, 1),
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (format, archetype_id, opponent_archetype_id)
+);
+
+-- =============================================================================
+-- PLAYER HEAD-TO-HEAD TABLE
+-- Per player pair match records (both orientations stored)
+-- Pairs in newly inserted matches are rebuilt by scripts/meta_aggregates.py
+-- and R/meta_aggregates.R
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS player_head_to_head (
+    player_id INTEGER NOT NULL REFERENCES players(player_id) ON DELETE CASCADE,
+    opponent_id INTEGER NOT NULL REFERENCES players(player_id) ON DELETE CASCADE,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    last_played DATE,                   -- Latest event_date the pair met
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_id, opponent_id)
+);
+
+-- =============================================================================
+-- RESULT TIEBREAKERS TABLE
+-- Swiss tiebreakers per result, computed from the match graph
+-- New tournaments are computed by scripts/tiebreakers.py
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS result_tiebreakers (
+    result_id INTEGER PRIMARY KEY REFERENCES results(result_id) ON DELETE CASCADE,
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(tournament_id) ON DELETE CASCADE,
+    match_points INTEGER NOT NULL,      -- 3 * wins + ties
+    mw_pct NUMERIC(5, 2),               -- Own match win %, floored at 33.33
+    omw_pct NUMERIC(5, 2),              -- Mean mw_pct of opponents faced
+    oomw_pct NUMERIC(5, 2),             -- Mean omw_pct of opponents faced
+    sos INTEGER,                        -- Sum of opponents' match points
+    opponents INTEGER NOT NULL,         -- Matches counted (byes excluded)
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_result_tiebreakers_tournament ON result_tiebreakers(tournament_id);
+
+-- =============================================================================
+-- META TREND DAILY TABLE
+-- Per format x scene x event day archetype counts with 7/30/90-day rolling shares
+-- Days from new tournaments onward are rebuilt by scripts/meta_aggregates.py
+-- and R/meta_aggregates.R
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS meta_trend_daily (
+    format VARCHAR NOT NULL,
+    scene_id INTEGER NOT NULL,          -- 0 = stores without a scene
+    event_date DATE NOT NULL,
+    archetype_id INTEGER NOT NULL REFERENCES deck_archetypes(archetype_id) ON DELETE CASCADE,
+    entries INTEGER NOT NULL,           -- Entries on event_date
+    top_finishes INTEGER NOT NULL,      -- Placements 1-3 on event_date
+    entries_7d INTEGER NOT NULL,        -- Entries in the 7 days ending on event_date
+    entries_30d INTEGER NOT NULL,
+    entries_90d INTEGER NOT NULL,
+    share_7d NUMERIC(5, 1),             -- entries_7d / all entries in the window, %
+    share_30d NUMERIC(5, 1),
+    share_90d NUMERIC(5, 1),
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (format, scene_id, event_date, archetype_id)
+);
+
 -- =============================================================================
 -- LIMITLESS DECK MAP TABLE
 -- Maps Limitless TCG deck archetype identifiers to local deck_archetypes
--- Populated during sync; unmapped decks create deck_requests for admin review
+-- Populated during sync (unmapped decks create deck_requests for admin review)
 -- =============================================================================
 CREATE TABLE IF NOT EXISTS limitless_deck_map (
     limitless_deck_id VARCHAR NOT NULL PRIMARY KEY,  -- e.g., "imperialdramon"
@@ -528,3 +682,288 @@ LEFT JOIN tournaments t ON s.store_id = t.store_id
 LEFT JOIN results r ON t.tournament_id = r.tournament_id
 WHERE s.is_active = TRUE
 GROUP BY s.store_id, s.name, s.city, s.latitude, s.longitude, s.address, s.is_online;
+
+-- =============================================================================
+-- META AGGREGATE FUNCTIONS
+-- Shared by scripts/meta_aggregates.py and R/meta_aggregates.R: capture functions
+-- return the keys a set of tournaments touches (take them before a delete),
+-- rebuild functions recount those keys (NULL key arrays = the whole table)
+-- =============================================================================
+-- One row per match and perspective. A match stored for one player only
+-- (manual match history) is mirrored for the opponent, a loss with 0 points
+-- taken as the opponent's win
+CREATE OR REPLACE VIEW match_perspectives AS
+SELECT m.tournament_id, m.player_id, m.opponent_id, m.match_points
+FROM matches m
+UNION ALL
+SELECT m.tournament_id, m.opponent_id, m.player_id,
+       CASE m.match_points WHEN 3 THEN 0 WHEN 0 THEN 3 ELSE m.match_points END
+FROM matches m
+WHERE NOT EXISTS (
+    SELECT 1 FROM matches m2
+    WHERE m2.tournament_id = m.tournament_id
+      AND m2.round_number = m.round_number
+      AND m2.player_id = m.opponent_id
+);
+
+-- match_perspectives with both players' archetypes. UNKNOWN or unclassified
+-- decks on either side are left out
+CREATE OR REPLACE VIEW archetype_match_rows AS
+SELECT mp.tournament_id, t.format, pr.archetype_id, opr.archetype_id AS opponent_archetype_id, mp.match_points
+FROM match_perspectives mp
+JOIN tournaments t ON mp.tournament_id = t.tournament_id
+JOIN results pr ON pr.tournament_id = mp.tournament_id AND pr.player_id = mp.player_id
+JOIN results opr ON opr.tournament_id = mp.tournament_id AND opr.player_id = mp.opponent_id
+JOIN deck_archetypes da ON pr.archetype_id = da.archetype_id AND da.archetype_name != 'UNKNOWN'
+JOIN deck_archetypes oda ON opr.archetype_id = oda.archetype_id AND oda.archetype_name != 'UNKNOWN'
+WHERE t.format IS NOT NULL;
+
+-- Lower (sign -1) or upper (sign 1) bound of the 95% Wilson score interval, in %
+CREATE OR REPLACE FUNCTION wilson_bound(wins BIGINT, n BIGINT, sign INTEGER)
+RETURNS NUMERIC AS $$
+    SELECT CASE WHEN n > 0 THEN ROUND((100 * (
+        (p + z * z / 2 / n + sign * z * SQRT(p * (1 - p) / n + z * z / 4 / (n::float8 * n)))
+        / (1 + z * z / n)
+    ))::numeric, 1) END
+    FROM (SELECT wins::float8 / NULLIF(n, 0) AS p, 1.96::float8 AS z) c
+$$ LANGUAGE sql IMMUTABLE;
+
+-- meta_weekly_stats buckets (format x scene x week) of tournaments, scene 0 =
+-- stores without a scene. Also the meta_trend_daily starting points.
+CREATE OR REPLACE FUNCTION meta_weekly_buckets(tournament_ids INTEGER[])
+RETURNS TABLE (format VARCHAR, scene_id INTEGER, week_start DATE) AS $$
+    SELECT DISTINCT t.format, COALESCE(s.scene_id, 0), date_trunc('week', t.event_date)::date
+    FROM tournaments t
+    JOIN stores s ON t.store_id = s.store_id
+    WHERE t.format IS NOT NULL
+      AND (tournament_ids IS NULL OR t.tournament_id = ANY(tournament_ids))
+$$ LANGUAGE sql STABLE;
+
+-- archetype_matchups cells played in tournaments
+CREATE OR REPLACE FUNCTION archetype_matchup_cells(tournament_ids INTEGER[])
+RETURNS TABLE (format VARCHAR, archetype_id INTEGER, opponent_archetype_id INTEGER) AS $$
+    SELECT DISTINCT x.format, x.archetype_id, x.opponent_archetype_id
+    FROM archetype_match_rows x
+    WHERE tournament_ids IS NULL OR x.tournament_id = ANY(tournament_ids)
+$$ LANGUAGE sql STABLE;
+
+-- player_head_to_head pairs that met in tournaments (both orientations)
+CREATE OR REPLACE FUNCTION head_to_head_pairs(tournament_ids INTEGER[])
+RETURNS TABLE (player_id INTEGER, opponent_id INTEGER) AS $$
+    SELECT DISTINCT mp.player_id, mp.opponent_id
+    FROM match_perspectives mp
+    WHERE tournament_ids IS NULL OR mp.tournament_id = ANY(tournament_ids)
+$$ LANGUAGE sql STABLE;
+
+-- player_head_to_head pairs involving players, stored or in matches (e.g. after a merge)
+CREATE OR REPLACE FUNCTION head_to_head_player_pairs(player_ids INTEGER[])
+RETURNS TABLE (player_id INTEGER, opponent_id INTEGER) AS $$
+    SELECT h.player_id, h.opponent_id
+    FROM player_head_to_head h
+    WHERE h.player_id = ANY(player_ids) OR h.opponent_id = ANY(player_ids)
+    UNION
+    SELECT mp.player_id, mp.opponent_id
+    FROM match_perspectives mp
+    WHERE mp.player_id = ANY(player_ids) OR mp.opponent_id = ANY(player_ids)
+$$ LANGUAGE sql STABLE;
+
+-- Recount meta_weekly_stats buckets, returns rows written
+CREATE OR REPLACE FUNCTION rebuild_meta_weekly_stats(bucket_formats VARCHAR[], bucket_scene_ids INTEGER[],
+                                                     bucket_weeks DATE[])
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF bucket_formats IS NULL THEN
+        DELETE FROM meta_weekly_stats;
+    ELSE
+        DELETE FROM meta_weekly_stats m
+        USING unnest(bucket_formats, bucket_scene_ids, bucket_weeks) AS b(format, scene_id, week_start)
+        WHERE m.format = b.format AND m.scene_id = b.scene_id AND m.week_start = b.week_start;
+    END IF;
+
+    INSERT INTO meta_weekly_stats (format, scene_id, week_start, archetype_id,
+                                   entries, first_places, top3, wins, losses, ties,
+                                   meta_share, top3_rate, win_rate)
+    SELECT b.format, b.scene_id, b.week_start, r.archetype_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE r.placement = 1),
+           COUNT(*) FILTER (WHERE r.placement <= 3),
+           COALESCE(SUM(r.wins), 0),
+           COALESCE(SUM(r.losses), 0),
+           COALESCE(SUM(r.ties), 0),
+           ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY b.format, b.scene_id, b.week_start), 1),
+           ROUND(COUNT(*) FILTER (WHERE r.placement <= 3) * 100.0 / COUNT(*), 1),
+           ROUND(SUM(r.wins) * 100.0 / NULLIF(SUM(r.wins) + SUM(r.losses), 0), 1)
+    FROM (
+        SELECT t.tournament_id, t.format, COALESCE(s.scene_id, 0) AS scene_id,
+               date_trunc('week', t.event_date)::date AS week_start
+        FROM tournaments t
+        JOIN stores s ON t.store_id = s.store_id
+        WHERE t.format IS NOT NULL
+    ) b
+    JOIN results r ON r.tournament_id = b.tournament_id
+    JOIN deck_archetypes da ON r.archetype_id = da.archetype_id AND da.archetype_name != 'UNKNOWN'
+    WHERE bucket_formats IS NULL
+       OR (b.format, b.scene_id, b.week_start) IN (
+           SELECT * FROM unnest(bucket_formats, bucket_scene_ids, bucket_weeks))
+    GROUP BY b.format, b.scene_id, b.week_start, r.archetype_id;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute meta_trend_daily per format x scene from its earliest given date
+-- onward (7/30/90-day windows), returns event days and rows written
+CREATE OR REPLACE FUNCTION rebuild_meta_trend_daily(start_formats VARCHAR[], start_scene_ids INTEGER[],
+                                                    start_dates DATE[])
+RETURNS TABLE (trend_days INTEGER, trend_rows INTEGER) AS $$
+BEGIN
+    IF start_formats IS NULL THEN
+        DELETE FROM meta_trend_daily;
+        SELECT array_agg(b.format), array_agg(b.scene_id), array_agg(b.week_start)
+        INTO start_formats, start_scene_ids, start_dates
+        FROM meta_weekly_buckets(NULL) b;
+    ELSE
+        DELETE FROM meta_trend_daily m
+        USING unnest(start_formats, start_scene_ids, start_dates) AS st(format, scene_id, from_date)
+        WHERE m.format = st.format AND m.scene_id = st.scene_id AND m.event_date >= st.from_date;
+    END IF;
+
+    WITH starts AS (
+        SELECT st.format, st.scene_id, MIN(st.from_date) AS from_date
+        FROM unnest(start_formats, start_scene_ids, start_dates) AS st(format, scene_id, from_date)
+        GROUP BY st.format, st.scene_id
+    ),
+    daily AS (
+        SELECT st.format, st.scene_id, t.event_date, r.archetype_id,
+               COUNT(*) AS entries,
+               COUNT(*) FILTER (WHERE r.placement <= 3) AS top_finishes
+        FROM starts st
+        JOIN tournaments t ON t.format = st.format AND t.event_date > st.from_date - 90
+        JOIN stores s ON t.store_id = s.store_id AND COALESCE(s.scene_id, 0) = st.scene_id
+        JOIN results r ON r.tournament_id = t.tournament_id
+        JOIN deck_archetypes da ON r.archetype_id = da.archetype_id AND da.archetype_name != 'UNKNOWN'
+        GROUP BY st.format, st.scene_id, t.event_date, r.archetype_id
+    ),
+    days AS (
+        SELECT DISTINCT x.format, x.scene_id, x.event_date
+        FROM daily x
+        JOIN starts st ON x.format = st.format AND x.scene_id = st.scene_id
+        WHERE x.event_date >= st.from_date
+    ),
+    windows AS (
+        SELECT d.format, d.scene_id, d.event_date, x.archetype_id,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date = d.event_date), 0) AS entries,
+               COALESCE(SUM(x.top_finishes) FILTER (WHERE x.event_date = d.event_date), 0) AS top_finishes,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date > d.event_date - 7), 0) AS entries_7d,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date > d.event_date - 30), 0) AS entries_30d,
+               COALESCE(SUM(x.entries) FILTER (WHERE x.event_date > d.event_date - 90), 0) AS entries_90d
+        FROM days d
+        JOIN daily x ON x.format = d.format AND x.scene_id = d.scene_id
+                    AND x.event_date > d.event_date - 90 AND x.event_date <= d.event_date
+        GROUP BY d.format, d.scene_id, d.event_date, x.archetype_id
+    )
+    INSERT INTO meta_trend_daily (format, scene_id, event_date, archetype_id, entries, top_finishes,
+                                  entries_7d, entries_30d, entries_90d, share_7d, share_30d, share_90d)
+    SELECT w.format, w.scene_id, w.event_date, w.archetype_id, w.entries, w.top_finishes,
+           w.entries_7d, w.entries_30d, w.entries_90d,
+           ROUND(w.entries_7d * 100.0 / NULLIF(SUM(w.entries_7d) OVER p, 0), 1),
+           ROUND(w.entries_30d * 100.0 / NULLIF(SUM(w.entries_30d) OVER p, 0), 1),
+           ROUND(w.entries_90d * 100.0 / NULLIF(SUM(w.entries_90d) OVER p, 0), 1)
+    FROM windows w
+    WINDOW p AS (PARTITION BY w.format, w.scene_id, w.event_date);
+
+    GET DIAGNOSTICS trend_rows = ROW_COUNT;
+
+    SELECT COUNT(*) INTO trend_days
+    FROM (
+        SELECT DISTINCT m.format, m.scene_id, m.event_date
+        FROM meta_trend_daily m
+        JOIN unnest(start_formats, start_scene_ids, start_dates) AS st(format, scene_id, from_date)
+          ON m.format = st.format AND m.scene_id = st.scene_id AND m.event_date >= st.from_date
+    ) d;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recount archetype_matchups cells over their whole format, returns cells written
+CREATE OR REPLACE FUNCTION rebuild_archetype_matchups(cell_formats VARCHAR[], cell_archetype_ids INTEGER[],
+                                                      cell_opponent_ids INTEGER[])
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF cell_formats IS NULL THEN
+        DELETE FROM archetype_matchups;
+    ELSE
+        DELETE FROM archetype_matchups m
+        USING unnest(cell_formats, cell_archetype_ids, cell_opponent_ids)
+              AS c(format, archetype_id, opponent_archetype_id)
+        WHERE m.format = c.format
+          AND m.archetype_id = c.archetype_id
+          AND m.opponent_archetype_id = c.opponent_archetype_id;
+    END IF;
+
+    INSERT INTO archetype_matchups (format, archetype_id, opponent_archetype_id,
+                                    wins, losses, ties, win_rate, win_rate_low, win_rate_high)
+    SELECT x.format, x.archetype_id, x.opponent_archetype_id,
+           x.wins, x.losses, x.ties,
+           ROUND(x.wins * 100.0 / NULLIF(x.wins + x.losses, 0), 1),
+           wilson_bound(x.wins, x.wins + x.losses, -1),
+           wilson_bound(x.wins, x.wins + x.losses, 1)
+    FROM (
+        SELECT a.format, a.archetype_id, a.opponent_archetype_id,
+               COUNT(*) FILTER (WHERE a.match_points = 3) AS wins,
+               COUNT(*) FILTER (WHERE a.match_points = 0) AS losses,
+               COUNT(*) FILTER (WHERE a.match_points = 1) AS ties
+        FROM archetype_match_rows a
+        WHERE cell_formats IS NULL
+           OR (a.format = ANY(cell_formats)
+               AND (a.format, a.archetype_id, a.opponent_archetype_id) IN (
+                   SELECT * FROM unnest(cell_formats, cell_archetype_ids, cell_opponent_ids)))
+        GROUP BY a.format, a.archetype_id, a.opponent_archetype_id
+    ) x;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recount player_head_to_head pairs (both orientations) over all matches,
+-- returns rows written
+CREATE OR REPLACE FUNCTION rebuild_head_to_head(pair_player_ids INTEGER[], pair_opponent_ids INTEGER[])
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF pair_player_ids IS NULL THEN
+        DELETE FROM player_head_to_head;
+    ELSE
+        DELETE FROM player_head_to_head h
+        WHERE (h.player_id, h.opponent_id) IN (
+            SELECT * FROM unnest(pair_player_ids, pair_opponent_ids)
+            UNION ALL
+            SELECT * FROM unnest(pair_opponent_ids, pair_player_ids));
+    END IF;
+
+    INSERT INTO player_head_to_head (player_id, opponent_id, wins, losses, ties, last_played)
+    SELECT mp.player_id, mp.opponent_id,
+           COUNT(*) FILTER (WHERE mp.match_points = 3),
+           COUNT(*) FILTER (WHERE mp.match_points = 0),
+           COUNT(*) FILTER (WHERE mp.match_points = 1),
+           MAX(t.event_date)
+    FROM match_perspectives mp
+    JOIN tournaments t ON mp.tournament_id = t.tournament_id
+    WHERE pair_player_ids IS NULL
+       OR (mp.player_id, mp.opponent_id) IN (
+           SELECT * FROM unnest(pair_player_ids, pair_opponent_ids)
+           UNION ALL
+           SELECT * FROM unnest(pair_opponent_ids, pair_player_ids))
+    GROUP BY mp.player_id, mp.opponent_id;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
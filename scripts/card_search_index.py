@@ -0,0 +1,183 @@
+"""
+Card Search Index
+
+Builds a compact, versioned binary search index over the cards table so the
+Shiny app can answer card autocomplete from memory instead of querying Neon.
+
+The file is a single little-endian blob:
+
+    Header (64 bytes)
+        magic        8s   b"DLCSIDX\\0"
+        version      u32  INDEX_VERSION
+        card_count   u32
+        gram_count   u32
+        posting_count u32
+        string_bytes u32
+        built_at     u32  Unix seconds
+        source_hash  16s  Hash of the indexed cards' content (changes when any card does)
+        reserved     16s
+    string_offsets  u32[card_count * len(FIELDS) + 1]   Field strings (UTF-8, NULL -> "")
+    numbers         i32[card_count * 2]                  level, dp (INT32_MIN = NULL)
+    gram_keys       u32[gram_count]                      Sorted byte trigrams of the lowercased fields
+    gram_offsets    u32[gram_count + 1]
+    postings        u32[posting_count]                   Card indexes per trigram, ascending
+    strings         bytes[string_bytes]
+
+Cards are stored in the same order search_cards_local() returns them
+(set_code DESC, name), so ascending posting lists come out in display order.
+Trigrams cover display_name (which includes name), card_id and digi_type.
+
+Used by sync_cards.py (rebuilt after every sync, or with --build-index).
+The R loader is R/card_search_index.R. The Sync Card Database workflow commits
+the rebuilt file and registers it in manifest.json so it ships with the app:
+
+    python scripts/card_search_index.py --register manifest.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+INDEX_VERSION = 2
+INDEX_MAGIC = b"DLCSIDX\0"
+INDEX_PATH = Path(__file__).resolve().parent.parent / "data" / "card_search_index.bin"
+
+# Per-card string fields, in file order
+FIELDS = [
+    "card_id", "name", "display_name", "card_type", "color", "color2",
+    "digi_type", "stage", "set_code",
+]
+NUMBER_FIELDS = ["level", "dp"]
+SEARCH_FIELDS = ["display_name", "card_id", "digi_type"]
+
+INT32_NULL = -(1 << 31)
+
+_HEADER = struct.Struct("<8sIIIIII16s16s")
+
+
+# =============================================================================
+# Build
+# =============================================================================
+
+def _trigrams(text):
+    """Yield byte-trigram keys (b0 << 16 | b1 << 8 | b2) of a lowercased string."""
+    data = text.lower().encode("utf-8")
+    for i in range(len(data) - 2):
+        yield (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+
+
+def fetch_index_cards(cursor):
+    """Read the cards to index, in search_cards_local() display order."""
+    cursor.execute(f"""
+        SELECT {', '.join(FIELDS + NUMBER_FIELDS)}, content_hash
+        FROM cards
+        ORDER BY set_code DESC, name, card_id
+    """)
+    columns = FIELDS + NUMBER_FIELDS + ["content_hash"]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def build_index(cards):
+    """Serialize cards (dicts with FIELDS + NUMBER_FIELDS keys) into index bytes."""
+    strings = bytearray()
+    string_offsets = array("I", [0])
+    numbers = array("i")
+    postings_by_gram = {}
+    source = hashlib.sha1()
+
+    for index, card in enumerate(cards):
+        for field in FIELDS:
+            strings += (card.get(field) or "").encode("utf-8")
+            string_offsets.append(len(strings))
+        for field in NUMBER_FIELDS:
+            value = card.get(field)
+            numbers.append(INT32_NULL if value is None else int(value))
+
+        grams = set()
+        for field in SEARCH_FIELDS:
+            grams.update(_trigrams(card.get(field) or ""))
+        for gram in grams:
+            postings_by_gram.setdefault(gram, []).append(index)
+
+        source.update((card.get("content_hash") or card.get("card_id") or "").encode("utf-8"))
+        source.update(b"\n")
+
+    gram_keys = array("I", sorted(postings_by_gram))
+    gram_offsets = array("I", [0])
+    postings = array("I")
+    for gram in gram_keys:
+        postings.extend(postings_by_gram[gram])
+        gram_offsets.append(len(postings))
+
+    sections = [string_offsets, numbers, gram_keys, gram_offsets, postings]
+    if sys.byteorder != "little":
+        for section in sections:
+            section.byteswap()
+
+    header = _HEADER.pack(
+        INDEX_MAGIC, INDEX_VERSION, len(cards), len(gram_keys), len(postings),
+        len(strings), int(time.time()), source.digest()[:16], b"\0" * 16,
+    )
+    return b"".join([header] + [section.tobytes() for section in sections] + [bytes(strings)])
+
+
+def write_index(cards, path=INDEX_PATH):
+    """Build and atomically write the index file. Returns (path, size in bytes)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = build_index(cards)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path, len(data)
+
+
+def register_in_manifest(manifest_path, path=INDEX_PATH):
+    """Add or refresh the index file's checksum in a Posit Connect manifest.json."""
+    manifest_path = Path(manifest_path)
+    path = Path(path)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    with open(path, "rb") as f:
+        checksum = hashlib.md5(f.read()).hexdigest()
+    key = path.resolve().relative_to(manifest_path.resolve().parent).as_posix()
+    manifest["files"][key] = {"checksum": checksum}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return key, checksum
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Card search index tools")
+    parser.add_argument("--register", metavar="MANIFEST",
+                        help="Register the index file in a manifest.json so it is deployed")
+    args = parser.parse_args()
+
+    if args.register:
+        if not INDEX_PATH.exists():
+            print(f"ERROR: {INDEX_PATH} not found (run sync_cards.py --build-index first)")
+            sys.exit(1)
+        key, checksum = register_in_manifest(args.register)
+        print(f"Registered {key} ({checksum}) in {args.register}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
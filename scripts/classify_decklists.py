@@ -8,6 +8,7 @@ Only processes UNKNOWN archetype results that have decklists.
 Usage:
     python scripts/classify_decklists.py --dry-run    # Preview changes
     python scripts/classify_decklists.py              # Apply changes
+    python scripts/classify_decklists.py --profile    # Rule telemetry over all decklists (no writes)
 
 Prerequisites:
     pip install psycopg2-binary python-dotenv
@@ -18,7 +19,10 @@ import argparse
 import os
 import sys
 import json
+import time
 from collections import Counter
+from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -437,33 +441,283 @@ def extract_card_names(decklist_json):
         return []
 
 
+def rule_matches(card_text, required_cards, min_matches):
+    """Check one rule: at least min_matches required cards appear in the card text."""
+    # Check if any card contains the required card name (substring match)
+    matches = sum(1 for req_card in required_cards if req_card.lower() in card_text)
+    return matches >= min_matches
+
+
+def match_rules(card_text, profile=None):
+    """Return the first archetype whose rule matches the joined, lowercased card text.
+
+    With a profile from new_profile(), also records per-rule evaluation counts
+    and timings, the winning rule and its depth, and which later rules would
+    also have matched ("shadowed" by the winner; checked after the match and
+    timed separately).
+    """
+    winner = None
+    match_start = time.perf_counter() if profile is not None else None
+    for i, (archetype_name, required_cards, min_matches) in enumerate(CLASSIFICATION_RULES):
+        if profile is None:
+            if rule_matches(card_text, required_cards, min_matches):
+                return archetype_name
+            continue
+
+        rule_start = time.perf_counter()
+        matched = rule_matches(card_text, required_cards, min_matches)
+        profile["rule_seconds"][i] += time.perf_counter() - rule_start
+        profile["rule_evaluations"][i] += 1
+        if matched:
+            winner = i
+            break
+
+    if profile is None:
+        return None
+    profile["match_seconds"] += time.perf_counter() - match_start
+
+    if winner is None:
+        profile["unmatched"] += 1
+        profile["rules_before_match"]["no_match"] += 1
+        return None
+
+    profile["matched"] += 1
+    profile["rule_hits"][winner] += 1
+    profile["rules_before_match"][winner + 1] += 1
+
+    # Shadow scan: which later rules would also have matched this decklist
+    shadow_start = time.perf_counter()
+    for i in range(winner + 1, len(CLASSIFICATION_RULES)):
+        if rule_matches(card_text, *CLASSIFICATION_RULES[i][1:]):
+            profile["rule_shadowed"][i] += 1
+    profile["shadow_scan_seconds"] += time.perf_counter() - shadow_start
+
+    return CLASSIFICATION_RULES[winner][0]
+
+
 def classify_decklist(decklist_json):
     """Classify a decklist based on signature cards. Returns archetype name or None."""
     cards = extract_card_names(decklist_json)
     if not cards:
         return None
 
-    # Create a set of card names for faster lookup (case-insensitive)
-    card_set = set(c.lower() for c in cards)
     card_text = ' '.join(cards).lower()
+    return match_rules(card_text)
+
+
+# =============================================================================
+# Profiling / rule telemetry
+# =============================================================================
+
+def new_profile():
+    """Create an empty profile accumulator for profile_classify_decklist()."""
+    n_rules = len(CLASSIFICATION_RULES)
+    return {
+        "decklists": 0,
+        "empty_decklists": 0,
+        "matched": 0,
+        "unmatched": 0,
+        "parse_seconds": 0.0,
+        "match_seconds": 0.0,
+        "shadow_scan_seconds": 0.0,
+        "rule_evaluations": [0] * n_rules,
+        "rule_hits": [0] * n_rules,
+        "rule_shadowed": [0] * n_rules,
+        "rule_seconds": [0.0] * n_rules,
+        "rules_before_match": Counter(),
+    }
+
+
+def profile_classify_decklist(decklist_json, profile):
+    """Instrumented classify_decklist(). Returns the same archetype name or None.
+
+    Records the parse wall time here; match_rules() records the rule
+    evaluations into the same profile.
+    """
+    profile["decklists"] += 1
+
+    start = time.perf_counter()
+    cards = extract_card_names(decklist_json)
+    card_text = ' '.join(cards).lower() if cards else ''
+    profile["parse_seconds"] += time.perf_counter() - start
 
-    for archetype_name, required_cards, min_matches in CLASSIFICATION_RULES:
-        matches = 0
-        for req_card in required_cards:
-            # Check if any card contains the required card name (substring match)
-            if req_card.lower() in card_text:
-                matches += 1
+    if not cards:
+        profile["empty_decklists"] += 1
+        profile["unmatched"] += 1
+        return None
 
-        if matches >= min_matches:
-            return archetype_name
+    return match_rules(card_text, profile)
+
+
+def build_profile_report(profile, total_seconds):
+    """Turn a profile accumulator into a JSON-serializable report dict."""
+    rules = []
+    for i, (archetype_name, required_cards, min_matches) in enumerate(CLASSIFICATION_RULES):
+        hits = profile["rule_hits"][i]
+        shadowed = profile["rule_shadowed"][i]
+        rules.append({
+            "index": i,
+            "archetype": archetype_name,
+            "required_cards": required_cards,
+            "min_matches": min_matches,
+            "evaluations": profile["rule_evaluations"][i],
+            "hits": hits,
+            "shadowed": shadowed,
+            "seconds": round(profile["rule_seconds"][i], 6),
+            # Never the first match AND never matched at all -> candidate for removal
+            "dead": hits == 0 and shadowed == 0,
+        })
+
+    distribution = profile["rules_before_match"]
+    numeric_depths = sorted(k for k in distribution if k != "no_match")
+    matched_depths = [depth for depth in numeric_depths for _ in range(distribution[depth])]
+    mean_depth = sum(matched_depths) / len(matched_depths) if matched_depths else None
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "rule_count": len(CLASSIFICATION_RULES),
+        "decklists": profile["decklists"],
+        "empty_decklists": profile["empty_decklists"],
+        "matched": profile["matched"],
+        "unmatched": profile["unmatched"],
+        "timing": {
+            "total_seconds": round(total_seconds, 6),
+            "parse_seconds": round(profile["parse_seconds"], 6),
+            "match_seconds": round(profile["match_seconds"], 6),
+            "shadow_scan_seconds": round(profile["shadow_scan_seconds"], 6),
+        },
+        "rules_evaluated_before_match": {
+            "distribution": {str(k): distribution[k] for k in numeric_depths},
+            "no_match": distribution.get("no_match", 0),
+            "mean": round(mean_depth, 2) if mean_depth is not None else None,
+            "max": numeric_depths[-1] if numeric_depths else None,
+        },
+        "rules": rules,
+    }
+
+
+def write_profile_report(report, logs_dir=None):
+    """Write a profile report to logs/classifier_profile_<timestamp>.json. Returns the path."""
+    logs_dir = Path(logs_dir) if logs_dir else Path(__file__).resolve().parent.parent / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    path = logs_dir / f"classifier_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def print_profile_summary(report):
+    """Print the headline numbers from a profile report."""
+    timing = report["timing"]
+    print("Classifier Profile:")
+    print("=" * 50)
+    print(f"  {'Decklists':<30} {report['decklists']:>8}")
+    print(f"  {'Matched':<30} {report['matched']:>8}")
+    print(f"  {'Unmatched':<30} {report['unmatched']:>8}")
+    print(f"  {'JSON parse (s)':<30} {timing['parse_seconds']:>8.3f}")
+    print(f"  {'Rule evaluation (s)':<30} {timing['match_seconds']:>8.3f}")
+    print(f"  {'Mean rules before match':<30} {str(report['rules_evaluated_before_match']['mean']):>8}")
+    print("-" * 50)
 
-    return None
+    dead = [r for r in report["rules"] if r["dead"]]
+    shadowed_only = [r for r in report["rules"] if r["hits"] == 0 and r["shadowed"] > 0]
+    slowest = sorted(report["rules"], key=lambda r: -r["seconds"])[:5]
+    print(f"  Dead rules (never matched): {len(dead)}")
+    print(f"  Fully shadowed rules (matched only behind an earlier rule): {len(shadowed_only)}")
+    for r in shadowed_only:
+        print(f"    #{r['index']:<4} {r['archetype']:<28} shadowed {r['shadowed']}x")
+    print("  Slowest rules:")
+    for r in slowest:
+        print(f"    #{r['index']:<4} {r['archetype']:<28} {r['seconds'] * 1000:.3f}ms over {r['evaluations']} evals")
+
+
+def apply_archetype_updates(cursor, updates):
+    """Set archetype_id on many results in a single UPDATE ... FROM (VALUES ...).
+
+    Args:
+        cursor: psycopg2 cursor
+        updates: List of (archetype_id, result_id) tuples
+
+    Returns:
+        Sorted tournament_ids of the updated results (their meta aggregates
+        need a refresh)
+    """
+    if not updates:
+        return []
+
+    from psycopg2.extras import execute_values
+
+    rows = execute_values(cursor, """
+        UPDATE results AS r
+        SET archetype_id = v.archetype_id
+        FROM (VALUES %s) AS v(archetype_id, result_id)
+        WHERE r.result_id = v.result_id
+        RETURNING r.tournament_id
+    """, updates, template="(%s::integer, %s::integer)", page_size=len(updates), fetch=True)
+    return sorted({row[0] for row in rows})
+
+
+def insert_deck_requests(cursor, requests):
+    """Insert many classification deck requests with one multi-row INSERT.
+
+    Args:
+        cursor: psycopg2 cursor
+        requests: List of (deck_name, status, suggested_archetype_name,
+                  decklist_json, result_id, member_result_ids) tuples.
+                  result_id must be unique per request since it is used to
+                  match RETURNING rows back; member_result_ids is a JSON array
+                  string (or None) listing every result the request covers.
+
+    Returns:
+        Dict mapping result_id -> new request_id
+    """
+    if not requests:
+        return {}
+
+    from psycopg2.extras import execute_values
+
+    rows = execute_values(cursor, """
+        INSERT INTO deck_requests
+            (deck_name, primary_color, status, submitted_at,
+             suggested_archetype_name, decklist_json, source, result_id, member_result_ids)
+        VALUES %s
+        RETURNING result_id, request_id
+    """, requests,
+        template="(%s, 'Unknown', %s, CURRENT_TIMESTAMP, %s, %s, 'classification', %s, %s)",
+        page_size=len(requests), fetch=True)
+    return {result_id: request_id for result_id, request_id in rows}
+
+
+def link_pending_requests(cursor, links):
+    """Set pending_deck_request_id on many results in a single joined UPDATE.
+
+    Args:
+        cursor: psycopg2 cursor
+        links: List of (request_id, result_id) tuples
+
+    Returns:
+        Number of rows in the update batch
+    """
+    if not links:
+        return 0
+
+    from psycopg2.extras import execute_values
+
+    execute_values(cursor, """
+        UPDATE results AS r
+        SET pending_deck_request_id = v.request_id
+        FROM (VALUES %s) AS v(request_id, result_id)
+        WHERE r.result_id = v.result_id
+    """, links, template="(%s::integer, %s::integer)", page_size=len(links))
+    return len(links)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Auto-classify UNKNOWN decklists')
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without applying')
     parser.add_argument('--online-only', action='store_true', default=True, help='Only process online tournaments')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile rules over every stored decklist and write telemetry JSON to logs/ (no writes)')
     args = parser.parse_args()
 
     # Connect to database
@@ -476,6 +730,31 @@ def main():
         print(f"FAILED: {e}")
         sys.exit(1)
 
+    # Profile mode: every decklist (not just UNKNOWN) so hit/shadow counts reflect real data
+    if args.profile:
+        cursor.execute('''
+            SELECT r.decklist_json
+            FROM results r
+            WHERE r.decklist_json IS NOT NULL
+              AND r.decklist_json != ''
+        ''')
+        decklists = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        conn.close()
+        print(f"Profiling {len(CLASSIFICATION_RULES)} rules over {len(decklists)} decklists")
+        print()
+
+        profile = new_profile()
+        start = time.perf_counter()
+        for decklist_json in decklists:
+            profile_classify_decklist(decklist_json, profile)
+        report = build_profile_report(profile, time.perf_counter() - start)
+
+        print_profile_summary(report)
+        path = write_profile_report(report)
+        print(f"\nProfile written to {path}")
+        return
+
     # Get archetype name to ID mapping
     cursor.execute('SELECT archetype_id, archetype_name FROM deck_archetypes')
     archetypes = cursor.fetchall()
@@ -535,14 +814,20 @@ def main():
     if args.dry_run:
         print("DRY RUN - No changes applied")
     else:
-        # Apply updates
+        # Apply updates in one statement
         print(f"Applying {len(updates)} archetype updates...")
-        for archetype_id, result_id in updates:
-            cursor.execute(
-                "UPDATE results SET archetype_id = %s WHERE result_id = %s",
-                (archetype_id, result_id)
-            )
+        tournament_ids = apply_archetype_updates(cursor, updates)
         conn.commit()
+
+        # Re-tagged results move between meta buckets and matchup cells
+        if tournament_ids:
+            from meta_aggregates import (refresh_meta_weekly_stats, refresh_meta_trends,
+                                         refresh_archetype_matchups)
+            refresh_meta_weekly_stats(cursor, tournament_ids)
+            refresh_meta_trends(cursor, tournament_ids)
+            refresh_archetype_matchups(cursor, tournament_ids)
+            conn.commit()
+            print(f"Refreshed meta aggregates for {len(tournament_ids)} tournaments")
         print("Done!")
 
     cursor.close()
@@ -0,0 +1,309 @@
+"""
+Decklist Similarity (MinHash / LSH)
+
+Nearest-neighbour helpers for decklists that no CLASSIFICATION_RULES entry
+matches. Each decklist is reduced to its set of card names, summarized as a
+MinHash signature, and bucketed with locality-sensitive hashing (LSH) so a
+lookup only compares against decklists that share at least one band — not
+the whole results history.
+
+Signatures for already-classified results are persisted in the
+decklist_signatures table and refreshed incrementally (only new or
+re-labelled results are hashed), so rebuilding the index is a single SELECT.
+
+The same banding is used as a blocking step to cluster unclassifiable
+decklists, so near-duplicates share one deck request.
+
+Used by run_classify_decklists() in sync_limitless.py.
+
+Prerequisites:
+    pip install psycopg2-binary
+    decklist_signatures table (db/migrations/005_decklist_signatures.sql)
+"""
+
+import json
+import random
+import zlib
+from collections import defaultdict
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+NUM_PERM = 64             # MinHash signature length
+LSH_BANDS = 16            # 16 bands x 4 rows -> candidate threshold ~ (1/16)^(1/4) = 0.50
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SIMILARITY_THRESHOLD = 0.6  # Minimum estimated Jaccard to suggest a neighbour's archetype
+NEIGHBOURS = 5            # Labelled neighbours that vote on the suggestion
+CLUSTER_THRESHOLD = 0.7   # Minimum exact Jaccard to group two unclassifiable decklists
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures stored in the database stay comparable across runs
+_rng = random.Random(20260301)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERM)
+]
+
+
+# =============================================================================
+# Card sets and signatures
+# =============================================================================
+
+def decklist_card_set(decklist_json):
+    """Return the set of lowercased card names in a decklist JSON (counts ignored)."""
+    try:
+        decklist = json.loads(decklist_json)
+    except (TypeError, ValueError):
+        return frozenset()
+
+    names = set()
+    for category in ['digimon', 'tamer', 'option', 'egg']:
+        for card in decklist.get(category, []) or []:
+            name = (card.get('name') or '').strip().lower()
+            if name:
+                names.add(name)
+    return frozenset(names)
+
+
+def minhash_signature(card_set):
+    """Compute a NUM_PERM-long MinHash signature for a set of card names.
+
+    Returns None for an empty set (nothing to compare).
+    """
+    if not card_set:
+        return None
+
+    hashes = [zlib.crc32(card.encode('utf-8')) & _MAX_HASH for card in card_set]
+    signature = []
+    for a, b in _PERMUTATIONS:
+        signature.append(min((a * h + b) % _MERSENNE_PRIME for h in hashes))
+    return signature
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimate Jaccard similarity as the fraction of matching signature slots."""
+    same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return same / NUM_PERM
+
+
+def jaccard(set_a, set_b):
+    """Exact Jaccard similarity of two card sets."""
+    if not set_a and not set_b:
+        return 0.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+
+def _band_keys(signature):
+    """Yield one hashable key per LSH band."""
+    for band in range(LSH_BANDS):
+        start = band * LSH_ROWS
+        yield band, tuple(signature[start:start + LSH_ROWS])
+
+
+# =============================================================================
+# LSH index
+# =============================================================================
+
+class MinHashLSHIndex:
+    """In-memory LSH index over labelled MinHash signatures.
+
+    add() and query() touch LSH_BANDS hash buckets each, so lookup cost is
+    proportional to the number of near-duplicates, not the index size.
+    """
+
+    def __init__(self):
+        self.buckets = defaultdict(list)  # (band, band_values) -> [key, ...]
+        self.signatures = {}              # key -> signature
+        self.labels = {}                  # key -> label
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def add(self, key, signature, label=None):
+        """Insert a signature (ignored if the key is already indexed)."""
+        if key in self.signatures or signature is None:
+            return
+        self.signatures[key] = signature
+        self.labels[key] = label
+        for band_key in _band_keys(signature):
+            self.buckets[band_key].append(key)
+
+    def candidates(self, signature):
+        """Return keys sharing at least one LSH band with the signature."""
+        found = set()
+        for band_key in _band_keys(signature):
+            found.update(self.buckets.get(band_key, ()))
+        return found
+
+    def query(self, signature, threshold=SIMILARITY_THRESHOLD, limit=NEIGHBOURS):
+        """Return up to `limit` (key, similarity) pairs at or above `threshold`, best first."""
+        if signature is None:
+            return []
+        scored = []
+        for key in self.candidates(signature):
+            similarity = estimate_similarity(signature, self.signatures[key])
+            if similarity >= threshold:
+                scored.append((key, similarity))
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored[:limit]
+
+    def suggest_label(self, signature, threshold=SIMILARITY_THRESHOLD, limit=NEIGHBOURS):
+        """Similarity-weighted vote among the nearest labelled neighbours.
+
+        Returns:
+            Tuple of (label, best_similarity), or (None, 0.0) if no neighbour
+            clears the threshold
+        """
+        neighbours = self.query(signature, threshold, limit)
+        if not neighbours:
+            return None, 0.0
+
+        votes = defaultdict(float)
+        best = {}
+        for key, similarity in neighbours:
+            label = self.labels.get(key)
+            if label is None:
+                continue
+            votes[label] += similarity
+            best[label] = max(best.get(label, 0.0), similarity)
+        if not votes:
+            return None, 0.0
+
+        label = max(votes, key=lambda name: (votes[name], best[name]))
+        return label, best[label]
+
+
+# =============================================================================
+# Clustering
+# =============================================================================
+
+def cluster_decklists(items, threshold=CLUSTER_THRESHOLD):
+    """Group decklists whose card sets are near-duplicates.
+
+    LSH banding is the blocking step (only decklists sharing a band are
+    compared); candidate pairs are then verified with exact Jaccard and merged
+    with union-find, so clusters are the connected components of the
+    "Jaccard >= threshold" graph.
+
+    Args:
+        items: List of (key, card_set) tuples; keys must be sortable and unique
+        threshold: Minimum exact Jaccard similarity to link two decklists
+
+    Returns:
+        List of clusters (lists of keys), each sorted, ordered by smallest key.
+        Decklists with an empty card set come back as singletons.
+    """
+    parent = {key: key for key, _ in items}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            # Keep the smallest key as the root so cluster order is deterministic
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+
+    card_sets = {}
+    index = MinHashLSHIndex()
+    for key, card_set in items:
+        card_sets[key] = card_set
+        signature = minhash_signature(card_set)
+        if signature is None:
+            continue
+        for other in index.candidates(signature):
+            if jaccard(card_set, card_sets[other]) >= threshold:
+                union(key, other)
+        index.add(key, signature)
+
+    clusters = defaultdict(list)
+    for key, _ in items:
+        clusters[find(key)].append(key)
+    return sorted((sorted(members) for members in clusters.values()), key=lambda members: members[0])
+
+
+# =============================================================================
+# Persistence (decklist_signatures table)
+# =============================================================================
+
+def refresh_signatures(cursor):
+    """Incrementally bring decklist_signatures in line with classified results.
+
+    - Drops signatures whose result is gone, lost its decklist, or became UNKNOWN
+    - Re-labels signatures whose result's archetype changed (no re-hashing)
+    - Hashes only classified results that have no signature yet
+
+    Returns:
+        Dict with removed / relabelled / added counts
+    """
+    from psycopg2.extras import execute_values
+
+    cursor.execute("""
+        DELETE FROM decklist_signatures s
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM results r
+            JOIN deck_archetypes d ON r.archetype_id = d.archetype_id
+            WHERE r.result_id = s.result_id
+              AND d.archetype_name != 'UNKNOWN'
+              AND r.decklist_json IS NOT NULL
+              AND r.decklist_json != ''
+        )
+    """)
+    removed = cursor.rowcount
+
+    cursor.execute("""
+        UPDATE decklist_signatures s
+        SET archetype_id = r.archetype_id
+        FROM results r
+        WHERE r.result_id = s.result_id
+          AND r.archetype_id IS DISTINCT FROM s.archetype_id
+    """)
+    relabelled = cursor.rowcount
+
+    cursor.execute("""
+        SELECT r.result_id, r.archetype_id, r.decklist_json
+        FROM results r
+        JOIN deck_archetypes d ON r.archetype_id = d.archetype_id
+        LEFT JOIN decklist_signatures s ON s.result_id = r.result_id
+        WHERE s.result_id IS NULL
+          AND d.archetype_name != 'UNKNOWN'
+          AND r.decklist_json IS NOT NULL
+          AND r.decklist_json != ''
+    """)
+    new_rows = []
+    for result_id, archetype_id, decklist_json in cursor.fetchall():
+        signature = minhash_signature(decklist_card_set(decklist_json))
+        if signature is not None:
+            new_rows.append((result_id, archetype_id, signature))
+
+    if new_rows:
+        execute_values(cursor, """
+            INSERT INTO decklist_signatures (result_id, archetype_id, signature)
+            VALUES %s
+            ON CONFLICT (result_id) DO NOTHING
+        """, new_rows, template="(%s, %s, %s::bigint[])", page_size=1000)
+
+    return {"removed": removed, "relabelled": relabelled, "added": len(new_rows)}
+
+
+def load_index(cursor):
+    """Build a MinHashLSHIndex from decklist_signatures, labelled by archetype name."""
+    cursor.execute("""
+        SELECT s.result_id, s.signature, d.archetype_name
+        FROM decklist_signatures s
+        JOIN deck_archetypes d ON s.archetype_id = d.archetype_id
+    """)
+    index = MinHashLSHIndex()
+    for result_id, signature, archetype_name in cursor.fetchall():
+        if len(signature) == NUM_PERM:
+            index.add(result_id, list(signature), archetype_name)
+    return index
@@ -0,0 +1,333 @@
+"""
+Export a Neon snapshot to local Parquet files and a DuckDB database.
+
+The reverse of migrate_to_neon.py: every table in TABLES is streamed out of
+Neon with COPY ... TO STDOUT, converted to Parquet by DuckDB, and exposed as a
+view in a local DuckDB database, so a production-sized dataset can be
+reproduced locally without re-syncing from the APIs.
+
+All tables are read concurrently from a single exported Postgres snapshot,
+so the export is consistent across tables. results and matches are written
+as hive-partitioned Parquet by event month (event_month=YYYY-MM, taken from
+the tournament's event_date); the views drop the partition column so they
+keep the Neon schema.
+
+Output (defaults):
+    data/neon_snapshot/<table>.parquet
+    data/neon_snapshot/results/event_month=YYYY-MM/*.parquet
+    data/neon_snapshot/matches/event_month=YYYY-MM/*.parquet
+    data/neon_snapshot.duckdb       Views over the Parquet files
+
+Usage:
+    python scripts/export_neon_snapshot.py                      # export all tables
+    python scripts/export_neon_snapshot.py --tables results,matches
+    python scripts/export_neon_snapshot.py --materialize        # copy into DuckDB tables
+    python scripts/export_neon_snapshot.py --out-dir /tmp/snap --db /tmp/snap.duckdb
+
+Prerequisites:
+    pip install duckdb psycopg2-binary python-dotenv
+
+Environment variables (.env):
+    NEON_HOST, NEON_DATABASE, NEON_USER, NEON_PASSWORD (see migrate_to_neon.py)
+"""
+
+import sys
+import time
+import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import duckdb
+from dotenv import load_dotenv
+
+from migrate_to_neon import TABLES, connect_neon, log
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+OUT_DIR = "data/neon_snapshot"
+SNAPSHOT_DB = "data/neon_snapshot.duckdb"
+MAX_WORKERS = 4  # Tables exported concurrently
+
+# Tables partitioned by the month of their tournament's event_date
+MONTH_PARTITIONED = {"results", "matches"}
+PARTITION_COLUMN = "event_month"
+
+# Postgres data_type -> DuckDB type (numeric and arrays handled separately)
+PG_TO_DUCKDB = {
+    "smallint": "SMALLINT",
+    "integer": "INTEGER",
+    "bigint": "BIGINT",
+    "real": "FLOAT",
+    "double precision": "DOUBLE",
+    "boolean": "BOOLEAN",
+    "date": "DATE",
+    "timestamp without time zone": "TIMESTAMP",
+    "timestamp with time zone": "TIMESTAMPTZ",
+}
+PG_ARRAY_TO_DUCKDB = {"_int2": "SMALLINT[]", "_int4": "INTEGER[]", "_int8": "BIGINT[]"}
+
+
+# =============================================================================
+# Schema
+# =============================================================================
+
+def table_columns(pg_cursor, table):
+    """Return [(column, duckdb_type, is_array)] for a Neon table, in column order.
+
+    Types Parquet can't represent faithfully from CSV (json, text[], ...) stay
+    VARCHAR; integer arrays are exported as JSON and cast back.
+    """
+    pg_cursor.execute("""
+        SELECT column_name, data_type, udt_name, numeric_precision, numeric_scale
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+        ORDER BY ordinal_position
+    """, (table,))
+    columns = []
+    for name, data_type, udt_name, precision, scale in pg_cursor.fetchall():
+        if data_type == "ARRAY":
+            columns.append((name, PG_ARRAY_TO_DUCKDB.get(udt_name, "VARCHAR"), True))
+        elif data_type == "numeric":
+            duck_type = f"DECIMAL({precision}, {scale})" if precision and precision <= 38 else "DOUBLE"
+            columns.append((name, duck_type, False))
+        else:
+            columns.append((name, PG_TO_DUCKDB.get(data_type, "VARCHAR"), False))
+    return columns
+
+
+def export_query(table, columns):
+    """SELECT used inside COPY ... TO STDOUT for a table."""
+    select = ", ".join(
+        f"array_to_json(t.{name})::text AS {name}" if is_array else f"t.{name}"
+        for name, _, is_array in columns
+    )
+    if table in MONTH_PARTITIONED:
+        return f"""
+            SELECT {select}, to_char(tr.event_date, 'YYYY-MM') AS {PARTITION_COLUMN}
+            FROM {table} t
+            JOIN tournaments tr ON tr.tournament_id = t.tournament_id
+        """
+    return f"SELECT {select} FROM {table} t"
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def open_snapshot_connection(snapshot_id):
+    """Neon connection reading from an exported snapshot (read-only)."""
+    pg_conn = connect_neon()
+    pg_conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+    cur = pg_conn.cursor()
+    cur.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+    cur.execute("SET TIME ZONE 'UTC'")
+    cur.close()
+    return pg_conn
+
+
+def export_table(duck_conn, snapshot_id, table, out_dir):
+    """Stream one table from Neon into Parquet.
+
+    COPY output is spooled to a CSV file next to the Parquet output (so memory
+    stays flat), read by DuckDB with the Neon column types, and written as
+    Parquet (hive-partitioned for MONTH_PARTITIONED tables).
+
+    Returns:
+        Tuple of (row_count, output path)
+    """
+    pg_conn = open_snapshot_connection(snapshot_id)
+    duck_cursor = duck_conn.cursor()
+    spool = out_dir / f".{table}.csv"
+    try:
+        cur = pg_conn.cursor()
+        columns = table_columns(cur, table)
+        if not columns:
+            raise ValueError("table not found in Neon")
+
+        with open(spool, "wb") as f:
+            cur.copy_expert(f"COPY ({export_query(table, columns)}) TO STDOUT WITH (FORMAT csv, HEADER)", f)
+        cur.close()
+
+        # Arrays arrive as JSON text and are cast after parsing
+        csv_types = {name: "VARCHAR" if is_array else duck_type for name, duck_type, is_array in columns}
+        if table in MONTH_PARTITIONED:
+            csv_types[PARTITION_COLUMN] = "VARCHAR"
+        select = ", ".join(
+            f"CAST({name} AS {duck_type}) AS {name}" if is_array else name
+            for name, duck_type, is_array in columns
+        )
+        type_struct = "{" + ", ".join(f"'{name}': '{duck_type}'" for name, duck_type in csv_types.items()) + "}"
+        source = (f"read_csv('{spool.as_posix()}', header = true, auto_detect = false, "
+                  f"columns = {type_struct}, allow_quoted_nulls = false)")
+
+        if table in MONTH_PARTITIONED:
+            target = out_dir / table
+            if target.exists():
+                shutil.rmtree(target)
+            row_count = duck_cursor.execute(f"""
+                COPY (SELECT {select}, {PARTITION_COLUMN} FROM {source})
+                TO '{target.as_posix()}' (FORMAT parquet, PARTITION_BY ({PARTITION_COLUMN}))
+            """).fetchone()[0]
+            if row_count == 0:
+                # Keep a zero-row file so the view still has the table's columns
+                empty = target / f"{PARTITION_COLUMN}=none"
+                empty.mkdir(parents=True, exist_ok=True)
+                duck_cursor.execute(
+                    f"COPY (SELECT {select} FROM {source}) TO '{(empty / 'data_0.parquet').as_posix()}' (FORMAT parquet)"
+                )
+        else:
+            target = out_dir / f"{table}.parquet"
+            row_count = duck_cursor.execute(
+                f"COPY (SELECT {select} FROM {source}) TO '{target.as_posix()}' (FORMAT parquet)"
+            ).fetchone()[0]
+
+        return row_count, target
+    finally:
+        spool.unlink(missing_ok=True)
+        duck_cursor.close()
+        pg_conn.rollback()
+        pg_conn.close()
+
+
+def export_tables(tables, out_dir, workers=MAX_WORKERS):
+    """Export tables concurrently from one consistent Neon snapshot.
+
+    Returns:
+        Tuple of ({table: (row_count, path)}, errors)
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # The coordinating transaction must stay open while workers import its snapshot
+    coordinator = connect_neon()
+    coordinator.set_session(isolation_level="REPEATABLE READ", readonly=True)
+    cur = coordinator.cursor()
+    cur.execute("SELECT pg_export_snapshot()")
+    snapshot_id = cur.fetchone()[0]
+    cur.close()
+
+    duck_conn = duckdb.connect()
+    exported = {}
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(export_table, duck_conn, snapshot_id, table, out_dir): table
+                for table in tables
+            }
+            for future in as_completed(futures):
+                table = futures[future]
+                try:
+                    exported[table] = future.result()
+                    log(f"  {table}: {exported[table][0]} rows")
+                except Exception as e:
+                    err_msg = str(e).strip().split("\n")[0]
+                    log(f"  {table}: ERROR - {err_msg[:120]}")
+                    errors.append((table, err_msg))
+    finally:
+        duck_conn.close()
+        coordinator.rollback()
+        coordinator.close()
+
+    return exported, errors
+
+
+# =============================================================================
+# Attach
+# =============================================================================
+
+def parquet_source(table, path):
+    """read_parquet() expression for an exported table (partition column dropped)."""
+    path = Path(path).resolve()
+    if path.is_dir():
+        return (f"(SELECT * EXCLUDE ({PARTITION_COLUMN}) FROM read_parquet("
+                f"'{(path / '**' / '*.parquet').as_posix()}', hive_partitioning = true, "
+                f"hive_types = {{'{PARTITION_COLUMN}': VARCHAR}}))")
+    return f"read_parquet('{path.as_posix()}')"
+
+
+def attach_snapshot(exported, db_path, materialize=False):
+    """Create (or replace) one view per exported table in a DuckDB database.
+
+    Views reference the Parquet files by absolute path, so the database is
+    tiny and opening it is instant; materialize copies the data in instead.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(db_path))
+    try:
+        for table in TABLES:
+            if table not in exported:
+                continue
+            _, path = exported[table]
+            existing = conn.execute(
+                "SELECT table_type FROM information_schema.tables WHERE table_name = ?", [table]
+            ).fetchone()
+            if existing:
+                conn.execute(f"DROP {'VIEW' if existing[0] == 'VIEW' else 'TABLE'} {table}")
+            kind = "TABLE" if materialize else "VIEW"
+            conn.execute(f"CREATE {kind} {table} AS SELECT * FROM {parquet_source(table, path)}")
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export Neon tables to Parquet and attach them as a local DuckDB database."
+    )
+    parser.add_argument("--out-dir", default=OUT_DIR, help=f"Parquet output directory (default: {OUT_DIR}).")
+    parser.add_argument("--db", default=SNAPSHOT_DB, help=f"DuckDB database to create (default: {SNAPSHOT_DB}).")
+    parser.add_argument("--tables", help="Comma-separated subset of tables to export (default: all).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Tables exported concurrently (default: {MAX_WORKERS}).",
+    )
+    parser.add_argument(
+        "--materialize",
+        action="store_true",
+        help="Copy the data into DuckDB tables instead of views over the Parquet files.",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    tables = TABLES
+    if args.tables:
+        tables = [table.strip() for table in args.tables.split(",") if table.strip()]
+        unknown = [table for table in tables if table not in TABLES]
+        if unknown:
+            print(f"Error: unknown table(s): {', '.join(unknown)}")
+            sys.exit(1)
+
+    print("=" * 65)
+    print("DigiLab - Neon Snapshot Export")
+    print("=" * 65)
+
+    started = time.monotonic()
+    out_dir = Path(args.out_dir)
+    print(f"\n[1/2] Exporting {len(tables)} tables to {out_dir.absolute()} ({args.workers} workers)...")
+    exported, errors = export_tables(tables, out_dir, workers=args.workers)
+    total_rows = sum(row_count for row_count, _ in exported.values())
+    print(f"\n  Total: {total_rows} rows in {time.monotonic() - started:.2f}s")
+
+    print(f"\n[2/2] Attaching as {Path(args.db).absolute()}...")
+    attach_snapshot(exported, args.db, materialize=args.materialize)
+    print(f"  {len(exported)} {'tables' if args.materialize else 'views'} created.")
+
+    size = sum(f.stat().st_size for f in out_dir.rglob("*.parquet"))
+    print(f"\nDone in {time.monotonic() - started:.2f}s ({size / 1_048_576:.1f} MB of Parquet).")
+    if errors:
+        print(f"Errors: {len(errors)} table(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
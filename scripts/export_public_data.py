@@ -0,0 +1,296 @@
+"""
+Export public dashboard data as static files.
+
+Writes the public aggregates every Shiny session would otherwise recompute
+(weekly meta shares, archetype matchups, the rating leaderboard and the
+tournament list) into www/data/ as content-hashed, gzip-compressed JSON and
+Parquet, plus a manifest. Files are immutable: a dataset whose content did
+not change keeps its file name, so clients and CDNs can cache them forever
+and only re-fetch manifest.json.
+
+Output:
+    www/data/manifest.json                  Dataset -> file names, row counts, hashes
+    www/data/<dataset>.<hash>.json.gz       {"columns": [...], "rows": [[...], ...]}
+    www/data/<dataset>.<hash>.parquet       Same rows (only if pyarrow is installed)
+
+Files of the previous manifest are kept (clients may still hold it); older
+versions are removed.
+
+Used by sync_limitless.py --export-static. The Shiny app serves www/ as
+static files, so once the exports are registered in the deployment
+manifest.json they are published at /data/ with the next deploy (the Sync
+Limitless workflow does both after each sync). Can also be run directly:
+
+    python scripts/export_public_data.py
+    python scripts/export_public_data.py --out-dir /tmp/public
+    python scripts/export_public_data.py --register manifest.json  (deploy the current files)
+
+Prerequisites:
+    pip install psycopg2-binary python-dotenv requests
+    pip install pyarrow  (optional, Parquet copies)
+    meta_weekly_stats and archetype_matchups tables (migrations 010, 011)
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+OUT_DIR = Path(__file__).resolve().parent.parent / "www" / "data"
+MANIFEST = "manifest.json"
+HASH_LENGTH = 12          # Hex digits of the content hash used in file names
+
+# Dataset name -> query. Only public columns (no member numbers or admin data).
+DATASETS = {
+    "meta_weekly": """
+        SELECT m.format, m.scene_id, sc.slug AS scene, m.week_start, m.archetype_id,
+               da.archetype_name, da.primary_color, da.display_card_id,
+               m.entries, m.first_places, m.top3, m.wins, m.losses, m.ties,
+               m.meta_share, m.top3_rate, m.win_rate
+        FROM meta_weekly_stats m
+        JOIN deck_archetypes da ON m.archetype_id = da.archetype_id
+        LEFT JOIN scenes sc ON m.scene_id = sc.scene_id
+        ORDER BY m.format, m.scene_id, m.week_start, m.entries DESC, m.archetype_id
+    """,
+    "matchups": """
+        SELECT format, archetype_id, opponent_archetype_id, wins, losses, ties,
+               win_rate, win_rate_low, win_rate_high
+        FROM archetype_matchups
+        ORDER BY format, archetype_id, opponent_archetype_id
+    """,
+    "leaderboard": """
+        SELECT RANK() OVER (ORDER BY c.competitive_rating DESC) AS player_rank,
+               p.player_id, p.display_name, c.competitive_rating, c.achievement_score,
+               c.events_played
+        FROM player_ratings_cache c
+        JOIN players p ON c.player_id = p.player_id
+        WHERE p.is_active = TRUE AND c.events_played > 0
+        ORDER BY c.competitive_rating DESC, p.player_id
+    """,
+    "tournaments": """
+        SELECT t.tournament_id, t.event_date, t.event_type, t.format, t.player_count, t.rounds,
+               s.store_id, s.name AS store_name, sc.slug AS scene,
+               w.display_name AS winner, wa.archetype_name AS winner_archetype
+        FROM tournaments t
+        JOIN stores s ON t.store_id = s.store_id
+        LEFT JOIN scenes sc ON s.scene_id = sc.scene_id
+        LEFT JOIN LATERAL (
+            SELECT r.player_id, r.archetype_id FROM results r
+            WHERE r.tournament_id = t.tournament_id AND r.placement = 1
+            ORDER BY r.result_id
+            LIMIT 1
+        ) r ON true
+        LEFT JOIN players w ON r.player_id = w.player_id
+        LEFT JOIN deck_archetypes wa ON r.archetype_id = wa.archetype_id
+        ORDER BY t.event_date DESC, t.tournament_id DESC
+    """,
+}
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def fetch_dataset(cursor, query):
+    """Run a dataset query. Returns (column names, row tuples)."""
+    cursor.execute(query)
+    return [column[0] for column in cursor.description], cursor.fetchall()
+
+
+def _write_atomic(path, data):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_dataset(out_dir, name, columns, rows):
+    """Write one dataset under its content hash (skipped if already on disk).
+
+    Returns:
+        Manifest entry dict
+    """
+    json_rows = [[_json_value(value) for value in row] for row in rows]
+    payload = json.dumps({"columns": columns, "rows": json_rows}, separators=(",", ":"),
+                         ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()
+    stem = f"{name}.{digest[:HASH_LENGTH]}"
+
+    json_path = out_dir / f"{stem}.json.gz"
+    if not json_path.exists():
+        _write_atomic(json_path, gzip.compress(payload, compresslevel=9, mtime=0))
+
+    parquet_path = out_dir / f"{stem}.parquet"
+    if pa is not None and not parquet_path.exists():
+        table = pa.table({column: [row[i] for row in rows] for i, column in enumerate(columns)})
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, parquet_path)
+
+    return {
+        "rows": len(rows),
+        "sha256": digest,
+        "json": json_path.name,
+        "parquet": parquet_path.name if parquet_path.exists() else None,
+        "bytes": json_path.stat().st_size,
+    }
+
+
+def _manifest_files(manifest):
+    return {
+        filename
+        for entry in (manifest or {}).get("datasets", {}).values()
+        for filename in (entry.get("json"), entry.get("parquet"))
+        if filename
+    }
+
+
+def export_public_data(cursor, out_dir=OUT_DIR, datasets=None):
+    """Export datasets (default: all) and rewrite the manifest.
+
+    Args:
+        cursor: psycopg2 cursor
+        out_dir: Output directory
+        datasets: Dataset names to export; others keep their manifest entries
+
+    Returns:
+        Dict with datasets (manifest entries), changed (names whose content
+        changed) and removed (stale file count)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else None
+    entries = dict((previous or {}).get("datasets", {}))
+
+    changed = []
+    for name in datasets or DATASETS:
+        columns, rows = fetch_dataset(cursor, DATASETS[name])
+        entry = write_dataset(out_dir, name, columns, rows)
+        if entries.get(name, {}).get("sha256") != entry["sha256"]:
+            changed.append(name)
+        entries[name] = entry
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "datasets": entries,
+    }
+    if changed or previous is None:
+        _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+    else:
+        manifest = previous
+
+    keep = _manifest_files(manifest) | _manifest_files(previous)
+    removed = 0
+    for path in out_dir.iterdir():
+        if path.name != MANIFEST and path.name not in keep and path.name.split(".")[0] in DATASETS:
+            path.unlink()
+            removed += 1
+
+    return {"datasets": manifest["datasets"], "changed": changed, "removed": removed}
+
+
+def register_in_manifest(manifest_path, out_dir=OUT_DIR):
+    """Sync the export files' checksums into a Posit Connect manifest.json.
+
+    Adds or refreshes an entry for every file in out_dir and drops entries of
+    files the export has since removed.
+
+    Returns:
+        Dict with registered and dropped file counts
+    """
+    manifest_path = Path(manifest_path)
+    out_dir = Path(out_dir)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    prefix = out_dir.resolve().relative_to(manifest_path.resolve().parent).as_posix() + "/"
+    current = {}
+    for path in sorted(out_dir.iterdir()):
+        if path.is_file() and not path.name.endswith(".tmp"):
+            with open(path, "rb") as f:
+                current[prefix + path.name] = {"checksum": hashlib.md5(f.read()).hexdigest()}
+
+    files = manifest["files"]
+    stale = [key for key in files if key.startswith(prefix) and key not in current]
+    for key in stale:
+        del files[key]
+    files.update(current)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return {"registered": len(current), "dropped": len(stale)}
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    from sync_limitless import get_connection
+
+    parser = argparse.ArgumentParser(description="Export public dashboard data to static files")
+    parser.add_argument("--out-dir", default=str(OUT_DIR), help=f"Output directory (default: {OUT_DIR})")
+    parser.add_argument("--datasets", help=f"Comma-separated subset of: {', '.join(DATASETS)}")
+    parser.add_argument("--register", metavar="MANIFEST",
+                        help="Register the exported files in a manifest.json so they are deployed "
+                             "(no export)")
+    args = parser.parse_args()
+
+    if args.register:
+        if not (Path(args.out_dir) / MANIFEST).exists():
+            print(f"ERROR: {Path(args.out_dir) / MANIFEST} not found (run the export first)")
+            sys.exit(1)
+        stats = register_in_manifest(args.register, args.out_dir)
+        print(f"Registered {stats['registered']} files in {args.register} "
+              f"({stats['dropped']} stale entries dropped)")
+        return
+
+    datasets = None
+    if args.datasets:
+        datasets = [name.strip() for name in args.datasets.split(",") if name.strip()]
+        unknown = [name for name in datasets if name not in DATASETS]
+        if unknown:
+            print(f"Error: unknown dataset(s): {', '.join(unknown)}")
+            sys.exit(1)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    stats = export_public_data(cursor, args.out_dir, datasets)
+    cursor.close()
+    conn.close()
+
+    for name, entry in stats["datasets"].items():
+        marker = "updated" if name in stats["changed"] else "unchanged"
+        print(f"  {name:<12} {entry['rows']:>7} rows  {entry['json']} ({marker})")
+    if pa is None:
+        print("  pyarrow not installed - Parquet copies skipped")
+    print(f"Removed {stats['removed']} stale files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Meta Aggregates
+
+Maintains meta_weekly_stats: per format x scene x week, each archetype's
+entries, first places, top 3 finishes and match record, plus that bucket's
+meta share, top 3 conversion and win rate. The dashboard's meta views can
+sum a few of these rows instead of grouping the whole results history in
+every session (the deck_analytics query in server/public-dashboard-server.R).
+
+Refreshes are incremental: only the (format, scene, week) buckets of the
+given tournaments are deleted and re-aggregated. UNKNOWN archetypes are left
+out, as on the dashboard.
+
+meta_trend_daily holds, per format x scene x event day, each archetype's
+entries and top 3 finishes with its trailing 7/30/90-day counts and shares.
+Each (format, scene) is recomputed from the earliest week among the given
+tournaments, so importing the latest events only appends days.
+
+It also maintains archetype_matchups: per format, each ordered archetype
+pair's match record, from matches joined to both players' results, with
+the win rate's Wilson score interval precomputed. Matches stored from one
+perspective only (manual match history) are mirrored for the opponent.
+Only the archetype pairs played in the given tournaments are rebuilt.
+
+player_head_to_head holds the same record per player pair (both
+orientations, plus the last date they met), so head-to-head lookups are a
+primary-key read. Only the pairs that met in the given tournaments are
+rebuilt.
+
+The SQL lives in database functions (db/migrations/015_meta_refresh_functions.sql)
+shared with the R app: capture functions return the buckets, cells or pairs
+of a set of tournaments, rebuild functions recount them. Deletes and moves
+need the keys captured before the change, passed as buckets/cells/pairs.
+
+Used by sync_limitless.py (after every sync that imports tournaments) and
+migrate_to_neon.py; the R app rebuilds the weekly stats and trend days after
+manual result entry, the head-to-head pairs after match history entry, and
+the archetype pairs after tournament deletes and edits (R/meta_aggregates.R).
+Can also be run directly:
+
+    python scripts/meta_aggregates.py --tournaments 812,813
+    python scripts/meta_aggregates.py --all
+    python scripts/meta_aggregates.py --matchups --all
+    python scripts/meta_aggregates.py --head-to-head --tournaments 812
+    python scripts/meta_aggregates.py --trends --all
+
+Prerequisites:
+    pip install psycopg2-binary python-dotenv requests
+    meta_weekly_stats table (db/migrations/010_meta_weekly_stats.sql)
+    archetype_matchups table (db/migrations/011_archetype_matchups.sql)
+    player_head_to_head table (db/migrations/012_player_head_to_head.sql)
+    meta_trend_daily table (db/migrations/014_meta_trend_daily.sql)
+    refresh functions (db/migrations/015_meta_refresh_functions.sql)
+"""
+
+import argparse
+
+
+# =============================================================================
+# Capture
+# =============================================================================
+
+def meta_weekly_buckets(cursor, tournament_ids):
+    """(format, scene_id, week_start) buckets of the given tournaments.
+
+    Take them before deleting tournaments or changing their format, date or
+    store, and pass them to refresh_meta_weekly_stats()/refresh_meta_trends().
+    """
+    cursor.execute("SELECT format, scene_id, week_start FROM meta_weekly_buckets(%s::integer[])",
+                   (list(tournament_ids),))
+    return cursor.fetchall()
+
+
+def archetype_matchup_cells(cursor, tournament_ids):
+    """(format, archetype_id, opponent_archetype_id) cells played in the given tournaments.
+
+    Take them before deleting tournaments, results or matches or changing
+    archetypes, and pass them to refresh_archetype_matchups().
+    """
+    cursor.execute("""
+        SELECT format, archetype_id, opponent_archetype_id FROM archetype_matchup_cells(%s::integer[])
+    """, (list(tournament_ids),))
+    return cursor.fetchall()
+
+
+def head_to_head_pairs(cursor, tournament_ids):
+    """(player_id, opponent_id) pairs that met in the given tournaments.
+
+    Take them before deleting tournaments or matches, and pass them to
+    refresh_head_to_head().
+    """
+    cursor.execute("SELECT player_id, opponent_id FROM head_to_head_pairs(%s::integer[])",
+                   (list(tournament_ids),))
+    return cursor.fetchall()
+
+
+def rebuild(cursor, function, types, keys):
+    """Call a rebuild_* function with keys as parallel arrays (None = rebuild all)."""
+    columns = [list(column) for column in zip(*keys)] if keys is not None else [None] * len(types)
+    placeholders = ", ".join(f"%s::{sql_type}[]" for sql_type in types)
+    cursor.execute(f"SELECT * FROM {function}({placeholders})", columns)
+    return cursor.fetchone()
+
+
+# =============================================================================
+# Refresh
+# =============================================================================
+
+def refresh_meta_weekly_stats(cursor, tournament_ids=None, buckets=()):
+    """Rebuild the meta_weekly_stats buckets of the given tournaments.
+
+    Args:
+        cursor: psycopg2 cursor (caller commits)
+        tournament_ids: Tournaments whose buckets to rebuild (None = all buckets)
+        buckets: Extra buckets from meta_weekly_buckets() (e.g. taken before a delete)
+
+    Returns:
+        Dict with buckets (rebuilt) and rows (written) counts
+    """
+    if tournament_ids is None:
+        (rows,) = rebuild(cursor, "rebuild_meta_weekly_stats", ("varchar", "integer", "date"), None)
+        cursor.execute("SELECT COUNT(*) FROM meta_weekly_buckets(NULL)")
+        return {"buckets": cursor.fetchone()[0], "rows": rows}
+
+    keys = set(buckets) | set(meta_weekly_buckets(cursor, tournament_ids))
+    if not keys:
+        return {"buckets": 0, "rows": 0}
+    (rows,) = rebuild(cursor, "rebuild_meta_weekly_stats", ("varchar", "integer", "date"), keys)
+    return {"buckets": len(keys), "rows": rows}
+
+
+def refresh_meta_trends(cursor, tournament_ids=None, buckets=()):
+    """Rebuild meta_trend_daily from the given tournaments' weeks onward.
+
+    Each (format, scene) of the tournaments is recomputed from its earliest
+    touched week, so a sync importing the latest events only appends new
+    days; a late-imported event also corrects the rolling windows after it.
+
+    Args:
+        cursor: psycopg2 cursor (caller commits)
+        tournament_ids: Tournaments whose format/scene to update (None = all)
+        buckets: Extra buckets from meta_weekly_buckets() (e.g. taken before a delete)
+
+    Returns:
+        Dict with trend_days (event days written) and trend_rows counts
+    """
+    keys = None
+    if tournament_ids is not None:
+        keys = set(buckets) | set(meta_weekly_buckets(cursor, tournament_ids))
+        if not keys:
+            return {"trend_days": 0, "trend_rows": 0}
+    days, rows = rebuild(cursor, "rebuild_meta_trend_daily", ("varchar", "integer", "date"), keys)
+    return {"trend_days": days, "trend_rows": rows}
+
+
+def refresh_archetype_matchups(cursor, tournament_ids=None, cells=()):
+    """Rebuild the archetype_matchups pairs played in the given tournaments.
+
+    Each touched (format, archetype, opponent archetype) cell is recounted
+    over the whole format, so refreshes are idempotent.
+
+    Args:
+        cursor: psycopg2 cursor (caller commits)
+        tournament_ids: Tournaments whose pairs to rebuild (None = all pairs)
+        cells: Extra cells from archetype_matchup_cells() (e.g. taken before a delete)
+
+    Returns:
+        Dict with pairs (rebuilt) count
+    """
+    keys = None
+    if tournament_ids is not None:
+        keys = set(cells) | set(archetype_matchup_cells(cursor, tournament_ids))
+        if not keys:
+            return {"pairs": 0}
+    (pairs,) = rebuild(cursor, "rebuild_archetype_matchups", ("varchar", "integer", "integer"), keys)
+    return {"pairs": pairs}
+
+
+def refresh_head_to_head(cursor, tournament_ids=None, pairs=()):
+    """Rebuild the player_head_to_head pairs that met in the given tournaments.
+
+    Both orientations of each touched pair are recounted over all matches,
+    so refreshes are idempotent.
+
+    Args:
+        cursor: psycopg2 cursor (caller commits)
+        tournament_ids: Tournaments whose pairs to rebuild (None = all pairs)
+        pairs: Extra pairs from head_to_head_pairs() (e.g. taken before a delete)
+
+    Returns:
+        Dict with player_pairs (rebuilt) count
+    """
+    keys = None
+    if tournament_ids is not None:
+        keys = set(pairs) | set(head_to_head_pairs(cursor, tournament_ids))
+        if not keys:
+            return {"player_pairs": 0}
+    (player_pairs,) = rebuild(cursor, "rebuild_head_to_head", ("integer", "integer"), keys)
+    return {"player_pairs": player_pairs}
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def parse_ids(value):
+    """Parse a comma-separated list of integer ids."""
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    from sync_limitless import get_connection
+
+    parser = argparse.ArgumentParser(description="Refresh pre-aggregated meta tables")
+    parser.add_argument("--tournaments", type=parse_ids,
+                        help="Comma-separated tournament_ids whose buckets/pairs to rebuild")
+    parser.add_argument("--all", action="store_true",
+                        help="Rebuild every bucket/pair")
+    parser.add_argument("--matchups", action="store_true",
+                        help="Rebuild the archetype matchup matrix (default: all tables)")
+    parser.add_argument("--head-to-head", action="store_true",
+                        help="Rebuild player head-to-head records (default: all tables)")
+    parser.add_argument("--trends", action="store_true",
+                        help="Rebuild the daily meta trend store (default: all tables)")
+    args = parser.parse_args()
+
+    if not args.all and not args.tournaments:
+        parser.error("Pass --tournaments or --all")
+    tournament_ids = None if args.all else args.tournaments
+    everything = not (args.matchups or args.head_to_head or args.trends)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    if everything:
+        stats = refresh_meta_weekly_stats(cursor, tournament_ids)
+        conn.commit()
+        print(f"Meta weekly stats: {stats['buckets']} buckets rebuilt ({stats['rows']} rows)")
+    if everything or args.trends:
+        stats = refresh_meta_trends(cursor, tournament_ids)
+        conn.commit()
+        print(f"Meta trends: {stats['trend_days']} days rebuilt ({stats['trend_rows']} rows)")
+    if everything or args.matchups:
+        stats = refresh_archetype_matchups(cursor, tournament_ids)
+        conn.commit()
+        print(f"Archetype matchups: {stats['pairs']} pairs rebuilt")
+    if everything or args.head_to_head:
+        stats = refresh_head_to_head(cursor, tournament_ids)
+        conn.commit()
+        print(f"Player head-to-head: {stats['player_pairs']} pairs rebuilt")
+
+    cursor.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,39 @@ Migrate data from local DuckDB to Neon PostgreSQL.
 
 Reads all tables from data/local.duckdb and inserts them into a Neon
 Postgres database, respecting foreign key order (parents before children).
+The order is derived from REFERENCES clauses in db/schema.sql; tables at the
+same dependency level are migrated concurrently on separate connections.
+
+--delta leaves existing Neon data in place. It compares per-primary-key-range
+checksums on both engines and, for ranges that differ, upserts the DuckDB rows
+and deletes Neon rows that no longer exist, all in one transaction.
+
+Tables in DERIVED_TABLES are not copied: they are computed from the migrated
+data (stored decklists, matches, results), emptied by the full migration's
+TRUNCATE ... CASCADE and recomputed on Neon afterwards with the same code the
+sync uses. After --delta only the changed results and tournaments are
+re-derived. Tables missing from an older local database are skipped.
+
+After a migration (or on its own with --verify) every table is verified with
+the same range checksums, computed server-side on both engines in parallel.
+Only mismatching ranges are drilled into, down to the differing primary keys.
+
+Tables are streamed: DuckDB record batches are encoded as CSV (via Arrow when
+pyarrow is installed, otherwise row batches in COPY text format) and fed to
+Postgres COPY FROM STDIN, so memory stays flat regardless of table size.
 
 Usage:
     python scripts/migrate_to_neon.py                    # migrate data
-    python scripts/migrate_to_neon.py --dry-run           # preview only
+    python scripts/migrate_to_neon.py --dry-run           # preview only (shows dependency levels)
+    python scripts/migrate_to_neon.py --workers 8         # more concurrent tables per level
+    python scripts/migrate_to_neon.py --delta             # transfer only changed PK ranges
+    python scripts/migrate_to_neon.py --verify            # checksum-compare only, no writes
     python scripts/migrate_to_neon.py --schema-only       # create tables first
     python scripts/migrate_to_neon.py --schema-only --dry-run  # show schema SQL
 
 Prerequisites:
-    pip install duckdb psycopg2-binary python-dotenv
+    pip install duckdb numpy psycopg2-binary python-dotenv
+    pip install pyarrow  (optional, faster Arrow-based streaming)
 
 Environment variables (.env):
     NEON_HOST          - Neon Postgres hostname (required)
@@ -21,30 +45,46 @@ Environment variables (.env):
 """
 
 import os
+import re
 import sys
+import time
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import duckdb
 import psycopg2
-from psycopg2.extras import execute_values
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import date, datetime
 from decimal import Decimal
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
 LOCAL_DB = "data/local.duckdb"
 SCHEMA_FILE = "db/schema.sql"
-
-# Tables in FK-safe order (parents before children)
+BATCH_ROWS = 50_000  # Rows per streamed batch (bounds memory per table)
+MAX_WORKERS = 4      # Tables migrated concurrently within a dependency level
+CHUNK_SIZE = 1000    # Primary-key values per checksum range (integer PKs)
+VERIFY_SAMPLE = 5    # Differing primary keys listed per table and kind
+
+# Tables to migrate, in FK-safe order (parents before children). The order
+# actually used is derived from db/schema.sql by migration_levels(); this
+# order is the tie-breaker within a level.
 TABLES = [
     "scenes",
     "stores",
     "store_schedules",
     "formats",
     "cards",
+    "card_sets",
     "players",
     "deck_archetypes",
     "archetype_cards",
@@ -61,6 +101,28 @@ TABLES = [
     "admin_users",
 ]
 
+# Computed from the tables above; rebuilt on Neon after a migration instead of
+# copied (see rebuild_derived_tables)
+DERIVED_TABLES = [
+    "result_cards",
+    "decklist_signatures",
+    "result_tiebreakers",
+    "meta_weekly_stats",
+    "meta_trend_daily",
+    "archetype_matchups",
+    "player_head_to_head",
+]
+
+# Migrated tables whose changes reach DERIVED_TABLES, with the columns that
+# locate the affected results and tournaments (see delta_scope)
+DERIVED_SOURCES = {
+    "stores": ["store_id"],
+    "deck_archetypes": ["archetype_id"],
+    "tournaments": ["tournament_id"],
+    "results": ["result_id", "tournament_id"],
+    "matches": ["tournament_id"],
+}
+
 # Tables that have auto-increment (GENERATED BY DEFAULT AS IDENTITY) columns
 # Format: (table_name, id_column_name)
 IDENTITY_TABLES = [
@@ -91,6 +153,12 @@ def connect_duckdb():
     return duckdb.connect(str(db_path), read_only=True)
 
 
+def local_tables(duck_conn, tables=TABLES):
+    """Return the tables (in the given order) that exist in the local DuckDB file."""
+    present = {row[0].lower() for row in duck_conn.execute("SHOW TABLES").fetchall()}
+    return [table for table in tables if table in present]
+
+
 def connect_neon():
     """Connect to Neon Postgres using env vars."""
     host = os.getenv("NEON_HOST")
@@ -120,20 +188,160 @@ def connect_neon():
     )
 
 
-def convert_row(row):
-    """Convert a single row's values for Postgres compatibility.
+_print_lock = threading.Lock()
+
+
+def log(message):
+    """Print a whole line at once (safe from concurrent migration threads)."""
+    with _print_lock:
+        print(message, flush=True)
+
+
+def copy_text_value(val):
+    """Encode one value for Postgres COPY text format (NULL -> \\N)."""
+    if val is None:
+        return "\\N"
+    if isinstance(val, bool):
+        return "t" if val else "f"
+    if isinstance(val, datetime):
+        return val.isoformat(sep=" ")
+    if isinstance(val, (date, int, float, Decimal)):
+        return str(val)
+    return (
+        str(val)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class ChunkStream:
+    """File-like wrapper over an iterator of byte chunks, for cursor.copy_expert.
 
-    DuckDB may return types that psycopg2 doesn't handle automatically:
-    - Decimal -> float (for cleaner insert; Postgres casts back)
-    - Other types (bool, date, datetime, str, int, None) pass through fine.
+    psycopg2 forwards whatever read() returns to the server and stops at an
+    empty result, so each call simply hands over the next chunk.
     """
-    converted = []
-    for val in row:
-        if isinstance(val, Decimal):
-            converted.append(float(val))
-        else:
-            converted.append(val)
-    return tuple(converted)
+
+    def __init__(self, chunks):
+        self._chunks = (chunk for chunk in chunks if chunk)
+
+    def read(self, size=-1):
+        return next(self._chunks, b"")
+
+    readline = read
+
+
+def arrow_csv_chunks(result, batch_rows=BATCH_ROWS):
+    """Yield CSV-encoded DuckDB record batches (Arrow path).
+
+    Arrow writes NULL as an empty field and '' as a quoted empty string,
+    which is exactly how Postgres COPY CSV tells them apart.
+    """
+    reader = (
+        result.to_arrow_reader(batch_rows)
+        if hasattr(result, "to_arrow_reader")
+        else result.fetch_record_batch(batch_rows)
+    )
+    options = pa_csv.WriteOptions(include_header=False)
+    for batch in reader:
+        sink = pa.BufferOutputStream()
+        pa_csv.write_csv(batch, sink, options)
+        yield sink.getvalue().to_pybytes()
+
+
+def text_copy_chunks(result, batch_rows=BATCH_ROWS):
+    """Yield COPY-text-encoded row batches (fallback when pyarrow is missing)."""
+    while True:
+        rows = result.fetchmany(batch_rows)
+        if not rows:
+            return
+        lines = ["\t".join(copy_text_value(val) for val in row) for row in rows]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Dependency order
+# ---------------------------------------------------------------------------
+
+
+def read_schema(schema_path=SCHEMA_FILE):
+    """Return the schema file's SQL with comments stripped."""
+    content = Path(schema_path).read_text(encoding="utf-8")
+    return re.sub(r"--[^\n]*", "", content)
+
+
+def schema_table_bodies(content):
+    """Yield (table, column list text) for each CREATE TABLE in schema SQL."""
+    for match in re.finditer(r"CREATE TABLE\s+(?:IF NOT EXISTS\s+)?(\w+)\s*\(", content, re.IGNORECASE):
+        # Scan to the matching close paren of the column list
+        depth, pos = 1, match.end()
+        while depth and pos < len(content):
+            if content[pos] == "(":
+                depth += 1
+            elif content[pos] == ")":
+                depth -= 1
+            pos += 1
+        yield match.group(1).lower(), content[match.end():pos - 1]
+
+
+def parse_table_dependencies(schema_path=SCHEMA_FILE):
+    """Map each CREATE TABLE in the schema file to the tables it REFERENCES.
+
+    Self-references (e.g. scenes.parent_scene_id) are ignored.
+    """
+    content = read_schema(schema_path)
+
+    dependencies = {}
+    for table, body in schema_table_bodies(content):
+        referenced = {ref.lower() for ref in re.findall(r"REFERENCES\s+(\w+)", body, re.IGNORECASE)}
+        dependencies[table] = referenced - {table}
+
+    for table, ref in re.findall(r"ALTER TABLE\s+(\w+)\s+ADD[^;]*?REFERENCES\s+(\w+)", content, re.IGNORECASE):
+        if table.lower() != ref.lower():
+            dependencies.setdefault(table.lower(), set()).add(ref.lower())
+
+    return dependencies
+
+
+def parse_primary_keys(schema_path=SCHEMA_FILE):
+    """Map each CREATE TABLE in the schema file to its primary key column list."""
+    primary_keys = {}
+    for table, body in schema_table_bodies(read_schema(schema_path)):
+        composite = re.search(r"PRIMARY KEY\s*\(([^)]*)\)", body, re.IGNORECASE)
+        if composite:
+            primary_keys[table] = [col.strip().lower() for col in composite.group(1).split(",")]
+            continue
+        for line in body.split("\n"):
+            if re.search(r"\bPRIMARY KEY\b", line, re.IGNORECASE):
+                primary_keys[table] = [line.split()[0].lower()]
+                break
+    return primary_keys
+
+
+def migration_levels(tables=TABLES, schema_path=SCHEMA_FILE):
+    """Group tables into FK dependency levels (each level only references earlier ones).
+
+    Dependencies on tables outside `tables` are ignored. Any cycle is broken
+    by emitting the remaining tables one per level in `tables` order.
+    """
+    dependencies = parse_table_dependencies(schema_path)
+    selected = set(tables)
+    pending = {table: dependencies.get(table, set()) & selected for table in tables}
+
+    levels = []
+    while pending:
+        ready = [table for table in tables if table in pending and not pending[table]]
+        if not ready:
+            ready = [next(table for table in tables if table in pending)]
+            print(f"  Warning: FK cycle among {sorted(pending)}, migrating {ready[0]} first")
+        levels.append(ready)
+        for table in ready:
+            del pending[table]
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+    return levels
 
 
 # ---------------------------------------------------------------------------
@@ -141,6 +349,22 @@ def convert_row(row):
 # ---------------------------------------------------------------------------
 
 
+def split_statements(content):
+    """Split SQL on semicolons, except inside $$-quoted function bodies."""
+    statements, current = [], ""
+    for i, part in enumerate(content.split("$$")):
+        if i % 2:
+            current += f"$${part}$$"
+            continue
+        pieces = part.split(";")
+        current += pieces[0]
+        for piece in pieces[1:]:
+            statements.append(current)
+            current = piece
+    statements.append(current)
+    return statements
+
+
 def run_schema(pg_conn, dry_run=False):
     """Execute the Postgres schema SQL file on Neon."""
     schema_path = Path(SCHEMA_FILE)
@@ -152,7 +376,7 @@ def run_schema(pg_conn, dry_run=False):
         content = f.read()
 
     # Split on semicolons, filter out empty/comment-only statements
-    statements = content.split(";")
+    statements = split_statements(content)
     valid_stmts = []
     for stmt in statements:
         cleaned = stmt.strip()
@@ -211,46 +435,46 @@ def run_schema(pg_conn, dry_run=False):
 # ---------------------------------------------------------------------------
 
 
-def migrate_table(duck_conn, pg_conn, table, dry_run=False):
-    """Migrate a single table from DuckDB to Postgres.
+def migrate_table(duck_conn, pg_conn, table, dry_run=False, truncate=True):
+    """Stream a single table from DuckDB to Postgres with COPY FROM STDIN.
+
+    Pass truncate=False when the caller has already emptied the table.
 
     Returns the number of rows migrated (or that would be migrated in dry-run).
     Raises on error so the caller can handle it.
     """
-    # Read all rows from DuckDB
-    result = duck_conn.execute(f"SELECT * FROM {table}")
-    columns = [desc[0] for desc in result.description]
-    rows = result.fetchall()
+    row_count = duck_conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
 
-    if not rows:
-        print(f"  {table}: skipped (0 rows)")
+    if not row_count:
+        log(f"  {table}: skipped (0 rows)")
         return 0
 
-    row_count = len(rows)
-
     if dry_run:
-        print(f"  {table}: {row_count} rows (would migrate)")
+        log(f"  {table}: {row_count} rows (would migrate)")
         return row_count
 
-    cur = pg_conn.cursor()
+    result = duck_conn.execute(f"SELECT * FROM {table}")
+    columns = [desc[0] for desc in result.description]
+    cols_str = ", ".join(columns)
 
-    try:
-        # Truncate existing data (CASCADE to handle FK references)
-        cur.execute(f"TRUNCATE TABLE {table} CASCADE")
+    if pa is not None:
+        chunks = arrow_csv_chunks(result)
+        copy_sql = f"COPY {table} ({cols_str}) FROM STDIN WITH (FORMAT csv)"
+    else:
+        chunks = text_copy_chunks(result)
+        copy_sql = f"COPY {table} ({cols_str}) FROM STDIN"
 
-        # Build INSERT template
-        cols_str = ", ".join(columns)
-        template = f"({', '.join(['%s'] * len(columns))})"
+    cur = pg_conn.cursor()
 
-        # Convert rows for Postgres compatibility
-        converted_rows = [convert_row(row) for row in rows]
+    try:
+        if truncate:
+            # Truncate existing data (CASCADE to handle FK references)
+            cur.execute(f"TRUNCATE TABLE {table} CASCADE")
 
-        # Bulk insert using execute_values for speed
-        insert_sql = f"INSERT INTO {table} ({cols_str}) VALUES %s"
-        execute_values(cur, insert_sql, converted_rows, template=template, page_size=1000)
+        cur.copy_expert(copy_sql, ChunkStream(chunks))
 
         pg_conn.commit()
-        print(f"  {table}: {row_count} rows migrated")
+        log(f"  {table}: {row_count} rows migrated")
         return row_count
 
     except Exception:
@@ -260,6 +484,575 @@ def migrate_table(duck_conn, pg_conn, table, dry_run=False):
         cur.close()
 
 
+def truncate_tables(pg_conn, tables):
+    """Empty all target tables in one statement before a parallel load."""
+    cur = pg_conn.cursor()
+    try:
+        cur.execute(f"TRUNCATE TABLE {', '.join(tables)} CASCADE")
+        pg_conn.commit()
+    except Exception:
+        pg_conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def migrate_table_worker(duck_conn, table, dry_run=False):
+    """Migrate one table on its own DuckDB cursor and Neon connection (thread-safe)."""
+    duck_cursor = duck_conn.cursor()
+    pg_conn = None if dry_run else connect_neon()
+    try:
+        return migrate_table(duck_cursor, pg_conn, table, dry_run=dry_run, truncate=False)
+    finally:
+        duck_cursor.close()
+        if pg_conn:
+            pg_conn.close()
+
+
+def migrate_levels(duck_conn, pg_conn, levels, dry_run=False, workers=MAX_WORKERS):
+    """Migrate tables level by level, running each level's tables concurrently.
+
+    Returns:
+        Tuple of (total_rows, errors) where errors is a list of (table, message)
+    """
+    if not dry_run:
+        truncate_tables(pg_conn, [table for level in levels for table in level] + DERIVED_TABLES)
+
+    total_rows = 0
+    errors = []
+
+    for number, level in enumerate(levels, 1):
+        print(f"  Level {number}: {', '.join(level)}")
+        level_started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(level)))) as executor:
+            futures = {
+                executor.submit(migrate_table_worker, duck_conn, table, dry_run): table
+                for table in level
+            }
+            for future in as_completed(futures):
+                table = futures[future]
+                try:
+                    total_rows += future.result()
+                except Exception as e:
+                    err_msg = str(e).strip().split("\n")[0]
+                    log(f"  {table}: ERROR - {err_msg[:120]}")
+                    errors.append((table, err_msg))
+        print(f"  Level {number} done in {time.monotonic() - level_started:.2f}s")
+
+    return total_rows, errors
+
+
+# ---------------------------------------------------------------------------
+# Range checksums (shared by --delta)
+# ---------------------------------------------------------------------------
+
+INTEGER_TYPES = {"smallint", "integer", "bigint"}
+
+
+def pg_column_types(pg_conn, table):
+    """Return {column: data_type} for a Postgres table ({} if it does not exist)."""
+    cur = pg_conn.cursor()
+    cur.execute("""
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+    """, (table,))
+    types = dict(cur.fetchall())
+    cur.close()
+    return types
+
+
+def normalized_value_sql(column, pg_type, engine):
+    """SQL rendering a column as text identically on DuckDB and Postgres.
+
+    Categories come from the Postgres (target) type; DuckDB values are cast to
+    that type first, so a VARCHAR timestamp in DuckDB still compares equal.
+    Timestamps become epoch microseconds and fractional numbers are scaled to
+    integers, sidestepping engine-specific text formats. NULL becomes \\N.
+    """
+    duck = engine == "duckdb"
+    if pg_type == "boolean":
+        value = f"CAST({column} AS BOOLEAN)" if duck else column
+        expr = f"CASE WHEN {value} THEN 't' WHEN NOT {value} THEN 'f' END"
+    elif pg_type.startswith("timestamp"):
+        expr = (f"CAST(epoch_us(CAST({column} AS TIMESTAMP)) AS VARCHAR)" if duck
+                else f"(EXTRACT(EPOCH FROM {column}) * 1000000)::bigint::text")
+    elif pg_type in ("numeric", "double precision", "real"):
+        expr = (f"CAST(CAST(ROUND(CAST({column} AS DOUBLE) * 1000000) AS BIGINT) AS VARCHAR)" if duck
+                else f"ROUND({column}::numeric * 1000000)::bigint::text")
+    elif pg_type == "date":
+        expr = f"CAST(CAST({column} AS DATE) AS VARCHAR)" if duck else f"{column}::text"
+    else:
+        expr = f"CAST({column} AS VARCHAR)" if duck else f"{column}::text"
+    return f"COALESCE({expr}, '\\N')"
+
+
+def bucket_sql(primary_key, pg_types, chunk_size, alias=""):
+    """Range bucket of a row: PK // chunk_size for single integer PKs, else one bucket.
+
+    Tables with composite or non-integer keys are checksummed as a single range.
+    """
+    if len(primary_key) == 1 and pg_types.get(primary_key[0]) in INTEGER_TYPES:
+        column = f"{alias}.{primary_key[0]}" if alias else primary_key[0]
+        return f"CAST(FLOOR(CAST({column} AS BIGINT) / {int(chunk_size)}) AS BIGINT)"
+    return "0"
+
+
+TEXT_TYPES = {"character varying", "text", "character"}
+
+
+def hash_order_sql(primary_key, pg_types, engine):
+    """ORDER BY list for the range hash, sorting text keys bytewise on both engines.
+
+    DuckDB compares strings bytewise; Postgres uses the database collation
+    (e.g. en_US.UTF-8) unless told otherwise, which orders case and
+    punctuation differently and would make every text-keyed range differ.
+    """
+    if engine == "duckdb":
+        return ", ".join(primary_key)
+    return ", ".join(f'{col} COLLATE "C"' if pg_types.get(col) in TEXT_TYPES else col
+                     for col in primary_key)
+
+
+def range_checksum_sql(table, columns, primary_key, pg_types, engine, chunk_size):
+    """Query returning (bucket, row_count, md5) per PK range, rows hashed in PK order."""
+    values = ", ".join(normalized_value_sql(col, pg_types[col], engine) for col in columns)
+    return f"""
+        SELECT bucket, COUNT(*), md5(string_agg(row_hash, '' ORDER BY {hash_order_sql(primary_key, pg_types, engine)}))
+        FROM (
+            SELECT {bucket_sql(primary_key, pg_types, chunk_size)} AS bucket,
+                   md5(concat_ws(chr(31), {values})) AS row_hash,
+                   {", ".join(primary_key)}
+            FROM {table}
+        ) hashed
+        GROUP BY bucket
+    """
+
+
+def query_both(duck_conn, pg_conn, duck_sql, pg_sql):
+    """Run one query on each engine concurrently and return both row lists.
+
+    The DuckDB side runs on its own cursor in a helper thread while Postgres
+    computes, so a table costs max(duck, pg) rather than their sum.
+    """
+    def run_duck():
+        duck_cursor = duck_conn.cursor()
+        try:
+            return duck_cursor.execute(duck_sql).fetchall()
+        finally:
+            duck_cursor.close()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        duck_future = executor.submit(run_duck)
+        cur = pg_conn.cursor()
+        try:
+            cur.execute(pg_sql)
+            pg_rows = cur.fetchall()
+        finally:
+            cur.close()
+        return duck_future.result(), pg_rows
+
+
+def range_checksums(duck_conn, pg_conn, table, columns, primary_key, pg_types, chunk_size=CHUNK_SIZE):
+    """Compute {bucket: (count, md5)} for a table on both engines.
+
+    Returns:
+        Tuple of (duckdb_checksums, postgres_checksums)
+    """
+    duck_rows, pg_rows = query_both(
+        duck_conn, pg_conn,
+        range_checksum_sql(table, columns, primary_key, pg_types, "duckdb", chunk_size),
+        range_checksum_sql(table, columns, primary_key, pg_types, "postgres", chunk_size),
+    )
+    return (
+        {bucket: (count, digest) for bucket, count, digest in duck_rows},
+        {bucket: (count, digest) for bucket, count, digest in pg_rows},
+    )
+
+
+def row_hashes(duck_conn, pg_conn, table, columns, primary_key, pg_types, chunk_size, buckets):
+    """Per-row hashes within the given buckets, keyed by normalized primary key.
+
+    Returns:
+        Tuple of (duckdb {pk: md5}, postgres {pk: md5})
+    """
+    def sql(engine):
+        keys = ", ".join(normalized_value_sql(col, pg_types[col], engine) for col in primary_key)
+        values = ", ".join(normalized_value_sql(col, pg_types[col], engine) for col in columns)
+        bucket_list = ", ".join(str(int(bucket)) for bucket in buckets)
+        return f"""
+            SELECT {keys}, md5(concat_ws(chr(31), {values}))
+            FROM {table}
+            WHERE {bucket_sql(primary_key, pg_types, chunk_size)} IN ({bucket_list})
+        """
+
+    duck_rows, pg_rows = query_both(duck_conn, pg_conn, sql("duckdb"), sql("postgres"))
+    return (
+        {tuple(row[:-1]): row[-1] for row in duck_rows},
+        {tuple(row[:-1]): row[-1] for row in pg_rows},
+    )
+
+
+def differing_buckets(duck_sums, pg_sums):
+    """Buckets whose row count or checksum differs (or that exist on one side only)."""
+    return sorted(
+        bucket for bucket in set(duck_sums) | set(pg_sums)
+        if duck_sums.get(bucket) != pg_sums.get(bucket)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Checksum verification
+# ---------------------------------------------------------------------------
+
+
+def verify_table(duck_conn, pg_conn, table, primary_key, chunk_size=CHUNK_SIZE):
+    """Compare a table's range checksums and drill into mismatching ranges.
+
+    Returns:
+        Dict with table, duck_rows, pg_rows, buckets_total, buckets (mismatching),
+        and missing / extra / changed lists of primary keys (as text tuples)
+    """
+    columns = [desc[0] for desc in duck_conn.execute(f"SELECT * FROM {table} LIMIT 0").description]
+    pg_types = pg_column_types(pg_conn, table)
+    missing_columns = [col for col in columns if col not in pg_types]
+    if missing_columns:
+        raise ValueError(f"columns missing in Postgres: {', '.join(missing_columns)}")
+
+    duck_sums, pg_sums = range_checksums(duck_conn, pg_conn, table, columns, primary_key, pg_types, chunk_size)
+    buckets = differing_buckets(duck_sums, pg_sums)
+    result = {
+        "table": table,
+        "duck_rows": sum(count for count, _ in duck_sums.values()),
+        "pg_rows": sum(count for count, _ in pg_sums.values()),
+        "buckets_total": len(set(duck_sums) | set(pg_sums)),
+        "buckets": buckets,
+        "missing": [],
+        "extra": [],
+        "changed": [],
+    }
+    if not buckets:
+        return result
+
+    duck_hashes, pg_hashes = row_hashes(duck_conn, pg_conn, table, columns, primary_key, pg_types,
+                                        chunk_size, buckets)
+    result["missing"] = sorted(set(duck_hashes) - set(pg_hashes))
+    result["extra"] = sorted(set(pg_hashes) - set(duck_hashes))
+    result["changed"] = sorted(key for key in set(duck_hashes) & set(pg_hashes)
+                               if duck_hashes[key] != pg_hashes[key])
+    return result
+
+
+def verify_table_worker(duck_conn, table, primary_key, chunk_size=CHUNK_SIZE):
+    """Verify one table on its own DuckDB cursor and Neon connection (thread-safe)."""
+    duck_cursor = duck_conn.cursor()
+    pg_conn = connect_neon()
+    try:
+        return verify_table(duck_cursor, pg_conn, table, primary_key, chunk_size)
+    finally:
+        duck_cursor.close()
+        pg_conn.close()
+
+
+def verify_tables(duck_conn, tables=TABLES, chunk_size=CHUNK_SIZE, workers=MAX_WORKERS):
+    """Checksum-verify tables concurrently.
+
+    Returns:
+        Tuple of (list of verify_table() results in table order, errors)
+    """
+    primary_keys = parse_primary_keys()
+    results = {}
+    errors = []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(verify_table_worker, duck_conn, table, primary_keys[table], chunk_size): table
+            for table in tables if table in primary_keys
+        }
+        for future in as_completed(futures):
+            table = futures[future]
+            try:
+                results[table] = future.result()
+            except Exception as e:
+                err_msg = str(e).strip().split("\n")[0]
+                log(f"  {table}: ERROR - {err_msg[:120]}")
+                errors.append((table, err_msg))
+
+    return [results[table] for table in tables if table in results], errors
+
+
+def print_verification(results, errors):
+    """Print checksum verification results. Returns True if every table matches."""
+    print("\n" + "=" * 65)
+    print("CHECKSUM VERIFICATION")
+    print("=" * 65)
+    print(f"{'Table':<24} {'DuckDB':>8} {'Postgres':>8} {'Ranges':>9} {'Status':>10}")
+    print("-" * 65)
+
+    for result in results:
+        status = "MISMATCH" if result["buckets"] else "OK"
+        ranges = f"{len(result['buckets'])}/{result['buckets_total']}"
+        print(f"  {result['table']:<22} {result['duck_rows']:>8} {result['pg_rows']:>8} {ranges:>9} {status:>10}")
+        for kind, label in (("missing", "missing in Postgres"), ("extra", "only in Postgres"),
+                            ("changed", "different values")):
+            keys = result[kind]
+            if keys:
+                sample = ", ".join("/".join(key) for key in keys[:VERIFY_SAMPLE])
+                more = f" (+{len(keys) - VERIFY_SAMPLE} more)" if len(keys) > VERIFY_SAMPLE else ""
+                print(f"      {len(keys)} {label}: {sample}{more}")
+    for table, err_msg in errors:
+        print(f"  {table:<22} {'':>8} {'':>8} {'':>9} {'ERROR':>10}")
+
+    print("-" * 65)
+    all_match = not errors and not any(result["buckets"] for result in results)
+    if all_match:
+        print("All tables match (row content verified).")
+    else:
+        print("WARNING: Some tables differ. Mismatching primary keys are listed above.")
+    print("=" * 65)
+    return all_match
+
+
+# ---------------------------------------------------------------------------
+# Delta migration
+# ---------------------------------------------------------------------------
+
+
+def stage_delta(duck_conn, pg_conn, table, primary_key, chunk_size=CHUNK_SIZE, dry_run=False):
+    """Find differing PK ranges for a table and stage DuckDB's rows for them.
+
+    Rows in differing ranges are copied into a temp table (dropped at commit)
+    that apply_delta_deletes() and apply_delta_upserts() merge from.
+
+    Returns:
+        Dict with table, buckets (differing), buckets_total, and the staging
+        details the apply functions need (stage is None if nothing differs)
+    """
+    columns = [desc[0] for desc in duck_conn.execute(f"SELECT * FROM {table} LIMIT 0").description]
+    pg_types = pg_column_types(pg_conn, table)
+    missing = [col for col in columns if col not in pg_types]
+    if missing:
+        raise ValueError(f"{table}: columns missing in Postgres: {', '.join(missing)}")
+
+    duck_sums, pg_sums = range_checksums(duck_conn, pg_conn, table, columns, primary_key, pg_types, chunk_size)
+    buckets = differing_buckets(duck_sums, pg_sums)
+    stats = {
+        "table": table,
+        "buckets": len(buckets),
+        "buckets_total": len(set(duck_sums) | set(pg_sums)),
+        "upserted": 0,
+        "deleted": 0,
+        "stage": None,
+    }
+    if not buckets or dry_run:
+        return stats
+
+    bucket_list = ", ".join(str(int(bucket)) for bucket in buckets)
+    stage_table = f"_delta_{table}"
+    cols_str = ", ".join(columns)
+
+    cur = pg_conn.cursor()
+    cur.execute(f"CREATE TEMP TABLE {stage_table} (LIKE {table}) ON COMMIT DROP")
+    result = duck_conn.execute(
+        f"SELECT {cols_str} FROM {table} WHERE {bucket_sql(primary_key, pg_types, chunk_size)} IN ({bucket_list})"
+    )
+    if pa is not None:
+        cur.copy_expert(f"COPY {stage_table} ({cols_str}) FROM STDIN WITH (FORMAT csv)",
+                        ChunkStream(arrow_csv_chunks(result)))
+    else:
+        cur.copy_expert(f"COPY {stage_table} ({cols_str}) FROM STDIN", ChunkStream(text_copy_chunks(result)))
+    cur.close()
+
+    stats["stage"] = {
+        "stage_table": stage_table,
+        "columns": columns,
+        "primary_key": primary_key,
+        "range_filter": f"{bucket_sql(primary_key, pg_types, chunk_size, alias='t')} IN ({bucket_list})",
+    }
+    return stats
+
+
+def apply_delta_deletes(pg_conn, table, stage):
+    """Delete Postgres rows in the staged ranges that are absent from DuckDB."""
+    match = " AND ".join(f"s.{col} = t.{col}" for col in stage["primary_key"])
+    cur = pg_conn.cursor()
+    cur.execute(f"""
+        DELETE FROM {table} t
+        WHERE {stage['range_filter']}
+          AND NOT EXISTS (SELECT 1 FROM {stage['stage_table']} s WHERE {match})
+    """)
+    deleted = cur.rowcount
+    cur.close()
+    return deleted
+
+
+def apply_delta_upserts(pg_conn, table, stage):
+    """Insert or update staged rows, writing only rows whose values differ."""
+    columns, primary_key = stage["columns"], stage["primary_key"]
+    cols_str = ", ".join(columns)
+    non_key = [col for col in columns if col not in primary_key]
+    if non_key:
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in non_key)
+        current = ", ".join(f"{table}.{col}" for col in non_key)
+        incoming = ", ".join(f"EXCLUDED.{col}" for col in non_key)
+        on_conflict = f"DO UPDATE SET {updates} WHERE ({current}) IS DISTINCT FROM ({incoming})"
+    else:
+        on_conflict = "DO NOTHING"
+
+    cur = pg_conn.cursor()
+    cur.execute(f"""
+        INSERT INTO {table} ({cols_str})
+        SELECT {cols_str} FROM {stage['stage_table']}
+        ON CONFLICT ({', '.join(primary_key)}) {on_conflict}
+    """)
+    upserted = cur.rowcount
+    cur.close()
+    return upserted
+
+
+def delta_changed_keys(pg_conn, table, stage, columns):
+    """Values of columns in the rows a staged delta inserts, updates or deletes.
+
+    Runs before the delta is applied; updated rows contribute both their old
+    and new values.
+
+    Returns:
+        Dict of column -> sorted list of distinct non-NULL values
+    """
+    primary_key = stage["primary_key"]
+    match = " AND ".join(f"s.{col} = t.{col}" for col in primary_key)
+    non_key = [col for col in stage["columns"] if col not in primary_key]
+    if non_key:
+        differs = (f"({', '.join('t.' + col for col in non_key)}) IS DISTINCT FROM "
+                   f"({', '.join('s.' + col for col in non_key)})")
+    else:
+        differs = "FALSE"
+
+    cur = pg_conn.cursor()
+    cur.execute(f"""
+        SELECT {', '.join('s.' + col for col in columns)}
+        FROM {stage['stage_table']} s
+        LEFT JOIN {table} t ON {match}
+        WHERE t.{primary_key[0]} IS NULL OR {differs}
+        UNION
+        SELECT {', '.join('t.' + col for col in columns)}
+        FROM {table} t
+        LEFT JOIN {stage['stage_table']} s ON {match}
+        WHERE {stage['range_filter']} AND (s.{primary_key[0]} IS NULL OR {differs})
+    """)
+    rows = cur.fetchall()
+    cur.close()
+    return {col: sorted({row[i] for row in rows if row[i] is not None}) for i, col in enumerate(columns)}
+
+
+def delta_scope(pg_conn, changed_keys):
+    """Results and tournaments whose derived rows depend on the changed rows.
+
+    Store and archetype changes are resolved to tournaments through the
+    current data, so this runs both before and after the delta is applied.
+
+    Args:
+        pg_conn: psycopg2 connection
+        changed_keys: Dict of table -> delta_changed_keys() result
+
+    Returns:
+        Tuple (result_ids, tournament_ids) of sets
+    """
+    result_ids = set(changed_keys.get("results", {}).get("result_id", []))
+    tournament_ids = set()
+    for table in ("tournaments", "results", "matches"):
+        tournament_ids.update(changed_keys.get(table, {}).get("tournament_id", []))
+
+    cur = pg_conn.cursor()
+    store_ids = changed_keys.get("stores", {}).get("store_id")
+    if store_ids:
+        cur.execute("SELECT tournament_id FROM tournaments WHERE store_id = ANY(%s)", (store_ids,))
+        tournament_ids.update(row[0] for row in cur.fetchall())
+    archetype_ids = changed_keys.get("deck_archetypes", {}).get("archetype_id")
+    if archetype_ids:
+        cur.execute("SELECT DISTINCT tournament_id FROM results WHERE archetype_id = ANY(%s)", (archetype_ids,))
+        tournament_ids.update(row[0] for row in cur.fetchall())
+    cur.close()
+    return result_ids, tournament_ids
+
+
+def delta_migrate(duck_conn, pg_conn, levels, chunk_size=CHUNK_SIZE, dry_run=False):
+    """Bring Postgres in line with DuckDB by transferring only differing PK ranges.
+
+    All differing ranges are staged first; deletes then run children-first
+    (reverse level order) so re-entered rows don't collide on unique keys,
+    and upserts run parents-first. Everything happens in one transaction, so
+    Neon never sees an emptied or half-applied table.
+
+    The scope for rebuild_derived_tables() is collected along the way: the
+    results and tournaments touched by the differing rows (before and after
+    the change), plus the weekly buckets, matchup cells and player pairs
+    those tournaments had before it, so deleted or moved rows are recounted.
+
+    Returns:
+        Tuple of (list of per-table stats dicts, errors, scope dict with
+        result_ids, tournament_ids, buckets, cells and pairs)
+    """
+    scripts_dir = Path(__file__).parent
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    from meta_aggregates import meta_weekly_buckets, archetype_matchup_cells, head_to_head_pairs
+
+    primary_keys = parse_primary_keys()
+    all_stats = []
+    errors = []
+    scope = {"result_ids": [], "tournament_ids": [], "buckets": [], "cells": [], "pairs": []}
+
+    try:
+        for level in levels:
+            for table in level:
+                if table not in primary_keys:
+                    log(f"  {table}: skipped (no primary key in schema)")
+                    continue
+                stats = stage_delta(duck_conn, pg_conn, table, primary_keys[table], chunk_size, dry_run)
+                all_stats.append(stats)
+                log(f"  {table}: {stats['buckets']}/{stats['buckets_total']} ranges differ")
+
+        staged = [stats for stats in all_stats if stats["stage"]]
+        changed_keys = {
+            stats["table"]: delta_changed_keys(pg_conn, stats["table"], stats["stage"], DERIVED_SOURCES[stats["table"]])
+            for stats in staged if stats["table"] in DERIVED_SOURCES
+        }
+        result_ids, tournament_ids = delta_scope(pg_conn, changed_keys)
+        cur = pg_conn.cursor()
+        captured = {
+            "buckets": meta_weekly_buckets(cur, tournament_ids),
+            "cells": archetype_matchup_cells(cur, tournament_ids),
+            "pairs": head_to_head_pairs(cur, tournament_ids),
+        }
+        cur.close()
+
+        for stats in reversed(staged):
+            stats["deleted"] = apply_delta_deletes(pg_conn, stats["table"], stats["stage"])
+        for stats in staged:
+            stats["upserted"] = apply_delta_upserts(pg_conn, stats["table"], stats["stage"])
+            log(f"  {stats['table']}: upserted {stats['upserted']}, deleted {stats['deleted']} rows")
+
+        new_result_ids, new_tournament_ids = delta_scope(pg_conn, changed_keys)
+        if dry_run:
+            pg_conn.rollback()
+        else:
+            pg_conn.commit()
+            scope = {
+                "result_ids": sorted(result_ids | new_result_ids),
+                "tournament_ids": sorted(tournament_ids | new_tournament_ids),
+                **captured,
+            }
+    except Exception as e:
+        pg_conn.rollback()
+        for stats in all_stats:
+            stats["upserted"] = stats["deleted"] = 0
+        errors.append(("delta", str(e).strip().split("\n")[0]))
+        log(f"  Delta migration rolled back: {errors[-1][1][:120]}")
+
+    return all_stats, errors, scope
+
+
 def reset_sequences(pg_conn, dry_run=False):
     """Reset identity sequences for auto-increment tables to MAX(id) + 1."""
     print("\nResetting identity sequences...")
@@ -291,7 +1084,63 @@ def reset_sequences(pg_conn, dry_run=False):
     cur.close()
 
 
-def print_summary(duck_conn, pg_conn, dry_run=False):
+def rebuild_derived_tables(pg_conn, scope=None):
+    """Recompute DERIVED_TABLES on Neon from the migrated tables.
+
+    With a scope from delta_migrate(), only the changed results' card rows
+    and signatures are re-derived, and tiebreakers and aggregates are
+    refreshed for the changed tournaments (plus the keys captured before the
+    change). Without one, everything is rebuilt.
+
+    result_cards is backfilled in committed batches; everything else is
+    rebuilt in one transaction.
+    """
+    scripts_dir = Path(__file__).parent
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    from sync_limitless import backfill_result_cards
+    from decklist_similarity import refresh_signatures
+    from tiebreakers import refresh_tiebreakers
+    from meta_aggregates import (refresh_meta_weekly_stats, refresh_meta_trends,
+                                 refresh_archetype_matchups, refresh_head_to_head)
+
+    tournament_ids = None
+    buckets = cells = pairs = ()
+    if scope is not None:
+        tournament_ids = scope["tournament_ids"]
+        buckets, cells, pairs = scope["buckets"], scope["cells"], scope["pairs"]
+
+    cur = pg_conn.cursor()
+    try:
+        if scope is not None:
+            # Changed decklists are re-derived by the backfill and refresh below
+            cur.execute("DELETE FROM result_cards WHERE result_id = ANY(%s)", (scope["result_ids"],))
+            cur.execute("DELETE FROM decklist_signatures WHERE result_id = ANY(%s)", (scope["result_ids"],))
+            pg_conn.commit()
+        # Commits per batch, so an interrupted rebuild resumes where it stopped
+        stats = backfill_result_cards(pg_conn, cur)
+        print(f"  result_cards: {stats['card_rows']} rows from {stats['results']} decklists")
+        stats = refresh_signatures(cur)
+        print(f"  decklist_signatures: {stats['added']} signatures")
+        stats = refresh_tiebreakers(cur, tournament_ids)
+        print(f"  result_tiebreakers: {stats['results']} results over {stats['tournaments']} tournaments")
+        stats = refresh_meta_weekly_stats(cur, tournament_ids, buckets)
+        print(f"  meta_weekly_stats: {stats['buckets']} buckets ({stats['rows']} rows)")
+        stats = refresh_meta_trends(cur, tournament_ids, buckets)
+        print(f"  meta_trend_daily: {stats['trend_days']} days ({stats['trend_rows']} rows)")
+        stats = refresh_archetype_matchups(cur, tournament_ids, cells)
+        print(f"  archetype_matchups: {stats['pairs']} pairs")
+        stats = refresh_head_to_head(cur, tournament_ids, pairs)
+        print(f"  player_head_to_head: {stats['player_pairs']} pairs")
+        pg_conn.commit()
+    except Exception:
+        pg_conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def print_summary(duck_conn, pg_conn, tables=TABLES, dry_run=False):
     """Print row counts from both databases and flag mismatches."""
     print("\n" + "=" * 65)
     print("MIGRATION SUMMARY")
@@ -301,7 +1150,7 @@ def print_summary(duck_conn, pg_conn, dry_run=False):
 
     all_match = True
 
-    for table in TABLES:
+    for table in tables:
         # DuckDB count
         try:
             duck_count = duck_conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
@@ -364,6 +1213,28 @@ def main():
         action="store_true",
         help="Run the Postgres schema SQL file on Neon before migrating data.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Tables migrated concurrently within a dependency level (default: {MAX_WORKERS}).",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Transfer only primary-key ranges whose checksums differ (no TRUNCATE).",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Only checksum-compare DuckDB and Neon (no writes). Exits 1 on mismatch.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Primary-key values per checksum range for --delta/--verify (default: {CHUNK_SIZE}).",
+    )
     args = parser.parse_args()
 
     # Load .env
@@ -394,50 +1265,98 @@ def main():
         print("\nDone. Schema applied to Neon.")
         return
 
+    # -----------------------------------------------------------------------
+    # Verify-only mode
+    # -----------------------------------------------------------------------
+    if args.verify:
+        duck_conn = connect_duckdb()
+        tables = local_tables(duck_conn)
+        started = time.monotonic()
+        print(f"\nVerifying {len(tables)} tables ({args.chunk_size} keys per range, {args.workers} workers)...")
+        results, errors = verify_tables(duck_conn, tables, args.chunk_size, args.workers)
+        all_match = print_verification(results, errors)
+        print(f"Verification time: {time.monotonic() - started:.2f}s")
+        duck_conn.close()
+        sys.exit(0 if all_match else 1)
+
     # -----------------------------------------------------------------------
     # Data migration mode
     # -----------------------------------------------------------------------
-    print("\n[1/5] Connecting to local DuckDB...")
+    print("\n[1/6] Connecting to local DuckDB...")
     duck_conn = connect_duckdb()
     print(f"  Connected: {Path(LOCAL_DB).absolute()}")
+    tables = local_tables(duck_conn)
+    skipped = [table for table in TABLES if table not in tables]
+    if skipped:
+        print(f"  Not in local database (skipped): {', '.join(skipped)}")
 
     pg_conn = None
-    if not args.dry_run:
-        print("\n[2/5] Connecting to Neon Postgres...")
+    if not args.dry_run or args.delta:
+        # --delta --dry-run still reads Neon to compare checksums
+        print("\n[2/6] Connecting to Neon Postgres...")
         pg_conn = connect_neon()
         print("  Connected.")
     else:
-        print("\n[2/5] Skipping Neon connection (dry run)")
-
-    # Migrate each table
-    print(f"\n[3/5] Migrating {len(TABLES)} tables...")
-    total_rows = 0
-    errors = []
-
-    for table in TABLES:
-        try:
-            count = migrate_table(duck_conn, pg_conn, table, dry_run=args.dry_run)
-            total_rows += count
-        except Exception as e:
-            err_msg = str(e).strip().split("\n")[0]
-            print(f"  {table}: ERROR - {err_msg[:120]}")
-            errors.append((table, err_msg))
-
-    print(f"\n  Total: {total_rows} rows {'would be ' if args.dry_run else ''}migrated")
+        print("\n[2/6] Skipping Neon connection (dry run)")
+
+    # Migrate tables level by level
+    started = time.monotonic()
+    levels = migration_levels(tables)
+    if args.delta:
+        print(f"\n[3/6] Comparing {len(tables)} tables by primary-key range "
+              f"({args.chunk_size} keys per range)...")
+        delta_stats, errors, scope = delta_migrate(duck_conn, pg_conn, levels, args.chunk_size, dry_run=args.dry_run)
+        changed = [stats for stats in delta_stats if stats["buckets"]]
+        print(f"\n  Total: {sum(stats['buckets'] for stats in delta_stats)} of "
+              f"{sum(stats['buckets_total'] for stats in delta_stats)} ranges differ in {len(changed)} table(s)")
+        if not args.dry_run:
+            print(f"  Rows upserted: {sum(stats['upserted'] for stats in delta_stats)}, "
+                  f"deleted: {sum(stats['deleted'] for stats in delta_stats)}")
+    else:
+        scope = None
+        print(f"\n[3/6] Migrating {len(tables)} tables in {len(levels)} dependency levels "
+              f"({'Arrow CSV' if pa is not None else 'COPY text'} streaming, {args.workers} workers)...")
+        total_rows, errors = migrate_levels(duck_conn, pg_conn, levels, dry_run=args.dry_run, workers=args.workers)
+        print(f"\n  Total: {total_rows} rows {'would be ' if args.dry_run else ''}migrated")
     if errors:
         print(f"  Errors: {len(errors)} table(s) failed")
 
     # Reset identity sequences
     if not args.dry_run:
-        print("\n[4/5] Resetting identity sequences...")
+        print("\n[4/6] Resetting identity sequences...")
         reset_sequences(pg_conn, dry_run=args.dry_run)
     else:
-        print("\n[4/5] Resetting identity sequences...")
+        print("\n[4/6] Resetting identity sequences...")
         reset_sequences(None, dry_run=True)
 
+    # Recompute aggregates from the migrated data
+    print("\n[5/6] Rebuilding derived tables...")
+    if args.dry_run:
+        print(f"  Would rebuild: {', '.join(DERIVED_TABLES)}")
+    elif scope is not None and not (scope["result_ids"] or scope["tournament_ids"]):
+        print("  No results or tournaments changed, nothing to rebuild")
+    else:
+        if scope is not None:
+            print(f"  Scope: {len(scope['result_ids'])} results, {len(scope['tournament_ids'])} tournaments")
+        try:
+            rebuild_derived_tables(pg_conn, scope)
+        except Exception as e:
+            err_msg = str(e).strip().split("\n")[0]
+            print(f"  ERROR - {err_msg[:120]}")
+            errors.append(("derived tables", err_msg))
+
+    elapsed = time.monotonic() - started
+
     # Summary
-    print("\n[5/5] Verifying migration...")
-    print_summary(duck_conn, pg_conn, dry_run=args.dry_run)
+    print("\n[6/6] Verifying migration...")
+    if args.dry_run:
+        print_summary(duck_conn, pg_conn, tables, dry_run=True)
+    else:
+        verify_started = time.monotonic()
+        results, verify_errors = verify_tables(duck_conn, tables, args.chunk_size, args.workers)
+        print_verification(results, verify_errors)
+        print(f"Verification time: {time.monotonic() - verify_started:.2f}s")
+    print(f"Wall time (migrate + sequences + derived tables): {elapsed:.2f}s")
 
     # Cleanup
     duck_conn.close()
@@ -0,0 +1,713 @@
+"""
+Ratings Engine (single-pass chronological Elo)
+
+Python port of calculate_ratings_single_pass() in R/ratings.R, so rating
+refreshes run in the sync pipeline instead of the Shiny process. Each
+tournament's implied head-to-head results (better placement beats worse,
+equal placement ties) are applied as one vectorized NumPy update:
+
+    expected[i, j] = 1 / (1 + 10^((R_j - R_i) / 400))
+    change[i]      = K_i * sum_j(actual[i, j] - expected[i, j]) * round_mult / (n - 1)
+
+with K = 48 for provisional players (< 5 rated events) and 24 otherwise,
+and round_mult = min(1 + (rounds - 3) * 0.1, 1.4).
+
+Replays are incremental: given the earliest affected event_date, each
+player's state is loaded from their last player_rating_history row before
+that date, only tournaments on or after it are replayed, and their history
+rows and player_ratings_cache entries are rewritten with COPY.
+
+Achievement scores (port of calculate_achievement_scores()) are one grouped
+aggregate in Postgres, restricted to the players with results in the given
+tournaments, and upserted into player_ratings_cache.
+
+Store ratings (port of calculate_store_avg_player_rating()) are the
+appearance-weighted mean rating of each active store's players, recomputed
+in one aggregate for stores hosting the given tournaments or visited by
+re-rated players, and upserted into store_ratings_cache.
+
+Format-era rating snapshots (port of backfill_rating_snapshots()) load the
+results history once and compute every missing era in a process pool, then
+bulk-write rating_snapshots. Like generate_format_snapshot(), each era uses
+the legacy multi-pass algorithm (calculate_competitive_ratings() with a
+date cutoff) and current cumulative achievement scores.
+
+Used by sync_limitless.py --rate. Can also be run directly, e.g. after
+manual result entry:
+
+    python scripts/ratings_engine.py --achievements --tournaments 812,813
+    python scripts/ratings_engine.py --achievements --all
+    python scripts/ratings_engine.py --stores --tournaments 812,813
+    python scripts/ratings_engine.py --snapshots              # missing eras only
+    python scripts/ratings_engine.py --snapshots --rebuild    # after a formula change
+
+Prerequisites:
+    pip install numpy psycopg2-binary python-dotenv requests
+"""
+
+import io
+import os
+import csv
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+
+# =============================================================================
+# Configuration (mirrors R/ratings.R)
+# =============================================================================
+
+DEFAULT_RATING = 1500
+PROVISIONAL_EVENTS = 5      # Players with fewer rated events use the provisional K
+K_PROVISIONAL = 48
+K_ESTABLISHED = 24
+DEFAULT_ROUNDS = 3
+MIN_PLAYER_COUNT = 4        # Smaller tournaments are not rated
+UNRATED_EVENT_TYPES = ("casuals", "regulation_battle", "release_event", "other")
+
+# Achievement score: (max placement, base points), first match wins
+PLACEMENT_POINTS = [(1, 50), (2, 30), (3, 20), (4, 15), (8, 10)]
+OTHER_PLACEMENT_POINTS = 5
+# (player_count below, multiplier); unknown counts use the first, larger fields the max
+SIZE_MULTIPLIERS = [(12, 1.0), (16, 1.25), (24, 1.5), (32, 1.75)]
+MAX_SIZE_MULTIPLIER = 2.0
+STORE_BONUS = [(6, 50), (4, 25), (2, 10)]   # (distinct stores at least, bonus)
+DECK_BONUS = (3, 15)                        # 3+ known archetypes
+FORMAT_BONUS = (2, 10)                      # 2+ formats
+
+# Legacy multi-pass algorithm used for format-era snapshots
+LEGACY_PASSES = 5
+DECAY_HALF_LIFE_MONTHS = 4
+DAYS_PER_MONTH = 30.44
+
+
+# =============================================================================
+# Rating math
+# =============================================================================
+
+def round_multiplier(rounds):
+    """min(1.0 + (rounds - 3) * 0.1, 1.4); unknown rounds count as 3."""
+    rounds = DEFAULT_ROUNDS if rounds is None else rounds
+    return min(1.0 + (rounds - DEFAULT_ROUNDS) * 0.1, 1.4)
+
+
+def tournament_rating_changes(ratings, events_played, placements, rounds):
+    """Rating change of every player in one tournament.
+
+    Args:
+        ratings: float array of current ratings (one entry per player)
+        events_played: int array of rated events before this one
+        placements: array of final placements (lower is better, ties allowed)
+        rounds: Swiss rounds (None = unknown)
+
+    Returns:
+        float array of rating changes (unrounded)
+    """
+    n = len(ratings)
+    placements = np.asarray(placements)
+    actual = np.where(placements[:, None] < placements[None, :], 1.0,
+                      np.where(placements[:, None] == placements[None, :], 0.5, 0.0))
+    expected = 1.0 / (1.0 + 10.0 ** ((ratings[None, :] - ratings[:, None]) / 400.0))
+    np.fill_diagonal(actual, 0.0)
+    np.fill_diagonal(expected, 0.0)
+
+    k_factor = np.where(events_played < PROVISIONAL_EVENTS, K_PROVISIONAL, K_ESTABLISHED)
+    return k_factor * (actual - expected).sum(axis=1) * round_multiplier(rounds) / (n - 1)
+
+
+def replay_tournaments(rows, prior_state):
+    """Apply tournaments in order, starting from prior per-player state.
+
+    Args:
+        rows: (tournament_id, player_id, placement, rounds) tuples ordered by
+            event_date, tournament_id, placement
+        prior_state: {player_id: (rating, events_played)} before the first row
+
+    Returns:
+        Tuple of (final {player_id: (rating, events_played)} for replayed
+        players, history rows as (player_id, tournament_id, rating_before,
+        rating_after, rating_change, events_played) with rounded ratings)
+    """
+    player_ids = sorted({row[1] for row in rows})
+    index = {player_id: i for i, player_id in enumerate(player_ids)}
+    ratings = np.full(len(player_ids), float(DEFAULT_RATING))
+    events = np.zeros(len(player_ids), dtype=np.int64)
+    for player_id, (rating, events_played) in prior_state.items():
+        if player_id in index:
+            ratings[index[player_id]] = rating
+            events[index[player_id]] = events_played
+
+    history = []
+    start = 0
+    while start < len(rows):
+        tournament_id, rounds = rows[start][0], rows[start][3]
+        end = start
+        while end < len(rows) and rows[end][0] == tournament_id:
+            end += 1
+        group = rows[start:end]
+        start = end
+        if len(group) < 2:
+            continue
+
+        positions = np.array([index[row[1]] for row in group])
+        before = ratings[positions]
+        changes = tournament_rating_changes(before, events[positions], [row[2] for row in group], rounds)
+        ratings[positions] = before + changes
+        events[positions] += 1
+
+        history.extend(zip(
+            [row[1] for row in group],
+            [tournament_id] * len(group),
+            np.rint(before).astype(int).tolist(),
+            np.rint(ratings[positions]).astype(int).tolist(),
+            np.rint(changes).astype(int).tolist(),
+            events[positions].tolist(),
+        ))
+
+    touched = {row[0] for row in history}
+    final = {
+        player_id: (float(ratings[index[player_id]]), int(events[index[player_id]]))
+        for player_id in touched
+    }
+    return final, history
+
+
+# =============================================================================
+# Database I/O
+# =============================================================================
+
+def rated_event_filter():
+    """SQL condition excluding unrated event types (tournaments aliased as t)."""
+    types = ", ".join(f"'{event_type}'" for event_type in UNRATED_EVENT_TYPES)
+    return f"(t.event_type IS NULL OR t.event_type NOT IN ({types}))"
+
+
+def load_prior_state(cursor, from_date):
+    """Each player's last recorded rating and event count before from_date."""
+    cursor.execute("""
+        SELECT DISTINCT ON (h.player_id)
+               h.player_id, h.rating_after, h.events_played
+        FROM player_rating_history h
+        JOIN tournaments t ON h.tournament_id = t.tournament_id
+        WHERE t.event_date < %s
+        ORDER BY h.player_id, t.event_date DESC, t.tournament_id DESC
+    """, (from_date,))
+    return {player_id: (float(rating), events) for player_id, rating, events in cursor.fetchall()}
+
+
+def load_rated_results(cursor, from_date=None):
+    """Rated results on or after from_date (all if None), in replay order."""
+    date_condition = "AND t.event_date >= %s" if from_date else ""
+    cursor.execute(f"""
+        SELECT r.tournament_id, r.player_id, r.placement, t.rounds
+        FROM results r
+        JOIN tournaments t ON r.tournament_id = t.tournament_id
+        WHERE r.placement IS NOT NULL
+          AND t.player_count IS NOT NULL
+          AND t.player_count >= {MIN_PLAYER_COUNT}
+          AND {rated_event_filter()}
+          {date_condition}
+        ORDER BY t.event_date ASC, t.tournament_id ASC, r.placement ASC
+    """, (from_date,) if from_date else None)
+    return cursor.fetchall()
+
+
+def copy_rows(cursor, table, columns, rows):
+    """Bulk-write rows into a table with a single COPY FROM STDIN."""
+    if not rows:
+        return 0
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    return len(rows)
+
+
+def write_rating_history(cursor, from_date, history):
+    """Replace player_rating_history from from_date forward (everything if None)."""
+    if from_date:
+        cursor.execute("""
+            DELETE FROM player_rating_history
+            WHERE tournament_id IN (SELECT tournament_id FROM tournaments WHERE event_date >= %s)
+        """, (from_date,))
+    else:
+        cursor.execute("DELETE FROM player_rating_history")
+    return copy_rows(cursor, "player_rating_history",
+                     ["player_id", "tournament_id", "rating_before", "rating_after",
+                      "rating_change", "events_played"],
+                     history)
+
+
+def write_player_ratings(cursor, final):
+    """Upsert competitive_rating and events_played for replayed players.
+
+    achievement_score is left as is (new players start at the column default).
+    """
+    if not final:
+        return 0
+    cursor.execute("""
+        CREATE TEMP TABLE _rated_players (
+            player_id INTEGER, competitive_rating INTEGER, events_played INTEGER
+        ) ON COMMIT DROP
+    """)
+    copy_rows(cursor, "_rated_players", ["player_id", "competitive_rating", "events_played"],
+              [(player_id, int(np.rint(rating)), events) for player_id, (rating, events) in final.items()])
+    cursor.execute("""
+        INSERT INTO player_ratings_cache (player_id, competitive_rating, events_played, last_computed_at)
+        SELECT player_id, competitive_rating, events_played, CURRENT_TIMESTAMP FROM _rated_players
+        ON CONFLICT (player_id) DO UPDATE SET
+            competitive_rating = EXCLUDED.competitive_rating,
+            events_played = EXCLUDED.events_played,
+            last_computed_at = EXCLUDED.last_computed_at
+    """)
+    return len(final)
+
+
+def _case(expression, thresholds, default, op):
+    """SQL CASE picking the value of the first (threshold, value) that matches."""
+    whens = " ".join(f"WHEN {expression} {op} {threshold} THEN {value}" for threshold, value in thresholds)
+    return f"CASE {whens} ELSE {default} END"
+
+
+def achievement_scores_sql():
+    """SELECT of (player_id, achievement_score) for players in _touched_players.
+
+    Placement points are rounded per result as float8, which (like R's
+    round()) rounds halves to even: 15 * 1.5 = 22.5 scores 22.
+    """
+    base = _case("r.placement", PLACEMENT_POINTS, OTHER_PLACEMENT_POINTS, "<=")
+    size = _case("COALESCE(t.player_count, 0)", SIZE_MULTIPLIERS, MAX_SIZE_MULTIPLIER, "<")
+    # R's length(unique(store_id)) counts online events (NA store) as one store
+    stores = _case("COUNT(DISTINCT COALESCE(t.store_id, -1))", STORE_BONUS, 0, ">=")
+    decks = (f"CASE WHEN COUNT(DISTINCT r.archetype_id) FILTER ("
+             f"WHERE da.archetype_name IS NOT NULL AND da.archetype_name != 'UNKNOWN') >= {DECK_BONUS[0]} "
+             f"THEN {DECK_BONUS[1]} ELSE 0 END")
+    formats = f"CASE WHEN COUNT(DISTINCT t.format) >= {FORMAT_BONUS[0]} THEN {FORMAT_BONUS[1]} ELSE 0 END"
+    return f"""
+        SELECT r.player_id,
+               SUM(ROUND(({base} * {size})::float8))::int + {stores} + {decks} + {formats}
+        FROM results r
+        JOIN tournaments t ON r.tournament_id = t.tournament_id
+        LEFT JOIN deck_archetypes da ON r.archetype_id = da.archetype_id
+        WHERE r.placement IS NOT NULL
+          AND r.player_id IN (SELECT player_id FROM _touched_players)
+        GROUP BY r.player_id
+    """
+
+
+def create_touched_players(cursor, tournament_ids=None, player_ids=None):
+    """Fill the _touched_players temp table read by achievement_scores_sql().
+
+    Players with results in tournament_ids plus the players in player_ids;
+    with neither, every player with results. Callers drop the table when done.
+    """
+    cursor.execute("CREATE TEMP TABLE _touched_players (player_id INTEGER PRIMARY KEY) ON COMMIT DROP")
+    if tournament_ids is None and player_ids is None:
+        cursor.execute("INSERT INTO _touched_players SELECT DISTINCT player_id FROM results")
+        return
+    if tournament_ids:
+        cursor.execute("""
+            INSERT INTO _touched_players
+            SELECT DISTINCT player_id FROM results WHERE tournament_id = ANY(%s)
+            ON CONFLICT DO NOTHING
+        """, (list(tournament_ids),))
+    if player_ids:
+        cursor.execute("""
+            INSERT INTO _touched_players
+            SELECT player_id FROM players WHERE player_id = ANY(%s)
+            ON CONFLICT DO NOTHING
+        """, (list(player_ids),))
+
+
+def refresh_achievement_scores(cursor, tournament_ids=None, player_ids=None):
+    """Recompute achievement_score for players with results in the given tournaments.
+
+    Scores are cumulative over each player's whole history, so touched players
+    are fully re-aggregated; everyone else is left alone. With neither
+    argument, every player with results is recomputed. Players listed in
+    player_ids who no longer have results drop to 0.
+
+    Returns:
+        Number of player_ratings_cache rows whose score changed or was inserted
+    """
+    create_touched_players(cursor, tournament_ids, player_ids)
+
+    cursor.execute(f"""
+        INSERT INTO player_ratings_cache (player_id, achievement_score, last_computed_at)
+        SELECT tp.player_id, COALESCE(s.score, 0), CURRENT_TIMESTAMP
+        FROM _touched_players tp
+        LEFT JOIN ({achievement_scores_sql()}) AS s (player_id, score) ON s.player_id = tp.player_id
+        ON CONFLICT (player_id) DO UPDATE SET
+            achievement_score = EXCLUDED.achievement_score,
+            last_computed_at = EXCLUDED.last_computed_at
+        WHERE player_ratings_cache.achievement_score IS DISTINCT FROM EXCLUDED.achievement_score
+    """)
+    updated = cursor.rowcount
+    cursor.execute("DROP TABLE _touched_players")
+    return updated
+
+
+def refresh_store_ratings(cursor, tournament_ids=None, player_ids=None):
+    """Recompute avg_player_rating for stores touched by tournaments or players.
+
+    A store is touched if it hosted one of tournament_ids or any player in
+    player_ids (e.g. players re-rated by rate_from()) has a result there.
+    With neither argument, every store is recomputed. Each player counts once
+    per appearance; players without a cached rating count as DEFAULT_RATING.
+    Touched stores that are inactive or have no results are removed, as the
+    R full rebuild only writes active stores.
+
+    Returns:
+        Tuple of (stores upserted with a changed rating, stores removed)
+    """
+    cursor.execute("CREATE TEMP TABLE _touched_stores (store_id INTEGER PRIMARY KEY) ON COMMIT DROP")
+    if tournament_ids is None and player_ids is None:
+        cursor.execute("""
+            INSERT INTO _touched_stores
+            SELECT store_id FROM stores UNION SELECT store_id FROM store_ratings_cache
+        """)
+    else:
+        if tournament_ids:
+            cursor.execute("""
+                INSERT INTO _touched_stores
+                SELECT DISTINCT store_id FROM tournaments
+                WHERE tournament_id = ANY(%s) AND store_id IS NOT NULL
+                ON CONFLICT DO NOTHING
+            """, (list(tournament_ids),))
+        if player_ids:
+            cursor.execute("""
+                INSERT INTO _touched_stores
+                SELECT DISTINCT t.store_id
+                FROM results r
+                JOIN tournaments t ON r.tournament_id = t.tournament_id
+                WHERE r.player_id = ANY(%s) AND t.store_id IS NOT NULL
+                ON CONFLICT DO NOTHING
+            """, (list(player_ids),))
+
+    cursor.execute(f"""
+        INSERT INTO store_ratings_cache (store_id, avg_player_rating, last_computed_at)
+        SELECT t.store_id,
+               ROUND(SUM(COALESCE(c.competitive_rating, {DEFAULT_RATING}))::float8 / COUNT(*))::int,
+               CURRENT_TIMESTAMP
+        FROM results r
+        JOIN tournaments t ON r.tournament_id = t.tournament_id
+        JOIN stores s ON t.store_id = s.store_id AND s.is_active = TRUE
+        LEFT JOIN player_ratings_cache c ON r.player_id = c.player_id
+        WHERE t.store_id IN (SELECT store_id FROM _touched_stores)
+        GROUP BY t.store_id
+        ON CONFLICT (store_id) DO UPDATE SET
+            avg_player_rating = EXCLUDED.avg_player_rating,
+            last_computed_at = EXCLUDED.last_computed_at
+        WHERE store_ratings_cache.avg_player_rating IS DISTINCT FROM EXCLUDED.avg_player_rating
+    """)
+    updated = cursor.rowcount
+    cursor.execute("""
+        DELETE FROM store_ratings_cache c
+        USING _touched_stores ts
+        WHERE c.store_id = ts.store_id
+          AND NOT EXISTS (
+              SELECT 1 FROM tournaments t
+              JOIN stores s ON t.store_id = s.store_id AND s.is_active = TRUE
+              JOIN results r ON r.tournament_id = t.tournament_id
+              WHERE t.store_id = c.store_id
+          )
+    """)
+    removed = cursor.rowcount
+    cursor.execute("DROP TABLE _touched_stores")
+    return updated, removed
+
+
+def rate_from(cursor, from_date=None):
+    """Replay ratings from from_date forward (full rebuild if None).
+
+    Args:
+        cursor: psycopg2 cursor (caller commits)
+        from_date: Earliest affected event_date (date or "YYYY-MM-DD"), or None
+
+    Returns:
+        Dict with tournaments, players, prior_players and history_rows
+        counts, and the re-rated player_ids
+    """
+    if isinstance(from_date, date):
+        from_date = from_date.isoformat()
+
+    prior_state = load_prior_state(cursor, from_date) if from_date else {}
+    rows = load_rated_results(cursor, from_date)
+    final, history = replay_tournaments(rows, prior_state)
+
+    history_rows = write_rating_history(cursor, from_date, history)
+    players = write_player_ratings(cursor, final)
+    return {
+        "tournaments": len({row[1] for row in history}),
+        "players": players,
+        "player_ids": list(final),
+        "prior_players": len(prior_state),
+        "history_rows": history_rows,
+    }
+
+
+# =============================================================================
+# Format-era snapshots
+# =============================================================================
+
+# Results history and achievement scores shared by snapshot workers (set
+# before the pool starts, so forked workers inherit them without copying)
+_snapshot_history = None
+_snapshot_scores = None
+_snapshot_as_of = None
+
+
+def legacy_ratings(history, cutoff, as_of):
+    """Port of calculate_competitive_ratings(date_cutoff = cutoff).
+
+    Multi-pass Elo over every rated tournament up to cutoff: all pairs in a
+    tournament play (a better placement wins, ties count as losses), each
+    change is weighted by a 4-month half-life decay from as_of and the round
+    multiplier, and players are updated one at a time in placement order.
+    Events played only advance on the first pass.
+
+    Args:
+        history: dict of arrays from load_snapshot_history()
+        cutoff: last included event day (date ordinal)
+        as_of: "today" for the decay weights (date ordinal)
+
+    Returns:
+        Tuple of (sorted player_id array, unrounded rating array)
+    """
+    rated = history["rated"] & (history["event_day"] <= cutoff)
+    tournament_ids = history["tournament_id"][rated]
+    placements = history["placement"][rated]
+    event_days = history["event_day"][rated]
+    rounds = history["rounds"][rated]
+    players, positions = np.unique(history["player_id"][rated], return_inverse=True)
+    ratings = np.full(len(players), float(DEFAULT_RATING))
+    events = np.zeros(len(players), dtype=np.int64)
+
+    starts = np.flatnonzero(np.r_[True, tournament_ids[1:] != tournament_ids[:-1]])
+    groups = []
+    for start, end in zip(starts, np.r_[starts[1:], len(tournament_ids)]):
+        if end - start < 2:
+            continue
+        months_ago = (as_of - event_days[start]) / DAYS_PER_MONTH
+        weight = 0.5 ** (months_ago / DECAY_HALF_LIFE_MONTHS)
+        weight *= round_multiplier(None if rounds[start] < 0 else int(rounds[start]))
+        group_placements = placements[start:end]
+        wins = (group_placements[:, None] < group_placements[None, :]).sum(axis=1)
+        groups.append((positions[start:end], wins, weight / (end - start - 1)))
+
+    for pass_number in range(LEGACY_PASSES):
+        for members, wins, weight in groups:
+            k_factor = np.where(events[members] < PROVISIONAL_EVENTS, K_PROVISIONAL, K_ESTABLISHED)
+            for j, member in enumerate(members):
+                # Sum over opponents; the player's own term is exactly 0.5
+                expected = (1.0 / (1.0 + 10.0 ** ((ratings[members] - ratings[member]) / 400.0))).sum() - 0.5
+                ratings[member] += k_factor[j] * (wins[j] - expected) * weight
+            if pass_number == 0:
+                events[members] += 1
+
+    return players, ratings
+
+
+def format_snapshot(format_id, end_date):
+    """Snapshot rows for one format era, from the shared history.
+
+    Returns:
+        Tuple of (format_id, rows as (player_id, format_id, competitive_rating,
+        achievement_score, events_played, player_rank, snapshot_date))
+    """
+    history = _snapshot_history
+    cutoff = end_date.toordinal()
+    players, ratings = legacy_ratings(history, cutoff, _snapshot_as_of)
+    if len(players) == 0:
+        return format_id, []
+    ratings = np.rint(ratings).astype(np.int64)
+
+    # Distinct events of any type up to the cutoff
+    included = history["event_day"] <= cutoff
+    played = np.unique(np.stack([history["player_id"][included],
+                                 history["tournament_id"][included]]), axis=1)[0]
+    event_players, event_counts = np.unique(played, return_counts=True)
+    events_played = event_counts[np.searchsorted(event_players, players)]
+
+    # Rank by rating, ties by player_id
+    order = np.argsort(-ratings, kind="stable")
+    return format_id, [
+        (int(players[i]), format_id, int(ratings[i]), _snapshot_scores.get(int(players[i]), 0),
+         int(events_played[i]), rank, end_date)
+        for rank, i in enumerate(order, start=1)
+    ]
+
+
+def _init_snapshot_worker(history, scores, as_of):
+    global _snapshot_history, _snapshot_scores, _snapshot_as_of
+    _snapshot_history, _snapshot_scores, _snapshot_as_of = history, scores, as_of
+
+
+def load_snapshot_history(cursor):
+    """Every result as NumPy arrays, in legacy replay order.
+
+    rated marks the results calculate_competitive_ratings() uses; the rest
+    only count towards events_played. Unknown rounds are stored as -1.
+    """
+    cursor.execute(f"""
+        SELECT r.tournament_id, r.player_id, COALESCE(r.placement, 0), t.event_date,
+               COALESCE(t.rounds, -1),
+               r.placement IS NOT NULL
+                 AND COALESCE(t.player_count, 0) >= {MIN_PLAYER_COUNT}
+                 AND {rated_event_filter()}
+        FROM results r
+        JOIN tournaments t ON r.tournament_id = t.tournament_id
+        ORDER BY t.event_date ASC, r.tournament_id ASC, r.placement ASC, r.result_id ASC
+    """)
+    rows = cursor.fetchall()
+    columns = list(zip(*rows)) if rows else [()] * 6
+    return {
+        "tournament_id": np.array(columns[0], dtype=np.int64),
+        "player_id": np.array(columns[1], dtype=np.int64),
+        "placement": np.array(columns[2], dtype=np.int64),
+        "event_day": np.array([day.toordinal() for day in columns[3]], dtype=np.int64),
+        "rounds": np.array(columns[4], dtype=np.int64),
+        "rated": np.array(columns[5], dtype=bool),
+    }
+
+
+def load_achievement_scores(cursor):
+    """Current achievement score of every player with results."""
+    create_touched_players(cursor)
+    cursor.execute(achievement_scores_sql())
+    scores = dict(cursor.fetchall())
+    cursor.execute("DROP TABLE _touched_players")
+    return scores
+
+
+def format_eras(cursor):
+    """(format_id, end_date) of each closed format era, oldest first.
+
+    An era ends the day before the next format's release; the current
+    format has no snapshot (it uses the live player_ratings_cache).
+    """
+    cursor.execute("""
+        SELECT format_id, release_date FROM formats
+        WHERE release_date IS NOT NULL
+        ORDER BY release_date ASC
+    """)
+    formats = cursor.fetchall()
+    return [(formats[i][0], formats[i + 1][1] - timedelta(days=1)) for i in range(len(formats) - 1)]
+
+
+def build_rating_snapshots(cursor, rebuild=False, workers=None, as_of=None):
+    """Compute missing (or, with rebuild, all) format-era snapshots and write them.
+
+    Args:
+        cursor: psycopg2 cursor (caller commits)
+        rebuild: Recompute eras that already have snapshots
+        workers: Worker processes (default: CPU count)
+        as_of: Date the decay weights count back from (default: today)
+
+    Returns:
+        Dict with formats (built), skipped (no rated players), and rows
+    """
+    eras = format_eras(cursor)
+    if not rebuild:
+        cursor.execute("SELECT DISTINCT format_id FROM rating_snapshots")
+        existing = {row[0] for row in cursor.fetchall()}
+        eras = [era for era in eras if era[0] not in existing]
+    if not eras:
+        return {"formats": [], "skipped": [], "rows": 0}
+
+    initargs = (load_snapshot_history(cursor), load_achievement_scores(cursor),
+                (as_of or date.today()).toordinal())
+    workers = max(1, min(workers or os.cpu_count() or 1, len(eras)))
+    if workers == 1:
+        _init_snapshot_worker(*initargs)
+        snapshots = [format_snapshot(format_id, end_date) for format_id, end_date in eras]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_snapshot_worker,
+                                 initargs=initargs) as executor:
+            snapshots = list(executor.map(format_snapshot, *zip(*eras)))
+
+    built = [format_id for format_id, rows in snapshots if rows]
+    cursor.execute("DELETE FROM rating_snapshots WHERE format_id = ANY(%s)", (built,))
+    written = copy_rows(cursor, "rating_snapshots",
+                        ["player_id", "format_id", "competitive_rating", "achievement_score",
+                         "events_played", "player_rank", "snapshot_date"],
+                        [row for _, rows in snapshots for row in rows])
+    return {
+        "formats": built,
+        "skipped": [format_id for format_id, rows in snapshots if not rows],
+        "rows": written,
+    }
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def parse_ids(value):
+    """Parse a comma-separated list of integer ids."""
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    from sync_limitless import get_connection
+
+    parser = argparse.ArgumentParser(description="Refresh cached player/store ratings, achievement scores and snapshots")
+    parser.add_argument("--achievements", action="store_true",
+                        help="Recompute achievement scores")
+    parser.add_argument("--stores", action="store_true",
+                        help="Recompute store average player ratings")
+    parser.add_argument("--tournaments", type=parse_ids,
+                        help="Comma-separated tournament_ids whose players/stores to recompute")
+    parser.add_argument("--players", type=parse_ids,
+                        help="Comma-separated player_ids whose scores/stores to recompute")
+    parser.add_argument("--all", action="store_true",
+                        help="Recompute every player/store")
+    parser.add_argument("--snapshots", action="store_true",
+                        help="Build missing format-era rating snapshots")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="With --snapshots, recompute eras that already have snapshots")
+    parser.add_argument("--workers", type=int,
+                        help="Snapshot worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not args.achievements and not args.stores and not args.snapshots:
+        parser.error("Nothing to do: pass --achievements, --stores or --snapshots")
+    if (args.achievements or args.stores) and not args.all and not args.tournaments and not args.players:
+        parser.error("Pass --tournaments, --players, or --all")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    if args.achievements:
+        if args.all:
+            updated = refresh_achievement_scores(cursor)
+        else:
+            updated = refresh_achievement_scores(cursor, args.tournaments, args.players)
+        conn.commit()
+        print(f"Achievement scores: {updated} players updated")
+
+    if args.stores:
+        if args.all:
+            updated, removed = refresh_store_ratings(cursor)
+        else:
+            updated, removed = refresh_store_ratings(cursor, args.tournaments, args.players)
+        conn.commit()
+        print(f"Store ratings: {updated} stores updated, {removed} removed")
+
+    if args.snapshots:
+        stats = build_rating_snapshots(cursor, rebuild=args.rebuild, workers=args.workers)
+        conn.commit()
+        if stats["formats"]:
+            print(f"Rating snapshots: {stats['rows']} rows for {', '.join(stats['formats'])}")
+        else:
+            print("Rating snapshots: nothing to build")
+        if stats["skipped"]:
+            print(f"  No rated players for {', '.join(stats['skipped'])} - skipped")
+
+    cursor.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
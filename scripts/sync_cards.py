@@ -5,7 +5,8 @@ Fetches all cards from DigimonCard.io API and caches them in the database.
 This allows the Shiny app to search cards locally without external API calls.
 
 Usage:
-    python scripts/sync_cards.py --by-set           # Full sync by set (recommended)
+    python scripts/sync_cards.py --by-set           # Sync new/changed sets (recommended)
+    python scripts/sync_cards.py --by-set --all-sets  # Re-fetch every set
     python scripts/sync_cards.py --by-set --incremental  # Only add new cards (fast)
     python scripts/sync_cards.py --set BT-21 --by-set    # Sync specific set
     python scripts/sync_cards.py --discover         # Find new set prefixes
@@ -15,22 +16,44 @@ Flags:
     --incremental  Skip cards already in database (faster for updates)
     --discover     Scan API for new/unknown set prefixes
     --set X        Sync only a specific set (e.g., BT-21, ST-15)
+    --all-sets     With --by-set, fetch every catalog set, not just new/changed ones
+    --build-index  Only rebuild data/card_search_index.bin from the cards table
+
+A full --by-set sync reads the card_sets catalog: a 7-request color scan
+records each set's current card count, and only sets that are new or whose
+count changed since their last fetch are requested.
+
+After each sync the card search index (data/card_search_index.bin, see
+card_search_index.py) is rebuilt so the app can search cards in memory.
+
+Each sync writes a delta manifest (added / changed / removed card_ids, with
+before/after values for changed fields) to logs/card_sync_delta_<timestamp>.json.
 
 Prerequisites:
     pip install psycopg2-binary python-dotenv requests
     NEON_HOST and NEON_PASSWORD in .env file
+    cards.content_hash column (db/migrations/008_card_content_hash.sql)
+    card_sets table (db/migrations/009_card_sets.sql)
 """
 
 import os
 import re
 import sys
+import json
 import time
+import hashlib
 import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
+from requests.adapters import HTTPAdapter
 import psycopg2
 from psycopg2.extras import execute_values
 from dotenv import load_dotenv
+from card_search_index import fetch_index_cards, write_index
 from datetime import datetime
+from pathlib import Path
 
 load_dotenv()
 
@@ -40,6 +63,22 @@ COLORS = ["Red", "Blue", "Yellow", "Green", "Purple", "Black", "White"]
 
 # Rate limiting: 15 requests per 10 seconds
 REQUEST_DELAY = 0.7  # ~14 requests per 10 seconds (safe margin)
+RATE_LIMIT_REQUESTS = 14   # Requests allowed per window (API allows 15; keep a margin)
+RATE_LIMIT_WINDOW = 10.0   # Seconds
+MAX_WORKERS = 8            # Concurrent requests in flight during --by-set
+MAX_RETRIES = 2            # Retries after an HTTP 429
+
+UPSERT_PAGE_SIZE = 1000    # Cards per execute_values statement
+
+# Columns written by upsert_cards and covered by content_hash, in process_card() key order (card_id first)
+CARD_COLUMNS = [
+    "card_id", "name", "display_name", "card_type", "color", "color2",
+    "level", "dp", "play_cost", "digi_type", "stage", "rarity", "set_code",
+]
+
+HEADERS = {
+    "User-Agent": "DigimonTCGTracker/1.0 (CardSync)"
+}
 
 
 def get_connection():
@@ -77,9 +116,79 @@ def extract_set_code(card_id: str) -> str:
     return match.group(1) if match else None
 
 
-def fetch_cards_by_color(color: str, set_filter: str = None) -> list:
-    """Fetch all cards of a specific color from the API."""
+class SlidingWindowRateLimiter:
+    """Thread-safe limiter allowing at most `max_requests` starts per `window` seconds.
+
+    Unlike a fixed per-request sleep, requests go out back-to-back until the
+    window is full, so latency overlaps instead of adding up.
+    """
+
+    def __init__(self, max_requests=RATE_LIMIT_REQUESTS, window=RATE_LIMIT_WINDOW):
+        self.max_requests = max_requests
+        self.window = window
+        self.timestamps = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may start, then record it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.timestamps and now - self.timestamps[0] >= self.window:
+                    self.timestamps.popleft()
+                if len(self.timestamps) < self.max_requests:
+                    self.timestamps.append(now)
+                    return
+                wait = self.window - (now - self.timestamps[0])
+            time.sleep(wait)
+
+
+def get_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """Create a pooled HTTP session (keep-alive connections shared across threads)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def search_cards(params: dict, session: requests.Session = None,
+                 limiter: SlidingWindowRateLimiter = None) -> list:
+    """Call the API search endpoint, returning a list of cards ([] on no results, None on error)."""
     url = f"{API_BASE}/search"
+    http = session or requests
+
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            limiter.acquire()
+
+        try:
+            response = http.get(url, params=params, headers=HEADERS, timeout=30)
+
+            if response.status_code == 429 and attempt < MAX_RETRIES:
+                # Over budget anyway (e.g., another client on the same IP) - wait out a window
+                time.sleep(RATE_LIMIT_WINDOW)
+                continue
+
+            if response.status_code == 400:
+                return []  # No results
+
+            if response.status_code != 200:
+                print(f"    API error: HTTP {response.status_code}")
+                return None
+
+            return response.json()
+
+        except Exception as e:
+            print(f"    Request failed: {e}")
+            return None
+
+    return None
+
+
+def fetch_cards_by_color(color: str, set_filter: str = None, session: requests.Session = None,
+                         limiter: SlidingWindowRateLimiter = None) -> list:
+    """Fetch all cards of a specific color from the API ([] on error)."""
     params = {
         "color": color,
         "limit": 1000  # Get all cards
@@ -87,79 +196,86 @@ def fetch_cards_by_color(color: str, set_filter: str = None) -> list:
     if set_filter:
         params["pack"] = set_filter
 
-    headers = {
-        "User-Agent": "DigimonTCGTracker/1.0 (CardSync)"
-    }
-
-    try:
-        response = requests.get(url, params=params, headers=headers, timeout=30)
+    return search_cards(params, session, limiter) or []
 
-        if response.status_code == 400:
-            return []  # No results
 
-        if response.status_code != 200:
-            print(f"    API error: HTTP {response.status_code}")
-            return []
-
-        return response.json()
-
-    except Exception as e:
-        print(f"    Request failed: {e}")
-        return []
-
-
-def fetch_cards_by_set(set_code: str) -> list:
-    """Fetch all cards from a specific set/pack from the API."""
-    url = f"{API_BASE}/search"
+def fetch_cards_by_set(set_code: str, session: requests.Session = None,
+                       limiter: SlidingWindowRateLimiter = None) -> list:
+    """Fetch all cards from a specific set/pack from the API (None on error)."""
     params = {
         "pack": set_code,
         "limit": 1000
     }
 
-    headers = {
-        "User-Agent": "DigimonTCGTracker/1.0 (CardSync)"
-    }
+    return search_cards(params, session, limiter)
 
-    try:
-        response = requests.get(url, params=params, headers=headers, timeout=30)
 
-        if response.status_code == 400:
-            return []  # No results
+def fetch_sets_concurrently(set_codes: list, max_workers: int = MAX_WORKERS):
+    """Fetch several sets in parallel within the API rate limit.
+
+    A shared SlidingWindowRateLimiter keeps starts within the 15-per-10s
+    budget while up to `max_workers` requests are in flight on one pooled
+    session.
 
-        if response.status_code != 200:
-            print(f"    API error: HTTP {response.status_code}")
-            return []
+    Yields:
+        (index, set_code, cards) tuples in completion order; index is the
+        set's position in `set_codes`, cards is None if the request failed
+    """
+    session = get_session(max_workers)
+    limiter = SlidingWindowRateLimiter()
 
-        return response.json()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(fetch_cards_by_set, set_code, session, limiter): (index, set_code)
+                for index, set_code in enumerate(set_codes)
+            }
+            for future in as_completed(futures):
+                index, set_code = futures[future]
+                yield index, set_code, future.result()
+    finally:
+        session.close()
+
+
+def scan_colors() -> list:
+    """Fetch every color once (7 requests, no per-request delay needed under the rate limit)."""
+    session = get_session()
+    limiter = SlidingWindowRateLimiter()
+    all_cards = []
 
-    except Exception as e:
-        print(f"    Request failed: {e}")
-        return []
+    try:
+        for color in COLORS:
+            print(f"  Scanning {color}...", end=" ", flush=True)
+            cards = fetch_cards_by_color(color, session=session, limiter=limiter)
+            print(f"found {len(cards)} cards")
+            all_cards.extend(cards)
+    finally:
+        session.close()
 
+    return all_cards
 
-def discover_prefixes() -> dict:
-    """Scan API to discover all card prefixes and their counts."""
-    print("\nDiscovering card prefixes from API...")
 
-    all_prefixes = {}
+def discover_prefixes(cards: list = None) -> dict:
+    """Scan API to discover all card prefixes and their counts.
 
-    for color in COLORS:
-        print(f"  Scanning {color}...", end=" ", flush=True)
-        cards = fetch_cards_by_color(color)
+    Pass the output of scan_colors() to reuse an existing scan.
+    """
+    if cards is None:
+        print("\nDiscovering card prefixes from API...")
+        cards = scan_colors()
 
-        for card in cards:
-            card_id = card.get("id") or card.get("cardnumber", "")
-            match = re.match(r'^([A-Z]+)', card_id)
-            if match:
-                prefix = match.group(1)
-                if prefix not in all_prefixes:
-                    all_prefixes[prefix] = {"count": 0, "examples": []}
-                all_prefixes[prefix]["count"] += 1
-                if len(all_prefixes[prefix]["examples"]) < 3:
-                    all_prefixes[prefix]["examples"].append(card_id)
+    all_prefixes = {}
 
-        print(f"found {len(cards)} cards")
-        time.sleep(REQUEST_DELAY)
+    for card in cards:
+        card_id = card.get("id") or card.get("cardnumber", "")
+        match = re.match(r'^([A-Z]+)', card_id)
+        if match:
+            prefix = match.group(1)
+            if prefix not in all_prefixes:
+                all_prefixes[prefix] = {"count": 0, "examples": []}
+            all_prefixes[prefix]["count"] += 1
+            if len(all_prefixes[prefix]["examples"]) < 3:
+                all_prefixes[prefix]["examples"].append(card_id)
 
     return all_prefixes
 
@@ -170,7 +286,12 @@ def get_known_prefixes() -> set:
 
 
 def get_all_sets() -> list:
-    """Return list of all known set codes to sync."""
+    """Return the seed list of set codes for the card_sets catalog.
+
+    New numbered sets (BT-25, EX-12, ...) are added to the catalog
+    automatically by refresh_set_catalog(); only new promo pack names need
+    to be listed here.
+    """
     # Booster sets BT-01 through BT-24 (and beyond as released)
     bt_sets = [f"BT-{i:02d}" for i in range(1, 25)]
 
@@ -251,12 +372,160 @@ def get_all_sets() -> list:
     return bt_sets + ex_sets + st_sets + lm_sets + rb_sets + promo_packs
 
 
+# =============================================================================
+# Set Catalog (card_sets table)
+# =============================================================================
+
+# Card-id prefixes that are never synced (see get_all_sets)
+EXCLUDED_SET_CODES = {"BTC", "DM", "MO"}
+
+# Card-id prefixes whose cards are spread across named promo packs
+PROMO_SET_CODES = {"P", "BO"}
+
+
+def catalog_group(set_code: str) -> str:
+    """Map a card-id set code to the catalog group that discovery counts under."""
+    if set_code in PROMO_SET_CODES:
+        return "P"
+    return set_code
+
+
+def set_code_for_pack(pack: str) -> str:
+    """Card-id group for an API pack name ("BT-01" -> "BT1", "ST-10" -> "ST10", promo packs -> "P")."""
+    match = re.match(r'^([A-Z]{1,3})-(\d+)$', pack)
+    if not match:
+        return "P"
+    prefix, number = match.groups()
+    if prefix == "LM":
+        return "LM"  # LM card ids carry no pack number (LM-001)
+    return f"{prefix}{int(number)}"
+
+
+def pack_for_set_code(set_code: str) -> str:
+    """API pack name for a numbered card-id set code ("BT25" -> "BT-25", "ST23" -> "ST-23").
+
+    Returns None for groups that do not map to a single pack (promos, LM).
+    """
+    match = re.match(r'^([A-Z]{1,3})(\d+)$', set_code)
+    if not match:
+        return None
+    prefix, number = match.groups()
+    if prefix == "ST":
+        return f"ST-{int(number)}"  # API uses ST-1 .. ST-9, then ST-10+
+    return f"{prefix}-{int(number):02d}"
+
+
+def count_cards_by_group(cards: list) -> dict:
+    """Count distinct standard-art card_ids per catalog group in a color scan."""
+    groups = {}
+    for card in cards:
+        card_id = card.get("id") or card.get("cardnumber", "")
+        if not is_standard_art(card_id):
+            continue
+        set_code = extract_set_code(card_id)
+        if not set_code or re.match(r'^[A-Z]+', set_code).group(0) in EXCLUDED_SET_CODES:
+            continue
+        groups.setdefault(catalog_group(set_code), set()).add(card_id)
+    return {group: len(ids) for group, ids in groups.items()}
+
+
+def ensure_set_catalog(cursor):
+    """Seed card_sets (migration 009) with the get_all_sets() packs it lacks."""
+    seed = [(pack, set_code_for_pack(pack), index) for index, pack in enumerate(get_all_sets())]
+    execute_values(cursor, """
+        INSERT INTO card_sets (pack, set_code, sort_order)
+        VALUES %s
+        ON CONFLICT (pack) DO NOTHING
+    """, seed)
+
+
+def refresh_set_catalog(cursor, cards: list = None) -> dict:
+    """Update card_sets from a cheap color scan.
+
+    Records the current card count of every catalog group and adds a pack
+    row for any numbered set code not seen before.
+
+    Args:
+        cursor: psycopg2 cursor
+        cards: Output of scan_colors(); scanned here if omitted
+
+    Returns:
+        Dict with groups seen and the list of newly added packs
+    """
+    ensure_set_catalog(cursor)
+
+    if cards is None:
+        print("\nScanning API for set catalog...")
+        cards = scan_colors()
+    counts = count_cards_by_group(cards)
+
+    cursor.execute("SELECT pack, set_code FROM card_sets")
+    known_groups = {set_code for _, set_code in cursor.fetchall()}
+
+    new_packs = []
+    for group in sorted(counts):
+        if group in known_groups:
+            continue
+        pack = pack_for_set_code(group)
+        if pack:
+            new_packs.append(pack)
+
+    if new_packs:
+        cursor.execute("SELECT COALESCE(MAX(sort_order), 0) FROM card_sets")
+        next_order = cursor.fetchone()[0] + 1
+        execute_values(cursor, """
+            INSERT INTO card_sets (pack, set_code, sort_order)
+            VALUES %s
+            ON CONFLICT (pack) DO NOTHING
+        """, [(pack, set_code_for_pack(pack), next_order + i) for i, pack in enumerate(new_packs)])
+
+    if counts:
+        execute_values(cursor, """
+            UPDATE card_sets AS s
+            SET card_count = v.card_count, last_seen_at = CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v(set_code, card_count)
+            WHERE s.set_code = v.set_code
+        """, list(counts.items()), template="(%s, %s::integer)")
+
+    return {"groups": len(counts), "new_packs": new_packs}
+
+
+def get_stale_sets(cursor) -> list:
+    """Packs never fetched, or whose group count changed since their last fetch."""
+    cursor.execute("""
+        SELECT pack
+        FROM card_sets
+        WHERE last_fetched_at IS NULL
+           OR (card_count IS NOT NULL AND card_count IS DISTINCT FROM fetched_count)
+        ORDER BY sort_order
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def get_catalog_sets(cursor) -> list:
+    """All catalog packs in sync priority order."""
+    cursor.execute("SELECT pack FROM card_sets ORDER BY sort_order")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def mark_sets_fetched(cursor, packs: list):
+    """Record that packs were fetched at their group's current count."""
+    if not packs:
+        return
+    execute_values(cursor, """
+        UPDATE card_sets AS s
+        SET fetched_count = s.card_count, last_fetched_at = CURRENT_TIMESTAMP
+        FROM (VALUES %s) AS v(pack)
+        WHERE s.pack = v.pack
+    """, [(pack,) for pack in packs])
+
+
 def process_card(card: dict) -> dict:
     """Transform API card data to our schema format."""
     card_id = card.get("id") or card.get("cardnumber", "")
     name = card.get("name", "")
 
-    return {
+    card_data = {
         "card_id": card_id,
         "name": name,
         "display_name": f"{name} ({card_id})",
@@ -271,11 +540,145 @@ def process_card(card: dict) -> dict:
         "rarity": card.get("rarity") or None,
         "set_code": extract_set_code(card_id)
     }
+    card_data["content_hash"] = card_content_hash(card_data)
+    return card_data
+
+
+def card_content_hash(card_data: dict) -> str:
+    """Stable 16-hex-digit hash of a card's CARD_COLUMNS values."""
+    payload = json.dumps([card_data[column] for column in CARD_COLUMNS], separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def upsert_cards(cursor, card_rows: list, page_size: int = UPSERT_PAGE_SIZE) -> dict:
+    """Bulk upsert processed cards, only touching rows whose data changed.
+
+    The DO UPDATE is guarded by a content_hash comparison, so unchanged cards
+    are not rewritten (no dead tuples, updated_at untouched). Rows synced
+    before content_hash existed have a NULL hash and are rewritten once to
+    fill it in. RETURNING (xmax = 0)
+    tells freshly inserted rows apart from updated ones; unchanged rows
+    return nothing.
+
+    Returns:
+        Dict with inserted / changed / unchanged counts
+    """
+    if not card_rows:
+        return {"inserted": 0, "changed": 0, "unchanged": 0}
+
+    written = CARD_COLUMNS + ["content_hash"]
+    values = [tuple(card[column] for column in written) for card in card_rows]
+    columns = ", ".join(written)
+    updates = ",\n            ".join(f"{column} = EXCLUDED.{column}" for column in written[1:])
+
+    returned = execute_values(cursor, f"""
+        INSERT INTO cards ({columns}, updated_at)
+        VALUES %s
+        ON CONFLICT (card_id) DO UPDATE SET
+            {updates},
+            updated_at = CURRENT_TIMESTAMP
+        WHERE cards.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING (xmax = 0) AS inserted
+    """, values, template=f"({', '.join(['%s'] * len(written))}, CURRENT_TIMESTAMP)",
+        page_size=page_size, fetch=True)
+
+    inserted = sum(1 for (was_insert,) in returned if was_insert)
+    changed = len(returned) - inserted
+    return {"inserted": inserted, "changed": changed, "unchanged": len(values) - len(returned)}
+
+
+def load_card_state(cursor) -> dict:
+    """Return {card_id: {column: value, ..., "content_hash": hash}} for every stored card."""
+    cursor.execute(f"SELECT {', '.join(CARD_COLUMNS)}, content_hash FROM cards")
+    state = {}
+    for row in cursor.fetchall():
+        card_data = dict(zip(CARD_COLUMNS + ["content_hash"], row))
+        # Rows from before content_hash existed are hashed from their stored values
+        card_data["content_hash"] = card_data["content_hash"] or card_content_hash(card_data)
+        state[card_data["card_id"]] = card_data
+    return state
+
+
+def build_card_delta(before: dict, card_rows: list, full_sync: bool = False) -> dict:
+    """Diff synced cards against the stored state.
+
+    Args:
+        before: load_card_state() output taken before the upsert
+        card_rows: process_card() output for this run
+        full_sync: True when card_rows covers every set, so stored cards
+            missing from it can be reported as removed (they are not deleted)
+
+    Returns:
+        Manifest dict with added / changed / removed lists; changed entries
+        carry only the differing fields as {field: [before, after]}
+    """
+    added, changed = [], []
+    synced_ids = set()
+
+    for card in card_rows:
+        card_id = card["card_id"]
+        synced_ids.add(card_id)
+        old = before.get(card_id)
+        if old is None:
+            added.append(card_id)
+        elif old["content_hash"] != card["content_hash"]:
+            fields = {
+                column: [old[column], card[column]]
+                for column in CARD_COLUMNS
+                if old[column] != card[column]
+            }
+            changed.append({
+                "card_id": card_id,
+                "before_hash": old["content_hash"],
+                "after_hash": card["content_hash"],
+                "fields": fields,
+            })
+
+    removed = sorted(set(before) - synced_ids) if full_sync else []
+
+    return {
+        "version": 1,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "full_sync": full_sync,
+        "counts": {
+            "synced": len(card_rows),
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+        },
+        "added": sorted(added),
+        "changed": sorted(changed, key=lambda entry: entry["card_id"]),
+        "removed": removed,
+    }
 
 
-def sync_cards(conn, cursor, set_filter: str = None, by_set: bool = False, incremental: bool = False):
-    """Fetch cards from API and upsert to database."""
+def write_card_delta(manifest: dict, logs_dir=None) -> Path:
+    """Write a delta manifest to logs/card_sync_delta_<timestamp>.json. Returns the path."""
+    logs_dir = Path(logs_dir) if logs_dir else Path(__file__).resolve().parent.parent / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    path = logs_dir / f"card_sync_delta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, default=str)
+    return path
+
+
+def build_search_index(cursor):
+    """Rebuild data/card_search_index.bin from the cards table."""
+    cards = fetch_index_cards(cursor)
+    path, size = write_index(cards)
+    print(f"Search index: {len(cards)} cards, {size / 1024:.0f} KB -> {path}")
+
+
+def sync_cards(conn, cursor, set_filter: str = None, by_set: bool = False, incremental: bool = False,
+               all_sets: bool = False):
+    """Fetch cards from API and upsert to database.
+
+    A by-set sync without a set filter refreshes the card_sets catalog and
+    fetches only new or changed packs, unless all_sets is True.
+    """
     all_cards = []
+    by_set_cards = {}  # card_id -> (set index, card) for the concurrent full-set fetch
+    fetched_sets = []  # Catalog packs fetched this run (including empty ones)
 
     # Get existing card IDs if incremental mode
     existing_ids = set()
@@ -291,7 +694,7 @@ def sync_cards(conn, cursor, set_filter: str = None, by_set: bool = False, incre
     if by_set and set_filter:
         # Fetch by set - more comprehensive for a specific set
         print(f"  Fetching all cards from set {set_filter}...", end=" ", flush=True)
-        cards = fetch_cards_by_set(set_filter)
+        cards = fetch_cards_by_set(set_filter) or []
 
         # Filter to standard arts only
         standard_cards = [c for c in cards if is_standard_art(c.get("id") or c.get("cardnumber", ""))]
@@ -300,22 +703,35 @@ def sync_cards(conn, cursor, set_filter: str = None, by_set: bool = False, incre
         all_cards.extend(standard_cards)
 
     elif by_set and not set_filter:
-        # Fetch all known sets
-        sets = get_all_sets()
-        print(f"  Found {len(sets)} sets to sync")
-
-        for set_code in sets:
-            print(f"  Fetching {set_code}...", end=" ", flush=True)
-            cards = fetch_cards_by_set(set_code)
+        # Pick packs from the catalog, then fetch them concurrently, merging into the dedup map as each arrives
+        catalog = refresh_set_catalog(cursor)
+        conn.commit()
+        if catalog["new_packs"]:
+            print(f"  New sets discovered: {', '.join(catalog['new_packs'])}")
+
+        sets = get_catalog_sets(cursor) if all_sets else get_stale_sets(cursor)
+        print(f"  Found {len(sets)} sets to sync ({MAX_WORKERS} concurrent requests)")
+
+        started = time.monotonic()
+        for index, set_code, cards in fetch_sets_concurrently(sets):
+            # Empty packs count as fetched too, failed requests are retried next run
+            if cards is None:
+                print(f"  {set_code}: request failed, will retry next run")
+                continue
+            fetched_sets.append(set_code)
 
             # Filter to standard arts only
             standard_cards = [c for c in cards if is_standard_art(c.get("id") or c.get("cardnumber", ""))]
 
-            print(f"found {len(cards)}, keeping {len(standard_cards)} (standard art)")
-            all_cards.extend(standard_cards)
+            print(f"  {set_code}: found {len(cards)}, keeping {len(standard_cards)} (standard art)")
+            for card in standard_cards:
+                card_id = card.get("id") or card.get("cardnumber", "")
+                # Earliest set in catalog order wins, as with the serial fetch
+                if card_id not in by_set_cards or index < by_set_cards[card_id][0]:
+                    by_set_cards[card_id] = (index, card)
 
-            # Rate limiting
-            time.sleep(REQUEST_DELAY)
+        print(f"  Fetched {len(sets)} sets in {time.monotonic() - started:.1f}s")
+        all_cards.extend(card for _, card in sorted(by_set_cards.values(), key=lambda pair: pair[0]))
 
     else:
         # Original color-based fetching
@@ -354,59 +770,34 @@ def sync_cards(conn, cursor, set_filter: str = None, by_set: bool = False, incre
 
     if not unique_cards:
         print("No cards to sync.")
-        return 0
 
     # Process and upsert cards
-    print("\nUpserting to database...")
-
-    processed = 0
+    card_rows = []
     for card in unique_cards:
         try:
-            card_data = process_card(card)
-
-            # Upsert using INSERT ... ON CONFLICT DO UPDATE
-            cursor.execute("""
-                INSERT INTO cards
-                (card_id, name, display_name, card_type, color, color2,
-                 level, dp, play_cost, digi_type, stage, rarity, set_code, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-                ON CONFLICT (card_id) DO UPDATE SET
-                    name = EXCLUDED.name,
-                    display_name = EXCLUDED.display_name,
-                    card_type = EXCLUDED.card_type,
-                    color = EXCLUDED.color,
-                    color2 = EXCLUDED.color2,
-                    level = EXCLUDED.level,
-                    dp = EXCLUDED.dp,
-                    play_cost = EXCLUDED.play_cost,
-                    digi_type = EXCLUDED.digi_type,
-                    stage = EXCLUDED.stage,
-                    rarity = EXCLUDED.rarity,
-                    set_code = EXCLUDED.set_code,
-                    updated_at = CURRENT_TIMESTAMP
-            """, [
-                card_data["card_id"],
-                card_data["name"],
-                card_data["display_name"],
-                card_data["card_type"],
-                card_data["color"],
-                card_data["color2"],
-                card_data["level"],
-                card_data["dp"],
-                card_data["play_cost"],
-                card_data["digi_type"],
-                card_data["stage"],
-                card_data["rarity"],
-                card_data["set_code"]
-            ])
-            processed += 1
-
+            card_rows.append(process_card(card))
         except Exception as e:
             print(f"  Error processing {card.get('id', 'unknown')}: {e}")
 
+    before = load_card_state(cursor)
+
+    if card_rows:
+        print("\nUpserting to database...")
+    stats = upsert_cards(cursor, card_rows)
+    mark_sets_fetched(cursor, fetched_sets)
     conn.commit()
 
-    return processed
+    if card_rows:
+        print(f"  {stats['inserted']} inserted, {stats['changed']} changed, {stats['unchanged']} unchanged")
+
+    # Delta manifest for downstream consumers (removals only detectable on a full by-set sync)
+    manifest = build_card_delta(before, card_rows, full_sync=by_set and all_sets and not set_filter and not incremental)
+    manifest_path = write_card_delta(manifest)
+    counts = manifest["counts"]
+    print(f"  Delta: {counts['added']} added, {counts['changed']} changed, {counts['removed']} removed")
+    print(f"  Manifest: {manifest_path}")
+
+    return stats
 
 
 def main():
@@ -414,7 +805,9 @@ def main():
     parser.add_argument("--set", help="Sync specific set only (e.g., BT-21)")
     parser.add_argument("--by-set", action="store_true", help="Fetch by set/pack instead of by color (more comprehensive)")
     parser.add_argument("--incremental", action="store_true", help="Only add cards not already in database (faster)")
-    parser.add_argument("--discover", action="store_true", help="Discover new set prefixes from API")
+    parser.add_argument("--discover", action="store_true", help="Discover new set prefixes from API and refresh the set catalog")
+    parser.add_argument("--all-sets", action="store_true", help="With --by-set, fetch every catalog set instead of only new/changed ones")
+    parser.add_argument("--build-index", action="store_true", help="Only rebuild the card search index from the cards table")
     args = parser.parse_args()
 
     # Handle discover mode separately
@@ -423,9 +816,20 @@ def main():
         print("DigimonCard.io Prefix Discovery")
         print("=" * 60)
 
-        prefixes = discover_prefixes()
+        print("\nDiscovering card prefixes from API...")
+        cards = scan_colors()
+        prefixes = discover_prefixes(cards)
         known = get_known_prefixes()
 
+        # Same scan refreshes the set catalog (no extra requests)
+        conn = get_connection()
+        cursor = conn.cursor()
+        catalog = refresh_set_catalog(cursor, cards)
+        stale = get_stale_sets(cursor)
+        conn.commit()
+        cursor.close()
+        conn.close()
+
         print("\n" + "=" * 60)
         print("Results:")
         print("=" * 60)
@@ -444,6 +848,21 @@ def main():
         else:
             print("\n[OK] No new prefixes found - all are handled")
 
+        if catalog["new_packs"]:
+            print(f"[+] New sets added to catalog: {', '.join(catalog['new_packs'])}")
+        print(f"Sets pending sync (new or changed): {len(stale)}")
+        for pack in stale:
+            print(f"    {pack}")
+
+        return
+
+    # Handle index-only mode separately
+    if args.build_index:
+        conn = get_connection()
+        cursor = conn.cursor()
+        build_search_index(cursor)
+        cursor.close()
+        conn.close()
         return
 
     print("=" * 60)
@@ -463,6 +882,8 @@ def main():
         mode_parts.append("(by color)")
     if args.incremental:
         mode_parts.append("[incremental]")
+    if args.by_set and not args.set:
+        mode_parts.append("[all sets]" if args.all_sets else "[new/changed sets]")
     print(f"Mode: {' '.join(mode_parts)}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
@@ -489,6 +910,7 @@ def main():
             stage VARCHAR,
             rarity VARCHAR,
             set_code VARCHAR,
+            content_hash VARCHAR,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
@@ -501,19 +923,24 @@ def main():
     print(f"Cards in database before sync: {before_count}")
 
     # Sync cards
-    processed = sync_cards(conn, cursor, args.set, args.by_set, args.incremental)
+    stats = sync_cards(conn, cursor, args.set, args.by_set, args.incremental, args.all_sets)
 
     # Get count after sync
     cursor.execute("SELECT COUNT(*) FROM cards")
     after_count = cursor.fetchone()[0]
 
+    build_search_index(cursor)
+
     cursor.close()
     conn.close()
 
     print("\n" + "=" * 60)
     print("Sync complete!")
     print("=" * 60)
-    print(f"Cards processed: {processed}")
+    print(f"Cards processed: {stats['inserted'] + stats['changed'] + stats['unchanged']}")
+    print(f"  Inserted: {stats['inserted']}")
+    print(f"  Changed: {stats['changed']}")
+    print(f"  Unchanged: {stats['unchanged']}")
     print(f"Cards in database: {after_count}")
     print(f"New cards added: {after_count - before_count}")
     print("=" * 60)
@@ -14,6 +14,10 @@ Usage:
     python scripts/sync_limitless.py --all-tier1 --since 2025-10-01 --limit 5
     python scripts/sync_limitless.py --repair  (re-fetch missing standings)
     python scripts/sync_limitless.py --all-tier1 --since 2025-01-01 --clean  (fresh re-import)
+    python scripts/sync_limitless.py --backfill-cards  (populate result_cards from stored decklists)
+    python scripts/sync_limitless.py --all-tier1 --incremental --classify --rate  (+ update ratings)
+    python scripts/sync_limitless.py --rate --since 2026-01-01  (re-rate from a date, no sync)
+    python scripts/sync_limitless.py --all-tier1 --incremental --rate --export-static  (+ www/data/)
 
 Arguments:
     --organizer ID     Limitless organizer ID to sync
@@ -21,20 +25,36 @@ Arguments:
     --since DATE       Only sync tournaments on or after this date (YYYY-MM-DD)
     --incremental      Auto-detect since date from last sync (stored in limitless_sync_state)
     --classify         Run deck archetype auto-classification after sync
+    --rate             Replay competitive ratings from the earliest newly imported event_date
+                       and refresh achievement scores of players in the new tournaments
+                       and store ratings of affected stores
+                       (without a sync: from --since, or a full rebuild)
+    --export-static    Write content-hashed public dashboard data to www/data/ (export_public_data.py)
     --dry-run          Show what would be synced without writing to DB
     --limit N          Max tournaments to sync (useful for testing)
     --repair           Re-fetch standings/pairings for tournaments missing results
     --clean            Delete existing Limitless data before sync (for fresh re-import)
+    --backfill-cards   Populate result_cards for stored decklists that have no card rows yet
+
+After a sync that imports tournaments, the weekly meta aggregates
+(meta_weekly_stats) of their format/scene/week buckets, the daily meta
+trends (meta_trend_daily) from their dates onward, the archetype
+matchup pairs (archetype_matchups) and the player head-to-head pairs
+(player_head_to_head) they played are rebuilt, and their Swiss tiebreakers
+(result_tiebreakers) are computed from the imported pairings.
 
 Prerequisites:
     pip install psycopg2-binary python-dotenv requests
+    pip install numpy  (for --rate and the tiebreaker stage)
     NEON_HOST and NEON_PASSWORD env vars required (in .env file)
     Stores with limitless_organizer_id must exist in database before syncing
 """
 
+import io
 import os
 import re
 import sys
+import csv
 import time
 import json
 import argparse
@@ -372,6 +392,137 @@ def resolve_deck(cursor, deck_info, deck_map_cache):
     return None, next_request_id
 
 
+# =============================================================================
+# Decklist Cards (normalized result_cards table)
+# =============================================================================
+
+DECKLIST_CATEGORIES = ["digimon", "tamer", "option", "egg"]
+BACKFILL_BATCH_SIZE = 2000
+
+
+def decklist_card_id(card):
+    """Build a card_id (e.g., "BT13-087") from a Limitless decklist card entry.
+
+    Accepts an explicit id, or joins the entry's set code and number.
+    Returns None when the entry carries no printing information.
+    """
+    card_id = card.get("id") or card.get("cardnumber")
+    if card_id:
+        return str(card_id)
+
+    set_code = card.get("set")
+    number = card.get("number")
+    if set_code and number:
+        return f"{set_code}-{number}"
+    return None
+
+
+def decklist_card_rows(result_id, decklist):
+    """Flatten a decklist dict into result_cards rows.
+
+    Duplicate printings within a category are merged by summing counts.
+    Entries without a count (missing or null) are taken as 1, entries with
+    a count of 0 or less are skipped.
+
+    Returns:
+        List of (result_id, card_id, card_name, category, count) tuples
+    """
+    merged = {}
+    for category in DECKLIST_CATEGORIES:
+        for card in decklist.get(category) or []:
+            card_id = decklist_card_id(card)
+            card_name = card.get("name") or None
+            count = card.get("count")
+            count = 1 if count is None else int(count)
+            if count <= 0 or (not card_id and not card_name):
+                continue
+            key = (card_id, card_name, category)
+            merged[key] = merged.get(key, 0) + count
+
+    return [
+        (result_id, card_id, card_name, category, count)
+        for (card_id, card_name, category), count in merged.items()
+    ]
+
+
+def copy_result_cards(cursor, rows):
+    """Bulk-write result_cards rows with a single COPY FROM STDIN.
+
+    Args:
+        cursor: psycopg2 cursor
+        rows: List of (result_id, card_id, card_name, category, count) tuples
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for result_id, card_id, card_name, category, count in rows:
+        # Empty unquoted field = NULL in COPY CSV format
+        writer.writerow([result_id, card_id or "", card_name or "", category, count])
+    buffer.seek(0)
+
+    cursor.copy_expert(
+        "COPY result_cards (result_id, card_id, card_name, category, count) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+    return len(rows)
+
+
+def backfill_result_cards(conn, cursor, batch_size=BACKFILL_BATCH_SIZE):
+    """Populate result_cards for stored decklists that have no card rows yet.
+
+    Walks results in result_id order, one batch per commit, so an interrupted
+    backfill can simply be re-run.
+
+    Returns:
+        Dict with results and card rows written
+    """
+    print("\n" + "=" * 60)
+    print("BACKFILLING RESULT CARDS")
+    print("=" * 60)
+
+    total_results = 0
+    total_rows = 0
+    last_result_id = 0
+
+    while True:
+        cursor.execute("""
+            SELECT r.result_id, r.decklist_json
+            FROM results r
+            WHERE r.result_id > %s
+              AND r.decklist_json IS NOT NULL
+              AND r.decklist_json != ''
+              AND NOT EXISTS (SELECT 1 FROM result_cards rc WHERE rc.result_id = r.result_id)
+            ORDER BY r.result_id
+            LIMIT %s
+        """, (last_result_id, batch_size))
+        batch = cursor.fetchall()
+        if not batch:
+            break
+
+        rows = []
+        for result_id, decklist_json in batch:
+            try:
+                decklist = json.loads(decklist_json)
+            except ValueError:
+                print(f"    Warning: Invalid decklist JSON for result {result_id}, skipping")
+                continue
+            rows.extend(decklist_card_rows(result_id, decklist))
+
+        total_rows += copy_result_cards(cursor, rows)
+        total_results += len(batch)
+        last_result_id = batch[-1][0]
+        conn.commit()
+        print(f"  Processed {total_results} results ({total_rows} card rows)")
+
+    print(f"  Backfill complete: {total_results} results, {total_rows} card rows")
+    return {"results": total_results, "card_rows": total_rows}
+
+
 # =============================================================================
 # Tournament Sync
 # =============================================================================
@@ -521,6 +672,7 @@ def sync_tournament(cursor, tournament, organizer_id, store_id, dry_run=False):
         deck_map_cache[row[0]] = row[1]
 
     players_before = len(player_cache)
+    card_rows = []  # result_cards rows, written with one COPY after all results
 
     for standing in standings:
         limitless_username = standing.get("player", "")
@@ -568,6 +720,7 @@ def sync_tournament(cursor, tournament, organizer_id, store_id, dry_run=False):
                      placement, wins, losses, ties, decklist_json, decklist_url, notes,
                      created_at, updated_at)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                RETURNING result_id
             """, (
                 next_tournament_id,
                 player_id,
@@ -581,7 +734,10 @@ def sync_tournament(cursor, tournament, organizer_id, store_id, dry_run=False):
                 decklist_url,
                 notes,
             ))
+            result_id = cursor.fetchone()[0]
             results_inserted += 1
+            if decklist_json:
+                card_rows.extend(decklist_card_rows(result_id, decklist_info))
         except Exception as e:
             if "unique" in str(e).lower() or "duplicate" in str(e).lower():
                 print(f"      Warning: Duplicate result for player {limitless_username}, skipping")
@@ -591,6 +747,10 @@ def sync_tournament(cursor, tournament, organizer_id, store_id, dry_run=False):
     players_created = len(player_cache) - players_before
     print(f"      Results: {results_inserted} inserted, {players_created} new players, {deck_requests_created} deck requests")
 
+    cards_written = copy_result_cards(cursor, card_rows)
+    if cards_written:
+        print(f"      Decklist cards: {cards_written} rows written")
+
     # Process pairings
     print("      Fetching pairings...", end=" ", flush=True)
     pairings = fetch_tournament_pairings(limitless_id)
@@ -809,6 +969,7 @@ def sync_organizer(conn, cursor, organizer_id, since_date, dry_run=False, limit=
         "total_players_created": 0,
         "total_deck_requests": 0,
         "last_tournament_date": None,
+        "new_tournaments": [],  # (tournament_id, event_date) imported in this run
     }
 
     for tournament in tournaments:
@@ -823,6 +984,8 @@ def sync_organizer(conn, cursor, organizer_id, since_date, dry_run=False, limit=
                 stats["total_matches"] += result.get("matches", 0)
                 stats["total_players_created"] += result.get("players_created", 0)
                 stats["total_deck_requests"] += result.get("deck_requests", 0)
+                if result.get("tournament_id"):
+                    stats["new_tournaments"].append((result["tournament_id"], result.get("event_date")))
 
                 event_date = result.get("event_date") or tournament.get("date")
                 if event_date:
@@ -1114,7 +1277,7 @@ def run_repair_mode(conn, cursor):
 
     if not missing_results and not missing_matches:
         print("\nNo tournaments need repair!")
-        return {"repaired": 0}
+        return {"repaired": 0, "tournament_ids": []}
 
     print(f"\nRepairing {len(missing_results) + len(missing_matches)} tournaments...")
 
@@ -1122,14 +1285,14 @@ def run_repair_mode(conn, cursor):
     total_matches = 0
     total_players = 0
     total_decks = 0
-    repaired = 0
+    repaired_ids = []
 
     # Repair tournaments missing results
     for t in missing_results:
         tournament_id, limitless_id = t[0], t[1]
         stats = repair_tournament(cursor, tournament_id, limitless_id)
         if stats.get("results", 0) > 0 or stats.get("matches", 0) > 0:
-            repaired += 1
+            repaired_ids.append(tournament_id)
             total_results += stats.get("results", 0)
             total_matches += stats.get("matches", 0)
             total_players += stats.get("players_created", 0)
@@ -1141,21 +1304,28 @@ def run_repair_mode(conn, cursor):
         tournament_id, limitless_id = t[0], t[1]
         stats = repair_tournament(cursor, tournament_id, limitless_id)
         if stats.get("matches", 0) > 0:
-            repaired += 1
+            repaired_ids.append(tournament_id)
             total_matches += stats.get("matches", 0)
         conn.commit()
 
+    # Tiebreakers and aggregates skipped the repaired tournaments when they were first imported
+    if repaired_ids:
+        run_tiebreaker_stage(cursor, repaired_ids)
+        run_aggregate_stage(cursor, repaired_ids)
+        conn.commit()
+
     print("\n" + "=" * 60)
     print("REPAIR COMPLETE")
     print("=" * 60)
-    print(f"Tournaments repaired: {repaired}")
+    print(f"Tournaments repaired: {len(repaired_ids)}")
     print(f"Results inserted: {total_results}")
     print(f"Matches inserted: {total_matches}")
     print(f"New players: {total_players}")
     print(f"Deck requests: {total_decks}")
 
     return {
-        "repaired": repaired,
+        "repaired": len(repaired_ids),
+        "tournament_ids": repaired_ids,
         "results": total_results,
         "matches": total_matches,
         "players": total_players,
@@ -1304,6 +1474,10 @@ def run_classify_decklists(cursor):
 
     For decklists that can't be classified or match an archetype not in DB,
     creates deck_requests for admin review.
+
+    Returns:
+        Dict with classified count and the tournament_ids whose results were
+        re-tagged (their meta aggregates need a refresh)
     """
     print("\n" + "=" * 60)
     print("AUTO-CLASSIFYING UNKNOWN DECKLISTS")
@@ -1314,7 +1488,12 @@ def run_classify_decklists(cursor):
     scripts_dir = Path(__file__).parent
     if str(scripts_dir) not in sys.path:
         sys.path.insert(0, str(scripts_dir))
-    from classify_decklists import CLASSIFICATION_RULES, classify_decklist
+    from classify_decklists import (
+        classify_decklist, apply_archetype_updates, insert_deck_requests, link_pending_requests,
+    )
+    from decklist_similarity import (
+        decklist_card_set, minhash_signature, refresh_signatures, load_index, cluster_decklists,
+    )
 
     # Get archetype name to ID mapping
     cursor.execute('''
@@ -1342,7 +1521,7 @@ def run_classify_decklists(cursor):
 
     if len(results) == 0:
         print("  Nothing to classify!")
-        return 0
+        return {"classified": 0, "tournament_ids": []}
 
     # Track outcomes
     updates = []
@@ -1366,80 +1545,192 @@ def run_classify_decklists(cursor):
             # Classification failed - no matching rules
             unclassifiable.append((result_id, decklist_json))
 
-    # Apply direct updates
-    for archetype_id, result_id in updates:
-        cursor.execute(
-            "UPDATE results SET archetype_id = %s WHERE result_id = %s",
-            (archetype_id, result_id)
-        )
+    # Apply direct updates (single UPDATE ... FROM VALUES)
+    classified_tournaments = apply_archetype_updates(cursor, updates)
 
     print(f"  Classified {len(updates)} decklists")
 
-    # Create deck_requests for missing archetypes (one per archetype, not per result)
-    requests_created = 0
+    # Build all deck_requests up front so they go out as one multi-row INSERT:
+    # one per missing archetype (first result's decklist as the example),
+    # plus one per cluster of near-duplicate unclassifiable decklists
+    new_requests = []
+    request_members = {}  # first result_id -> [result_id, ...] linked to that request
     for archetype_name, result_list in missing_archetypes.items():
-        # Create one deck request for this missing archetype
-        # Use the first result's decklist as the example
         first_result_id, first_decklist = result_list[0]
-
-        cursor.execute("""
-            INSERT INTO deck_requests
-                (deck_name, primary_color, status, submitted_at,
-                 suggested_archetype_name, decklist_json, source, result_id)
-            VALUES (%s, 'Unknown', 'pending', CURRENT_TIMESTAMP,
-                    %s, %s, 'classification', %s)
-            RETURNING request_id
-        """, (
-            f"[Auto] {archetype_name}",
-            archetype_name,
-            first_decklist,
-            first_result_id
+        member_ids = [result_id for result_id, _ in result_list]
+        new_requests.append((
+            f"[Auto] {archetype_name}", "pending", archetype_name, first_decklist, first_result_id,
+            json.dumps(member_ids),
         ))
-        next_request_id = cursor.fetchone()[0]
+        request_members[first_result_id] = member_ids
 
-        # Link all results with this archetype to this deck request
-        for result_id, _ in result_list:
-            cursor.execute(
-                "UPDATE results SET pending_deck_request_id = %s WHERE result_id = %s",
-                (next_request_id, result_id)
-            )
+    # Nearest-neighbour fallback: suggest the archetype of similar classified decklists
+    suggestions = {}  # result_id -> (archetype_name, similarity)
+    clusters = []
+    if unclassifiable:
+        signature_stats = refresh_signatures(cursor)
+        index = load_index(cursor)
+        print(f"  Similarity index: {len(index)} classified decklists "
+              f"(+{signature_stats['added']} new, {signature_stats['relabelled']} relabelled, "
+              f"-{signature_stats['removed']} removed)")
+
+        card_sets = {result_id: decklist_card_set(decklist_json) for result_id, decklist_json in unclassifiable}
+        for result_id, card_set in card_sets.items():
+            suggested_name, similarity = index.suggest_label(minhash_signature(card_set))
+            if suggested_name:
+                suggestions[result_id] = (suggested_name, similarity)
+
+        # Group near-duplicate decklists so each distinct new deck is one request
+        clusters = cluster_decklists(list(card_sets.items()))
+
+    decklists_by_result = dict(unclassifiable)
+    for member_ids in clusters:
+        # Cluster suggestion: similarity-weighted vote across members
+        votes = {}
+        for result_id in member_ids:
+            if result_id in suggestions:
+                name, similarity = suggestions[result_id]
+                votes[name] = votes.get(name, 0.0) + similarity
+        suggested_name = max(votes, key=votes.get) if votes else None
+
+        first_result_id = member_ids[0]
+        deck_name = "[Auto] Unclassified Deck"
+        if len(member_ids) > 1:
+            deck_name += f" ({len(member_ids)} similar)"
+        new_requests.append((
+            deck_name, "needs_classification", suggested_name,
+            decklists_by_result[first_result_id], first_result_id, json.dumps(member_ids),
+        ))
+        request_members[first_result_id] = member_ids
 
-        requests_created += 1
-        print(f"    Created deck request for '{archetype_name}' ({len(result_list)} results)")
+    request_ids = insert_deck_requests(cursor, new_requests)
 
-    # Create deck_requests for unclassifiable decklists (one per result)
-    for result_id, decklist_json in unclassifiable:
-        cursor.execute("""
-            INSERT INTO deck_requests
-                (deck_name, primary_color, status, submitted_at,
-                 suggested_archetype_name, decklist_json, source, result_id)
-            VALUES (%s, 'Unknown', 'needs_classification', CURRENT_TIMESTAMP,
-                    NULL, %s, 'classification', %s)
-            RETURNING request_id
-        """, (
-            "[Auto] Unclassified Deck",
-            decklist_json,
-            result_id
-        ))
-        next_request_id = cursor.fetchone()[0]
+    # Link every affected result to its new request in one joined UPDATE
+    links = []
+    for first_result_id, member_ids in request_members.items():
+        request_id = request_ids[first_result_id]
+        links.extend((request_id, result_id) for result_id in member_ids)
+    link_pending_requests(cursor, links)
 
-        cursor.execute(
-            "UPDATE results SET pending_deck_request_id = %s WHERE result_id = %s",
-            (next_request_id, result_id)
-        )
-        requests_created += 1
+    requests_created = len(request_ids)
+    for archetype_name, result_list in missing_archetypes.items():
+        print(f"    Created deck request for '{archetype_name}' ({len(result_list)} results)")
 
     if unclassifiable:
-        print(f"    Created {len(unclassifiable)} deck requests for unclassifiable decklists")
+        print(f"    Created {len(clusters)} deck requests for {len(unclassifiable)} unclassifiable decklists "
+              f"({len(suggestions)} with a similarity suggestion)")
 
     total_missing = sum(len(r) for r in missing_archetypes.values())
     print(f"  Summary:")
     print(f"    - Directly classified: {len(updates)}")
     print(f"    - Missing archetypes: {total_missing} results ({len(missing_archetypes)} unique archetypes)")
-    print(f"    - Unclassifiable: {len(unclassifiable)}")
+    print(f"    - Unclassifiable: {len(unclassifiable)} ({len(suggestions)} with similarity suggestion)")
     print(f"    - Deck requests created: {requests_created}")
 
-    return len(updates)
+    return {"classified": len(updates), "tournament_ids": classified_tournaments}
+
+
+def run_rating_stage(cursor, from_date=None, tournament_ids=None):
+    """Replay competitive ratings from from_date forward (full rebuild if None).
+
+    Python replacement for calculate_ratings_from_date() in R/ratings.R:
+    prior state comes from player_rating_history, and history plus
+    player_ratings_cache are rewritten for the replayed tournaments only.
+    Achievement scores are then recomputed for players in tournament_ids
+    (default: tournaments on or after from_date, or everyone), and
+    store_ratings_cache for stores hosting those tournaments or visited by
+    re-rated players.
+    """
+    print("\n" + "=" * 60)
+    print("UPDATING COMPETITIVE RATINGS")
+    print("=" * 60)
+
+    from pathlib import Path
+    scripts_dir = Path(__file__).parent
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    from ratings_engine import rate_from, refresh_achievement_scores, refresh_store_ratings
+
+    print(f"  Replaying from: {from_date or 'the beginning (full rebuild)'}")
+    started = time.time()
+    stats = rate_from(cursor, from_date)
+    print(f"  Prior state loaded for {stats['prior_players']} players")
+    print(f"  Replayed {stats['tournaments']} tournaments: "
+          f"{stats['history_rows']} history rows, {stats['players']} players updated "
+          f"({time.time() - started:.1f}s)")
+
+    if tournament_ids is None and from_date:
+        cursor.execute("SELECT tournament_id FROM tournaments WHERE event_date >= %s", (from_date,))
+        tournament_ids = [row[0] for row in cursor.fetchall()]
+    stats["achievements"] = refresh_achievement_scores(cursor, tournament_ids)
+    print(f"  Achievement scores: {stats['achievements']} players changed")
+
+    if tournament_ids is None:
+        stats["stores"], removed = refresh_store_ratings(cursor)
+    else:
+        stats["stores"], removed = refresh_store_ratings(cursor, tournament_ids, stats["player_ids"])
+    print(f"  Store ratings: {stats['stores']} stores changed, {removed} removed")
+    return stats
+
+
+def run_aggregate_stage(cursor, tournament_ids=None):
+    """Rebuild the pre-aggregated meta and head-to-head tables for the given tournaments (all if None)."""
+    print("\n" + "=" * 60)
+    print("UPDATING META AGGREGATES")
+    print("=" * 60)
+
+    from pathlib import Path
+    scripts_dir = Path(__file__).parent
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    from meta_aggregates import (refresh_meta_weekly_stats, refresh_meta_trends,
+                                 refresh_archetype_matchups, refresh_head_to_head)
+
+    stats = refresh_meta_weekly_stats(cursor, tournament_ids)
+    print(f"  Weekly meta stats: {stats['buckets']} buckets rebuilt ({stats['rows']} rows)")
+    stats.update(refresh_meta_trends(cursor, tournament_ids))
+    print(f"  Meta trends: {stats['trend_days']} days rebuilt ({stats['trend_rows']} rows)")
+    stats.update(refresh_archetype_matchups(cursor, tournament_ids))
+    print(f"  Archetype matchups: {stats['pairs']} pairs rebuilt")
+    stats.update(refresh_head_to_head(cursor, tournament_ids))
+    print(f"  Player head-to-head: {stats['player_pairs']} pairs rebuilt")
+    return stats
+
+
+def run_tiebreaker_stage(cursor, tournament_ids):
+    """Compute Swiss tiebreakers (OMW%, OOMW%, SoS) for the given tournaments."""
+    print("\n" + "=" * 60)
+    print("COMPUTING TIEBREAKERS")
+    print("=" * 60)
+
+    from pathlib import Path
+    scripts_dir = Path(__file__).parent
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    from tiebreakers import refresh_tiebreakers
+
+    stats = refresh_tiebreakers(cursor, tournament_ids)
+    print(f"  Tiebreakers: {stats['results']} results over {stats['tournaments']} tournaments")
+    return stats
+
+
+def run_export_stage(cursor):
+    """Write the public dashboard datasets to www/data/ (content-hashed, with manifest)."""
+    print("\n" + "=" * 60)
+    print("EXPORTING STATIC DASHBOARD DATA")
+    print("=" * 60)
+
+    from pathlib import Path
+    scripts_dir = Path(__file__).parent
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    from export_public_data import export_public_data
+
+    stats = export_public_data(cursor)
+    for name, entry in stats["datasets"].items():
+        marker = "updated" if name in stats["changed"] else "unchanged"
+        print(f"  {name}: {entry['rows']} rows -> {entry['json']} ({marker})")
+    return stats
 
 
 def main():
@@ -1464,14 +1755,29 @@ def main():
                         help="Re-fetch standings/pairings for tournaments missing results")
     parser.add_argument("--clean", action="store_true",
                         help="Delete ALL existing Limitless data before sync (for fresh re-import)")
+    parser.add_argument("--backfill-cards", action="store_true",
+                        help="Populate result_cards for stored decklists that have no card rows yet")
+    parser.add_argument("--rate", action="store_true",
+                        help="Replay competitive ratings from the earliest newly imported event date")
+    parser.add_argument("--export-static", action="store_true",
+                        help="Write public dashboard data to www/data/ after the sync")
     args = parser.parse_args()
 
+    # --rate without an organizer re-rates from --since (or rebuilds) without syncing
+    rate_only = args.rate and not args.organizer and not args.all_tier1
+
     # Validate arguments
-    if not args.organizer and not args.all_tier1 and not args.repair:
-        parser.error("Either --organizer ID, --all-tier1, or --repair is required")
+    if not args.organizer and not args.all_tier1 and not args.repair and not args.backfill_cards and not rate_only:
+        parser.error("Either --organizer ID, --all-tier1, --repair, --backfill-cards, or --rate is required")
 
-    # Validate date format (not required for repair mode or incremental mode)
-    if not args.repair and not args.incremental:
+    if rate_only and args.since:
+        try:
+            datetime.strptime(args.since, "%Y-%m-%d")
+        except ValueError:
+            parser.error(f"Invalid date format: {args.since} (expected YYYY-MM-DD)")
+
+    # Validate date format (not required for repair, backfill, rate-only, or incremental mode)
+    if not args.repair and not args.backfill_cards and not rate_only and not args.incremental:
         if not args.since:
             parser.error("--since DATE is required (or use --incremental for auto-detect)")
         try:
@@ -1504,6 +1810,28 @@ def main():
         print("=" * 60)
         return
 
+    # Handle card backfill mode separately
+    if args.backfill_cards:
+        print("Mode: BACKFILL CARDS (normalize stored decklists into result_cards)")
+        backfill_result_cards(conn, cursor)
+        cursor.close()
+        conn.close()
+        print("=" * 60)
+        return
+
+    # Handle rate-only mode separately
+    if rate_only:
+        print("Mode: RATE (replay competitive ratings, no sync)")
+        if args.dry_run:
+            print("[DRY RUN] Skipping rating replay.")
+        else:
+            run_rating_stage(cursor, args.since)
+            conn.commit()
+        cursor.close()
+        conn.close()
+        print("=" * 60)
+        return
+
     # Normal sync mode
     if args.all_tier1:
         organizer_ids = list(TIER1_ORGANIZERS.keys())
@@ -1522,6 +1850,8 @@ def main():
         print(f"Limit: {args.limit} tournaments per organizer")
     if args.classify:
         print(f"Post-sync: Auto-classify UNKNOWN decklists")
+    if args.rate:
+        print(f"Post-sync: Update competitive ratings")
     if args.dry_run:
         print("Mode: DRY RUN (no database writes)")
 
@@ -1543,10 +1873,38 @@ def main():
             all_stats.append({"error": str(e), "organizer_id": organizer_id})
 
     # Run auto-classification if requested
-    classified_count = 0
+    classify_stats = {"classified": 0, "tournament_ids": []}
     if args.classify and not args.dry_run:
-        classified_count = run_classify_decklists(cursor)
+        classify_stats = run_classify_decklists(cursor)
+        conn.commit()
+
+    # Replay ratings from the earliest tournament imported in this run
+    new_tournaments = [t for s in all_stats for t in s.get("new_tournaments", [])]
+    rating_stats = None
+    if args.rate and not args.dry_run:
+        if new_tournaments:
+            from_date = min(str(event_date)[:10] for _, event_date in new_tournaments)
+            rating_stats = run_rating_stage(cursor, from_date, [tid for tid, _ in new_tournaments])
+            conn.commit()
+        else:
+            print("\nNo new tournaments imported - ratings unchanged.")
+
+    # Refresh the dashboard aggregates touched by this run: imported tournaments
+    # plus older ones whose results were re-tagged by classification
+    aggregate_ids = sorted({tid for tid, _ in new_tournaments} | set(classify_stats["tournament_ids"]))
+    aggregate_stats = None
+    tiebreaker_stats = None
+    if aggregate_ids and not args.dry_run:
+        aggregate_stats = run_aggregate_stage(cursor, aggregate_ids)
         conn.commit()
+    if new_tournaments and not args.dry_run:
+        tiebreaker_stats = run_tiebreaker_stage(cursor, [tid for tid, _ in new_tournaments])
+        conn.commit()
+
+    # Static exports only change when something was imported
+    export_stats = None
+    if args.export_static and new_tournaments and not args.dry_run:
+        export_stats = run_export_stage(cursor)
 
     # Close connection
     cursor.close()
@@ -1572,7 +1930,15 @@ def main():
     print(f"New players: {total_players}")
     print(f"Deck requests: {total_decks}")
     if args.classify and not args.dry_run:
-        print(f"Decklists classified: {classified_count}")
+        print(f"Decklists classified: {classify_stats['classified']}")
+    if rating_stats:
+        print(f"Ratings updated: {rating_stats['players']} players over {rating_stats['tournaments']} tournaments")
+    if aggregate_stats:
+        print(f"Meta buckets refreshed: {aggregate_stats['buckets']}")
+    if tiebreaker_stats:
+        print(f"Tiebreakers computed: {tiebreaker_stats['results']} results")
+    if export_stats:
+        print(f"Static datasets updated: {', '.join(export_stats['changed']) or 'none'}")
 
     if errors:
         print(f"\nErrors: {len(errors)}")
@@ -0,0 +1,32 @@
+"""
+Tests for decklist clustering in decklist_similarity.py.
+
+Feeds small hand-built card sets straight into the clustering, so no
+database is needed:
+
+    python -m pytest scripts/tests
+
+Prerequisites:
+    pip install pytest
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from decklist_similarity import cluster_decklists
+
+
+def test_cluster_decklists():
+    base = {f"card {i}" for i in range(10)}
+    one_swap = base - {"card 0"} | {"card 10"}       # Jaccard 9/11 with base
+    two_swaps = one_swap - {"card 1"} | {"card 11"}  # 9/11 with one_swap, 8/12 with base
+    other = {f"other {i}" for i in range(10)}
+
+    clusters = cluster_decklists([
+        (5, two_swaps), (2, base), (4, other), (3, set()), (1, one_swap),
+    ])
+
+    # base and two_swaps are only linked through one_swap
+    assert clusters == [[1, 2, 5], [3], [4]]
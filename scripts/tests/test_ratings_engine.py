@@ -0,0 +1,45 @@
+"""
+Tests for the per-tournament rating changes in ratings_engine.py.
+
+Each test feeds a small hand-computed field straight into the function, so
+no database is needed:
+
+    python -m pytest scripts/tests
+
+Prerequisites:
+    pip install pytest numpy
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ratings_engine import tournament_rating_changes, K_PROVISIONAL, K_ESTABLISHED
+
+
+def test_rating_changes_equal_ratings():
+    # Even expectations: the winner scores 3 - 1.5 over 3 opponents
+    changes = tournament_rating_changes(
+        np.full(4, 1500.0), np.array([0, 0, 10, 10]), [1, 2, 3, 4], None,
+    )
+
+    assert changes == pytest.approx([
+        K_PROVISIONAL * 1.5 / 3,
+        K_PROVISIONAL * 0.5 / 3,
+        K_ESTABLISHED * -0.5 / 3,
+        K_ESTABLISHED * -1.5 / 3,
+    ])
+
+
+def test_rating_changes_tie_and_round_multiplier():
+    # A shared placement is a draw; 5 rounds scale changes by 1.2
+    expected_favourite = 1 / (1 + 10 ** (-200 / 400))
+    change = K_ESTABLISHED * (0.5 - expected_favourite) * 1.2
+
+    changes = tournament_rating_changes(np.array([1600.0, 1400.0]), np.array([10, 10]), [1, 1], 5)
+
+    assert changes == pytest.approx([change, -change])
@@ -0,0 +1,51 @@
+"""
+Tests for the card sync delta in sync_cards.py.
+
+Builds before/after card sets from hand-written API records, so no
+database or API access is needed:
+
+    python -m pytest scripts/tests
+
+Prerequisites:
+    pip install pytest psycopg2-binary python-dotenv requests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sync_cards import process_card, build_card_delta
+
+
+def api_card(card_id, name, **fields):
+    return {"id": card_id, "name": name, "type": "Digimon", "color": "Red", **fields}
+
+
+def test_build_card_delta():
+    before = {
+        card["card_id"]: card
+        for card in [
+            process_card(api_card("BT1-001", "Koromon", level="2")),
+            process_card(api_card("BT1-010", "Agumon", level="3", dp="2000")),
+            process_card(api_card("BT1-099", "Retired")),
+        ]
+    }
+    synced = [
+        process_card(api_card("BT1-001", "Koromon", level="2")),
+        process_card(api_card("BT1-010", "Agumon", level="3", dp="3000")),
+        process_card(api_card("BT1-020", "Gabumon", level="3")),
+    ]
+
+    delta = build_card_delta(before, synced, full_sync=True)
+
+    assert delta["counts"] == {"synced": 3, "added": 1, "changed": 1, "removed": 1}
+    assert delta["added"] == ["BT1-020"]
+    assert delta["removed"] == ["BT1-099"]
+    [changed] = delta["changed"]
+    assert changed["card_id"] == "BT1-010"
+    assert changed["fields"] == {"dp": [2000, 3000]}
+    assert changed["before_hash"] != changed["after_hash"]
+
+    # Without a full sync, cards missing from the run are not reported
+    assert build_card_delta(before, synced)["removed"] == []
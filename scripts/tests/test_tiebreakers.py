@@ -0,0 +1,90 @@
+"""
+Tests for the Swiss tiebreaker computation in tiebreakers.py.
+
+Each test feeds a small hand-computed bracket straight into the function, so
+no database is needed:
+
+    python -m pytest scripts/tests
+
+Prerequisites:
+    pip install pytest numpy
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tiebreakers import compute_tiebreakers, MW_FLOOR
+
+
+# Tournament 1, three rounds (player 9 has no result, e.g. removed later):
+#   R1  A(1) beat B(2), C(3) beat D(4), E(5) bye
+#   R2  A beat C, B beat E, player 9 beat D (D drops)
+#   R3  A beat E (stored for A only), B tied C
+# Tournament 2 has player 1 again, with no record and no matches.
+RESULTS = np.array([
+    # result_id, tournament_id, player_id, wins, losses, ties
+    [103, 1, 3, 1, 1, 1],
+    [201, 2, 1, 0, 0, 0],
+    [101, 1, 1, 3, 0, 0],
+    [105, 1, 5, 1, 2, 0],
+    [102, 1, 2, 1, 1, 1],
+    [104, 1, 4, 0, 2, 0],
+], dtype=np.int64)
+
+EDGES = np.array([
+    # tournament_id, player_id, opponent_id, match_points
+    [1, 1, 2, 3], [1, 2, 1, 0],
+    [1, 3, 4, 3], [1, 4, 3, 0],
+    [1, 1, 3, 3], [1, 3, 1, 0],
+    [1, 2, 5, 3], [1, 5, 2, 0],
+    [1, 4, 9, 0], [1, 9, 4, 3],
+    [1, 1, 5, 3],
+    [1, 2, 3, 1], [1, 3, 2, 1],
+], dtype=np.int64)
+
+# Expected per result_id. mw: A 9/9, B and C 4/9, D 0/6 floored to 1/3,
+# E 3/9 (the bye win counts); E's only opponent is B, D's only opponent is C.
+EXPECTED = {
+    101: {"match_points": 9, "mw": 1.0, "omw": 11 / 27, "oomw": 44 / 81, "sos": 11, "opponents": 3},
+    102: {"match_points": 4, "mw": 4 / 9, "omw": 16 / 27, "oomw": 13 / 27, "sos": 16, "opponents": 3},
+    103: {"match_points": 4, "mw": 4 / 9, "omw": 16 / 27, "oomw": 13 / 27, "sos": 13, "opponents": 3},
+    104: {"match_points": 0, "mw": MW_FLOOR, "omw": 4 / 9, "oomw": 16 / 27, "sos": 4, "opponents": 1},
+    105: {"match_points": 3, "mw": 1 / 3, "omw": 4 / 9, "oomw": 16 / 27, "sos": 4, "opponents": 1},
+}
+
+
+def test_compute_tiebreakers_swiss_bracket():
+    stats = compute_tiebreakers(RESULTS, EDGES)
+
+    for row, result_id in enumerate(RESULTS[:, 0]):
+        if result_id not in EXPECTED:
+            continue
+        for key, value in EXPECTED[result_id].items():
+            assert stats[key][row] == pytest.approx(value), (result_id, key)
+
+
+def test_compute_tiebreakers_without_rounds():
+    stats = compute_tiebreakers(RESULTS, EDGES)
+    row = int(np.flatnonzero(RESULTS[:, 0] == 201)[0])
+
+    assert stats["match_points"][row] == 0
+    assert stats["opponents"][row] == 0
+    for key in ("mw", "omw", "oomw", "sos"):
+        assert np.isnan(stats[key][row]), key
+
+
+def test_compute_tiebreakers_falls_back_to_match_graph():
+    # No W/L/T on the results: records come from the edges instead
+    results = np.array([[1, 1, 1, 0, 0, 0], [2, 1, 2, 0, 0, 0]], dtype=np.int64)
+    edges = np.array([[1, 1, 2, 3], [1, 2, 1, 0]], dtype=np.int64)
+
+    stats = compute_tiebreakers(results, edges)
+
+    assert stats["match_points"].tolist() == [3, 0]
+    assert stats["mw"] == pytest.approx([1.0, MW_FLOOR])
+    assert stats["omw"] == pytest.approx([MW_FLOOR, 1.0])
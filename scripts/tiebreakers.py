@@ -0,0 +1,222 @@
+"""
+Swiss Tiebreakers
+
+Computes each result's Swiss tiebreakers from the tournament's match graph
+and stores them in result_tiebreakers (one row per result):
+
+    mw_pct     Own match win %: (3 * wins + ties) / (3 * rounds), floored at 33.33
+    omw_pct    Opponents' match win %: mean mw_pct of the opponents faced
+    oomw_pct   Opponents' opponents' match win %: mean omw_pct of those opponents
+    sos        Strength of schedule: sum of the opponents' match points
+
+The record comes from results (Limitless records include byes, which count
+toward mw_pct but add no opponent); results without a record fall back to
+their matches. Opponents are counted once per match, so a rematch in top cut
+counts twice. Matches stored from one perspective only are mirrored for the
+opponent (the match_perspectives view); opponents without a
+result in the tournament are left out.
+
+All tournaments of a refresh are computed together: players are indexed by
+(tournament, player) and every average is one np.bincount over the match
+edges, so there is no per-tournament or per-player loop.
+
+Used by sync_limitless.py (after every sync that imports tournaments). Can
+also be run directly:
+
+    python scripts/tiebreakers.py --tournaments 812,813
+    python scripts/tiebreakers.py --all
+
+Prerequisites:
+    pip install numpy psycopg2-binary python-dotenv requests
+    result_tiebreakers table (db/migrations/013_result_tiebreakers.sql)
+    match_perspectives view (db/migrations/015_meta_refresh_functions.sql)
+"""
+
+import argparse
+
+import numpy as np
+
+from ratings_engine import copy_rows
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+MW_FLOOR = 1 / 3         # Minimum match win % used in opponent averages
+PLAYER_BITS = 32         # (tournament_id << PLAYER_BITS) | player_id keys
+
+
+# =============================================================================
+# Computation
+# =============================================================================
+
+def load_match_graph(cursor, tournament_ids=None):
+    """Load results and match edges of the given tournaments (None = all).
+
+    Returns:
+        Tuple (results, edges) of int64 arrays: results rows are (result_id,
+        tournament_id, player_id, wins, losses, ties); edges rows are
+        (tournament_id, player_id, opponent_id, match_points)
+    """
+    condition = "tournament_id = ANY(%s)" if tournament_ids is not None else "TRUE"
+    params = (list(tournament_ids),) if tournament_ids is not None else None
+
+    cursor.execute(f"""
+        SELECT result_id, tournament_id, player_id,
+               COALESCE(wins, 0), COALESCE(losses, 0), COALESCE(ties, 0)
+        FROM results
+        WHERE {condition}
+    """, params)
+    results = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 6)
+
+    cursor.execute(f"""
+        SELECT tournament_id, player_id, opponent_id, match_points
+        FROM match_perspectives mp
+        WHERE {condition}
+    """, params)
+    edges = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 4)
+    return results, edges
+
+
+def compute_tiebreakers(results, edges):
+    """Compute tiebreakers for every result.
+
+    Args:
+        results: Array of (result_id, tournament_id, player_id, wins, losses, ties)
+        edges: Array of (tournament_id, player_id, opponent_id, match_points)
+
+    Returns:
+        Dict of arrays aligned with results: match_points, mw (0-1, NaN
+        without rounds), omw, oomw (0-1), sos (NaN without opponents) and
+        opponents
+    """
+    n = len(results)
+    keys = (results[:, 1] << PLAYER_BITS) | results[:, 2]
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    def index_of(tournament_ids, player_ids):
+        """Row index of each (tournament, player) in results, -1 if absent."""
+        wanted = (tournament_ids << PLAYER_BITS) | player_ids
+        if n == 0:
+            return np.full(len(wanted), -1, dtype=np.int64)
+        pos = np.searchsorted(sorted_keys, wanted).clip(max=n - 1)
+        return np.where(sorted_keys[pos] == wanted, order[pos], -1)
+
+    me = index_of(edges[:, 0], edges[:, 1])
+    opp = index_of(edges[:, 0], edges[:, 2])
+    edges, me, opp = edges[me >= 0], me[me >= 0], opp[me >= 0]
+
+    # Own record from results, falling back to the match graph when empty
+    wins, losses, ties = results[:, 3], results[:, 4], results[:, 5]
+    rounds = wins + losses + ties
+    points = 3 * wins + ties
+    graph_rounds = np.bincount(me, minlength=n)
+    graph_points = np.bincount(me, weights=edges[:, 3], minlength=n).astype(np.int64)
+    empty = rounds == 0
+    rounds = np.where(empty, graph_rounds, rounds)
+    points = np.where(empty, graph_points, points)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mw = np.maximum(points / (3 * rounds), MW_FLOOR)
+    mw[rounds == 0] = np.nan
+
+    # Opponent averages over edges whose opponent has a result
+    me, opp = me[opp >= 0], opp[opp >= 0]
+    opponents = np.bincount(me, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        omw = np.bincount(me, weights=mw[opp], minlength=n) / opponents
+        oomw = np.bincount(me, weights=omw[opp], minlength=n) / opponents
+    sos = np.bincount(me, weights=points[opp], minlength=n).astype(float)
+    sos[opponents == 0] = np.nan
+
+    return {
+        "match_points": points,
+        "mw": mw,
+        "omw": omw,
+        "oomw": oomw,
+        "sos": sos,
+        "opponents": opponents,
+    }
+
+
+def _pct(values):
+    """Percent with 2 decimals, None for NaN (NULL in COPY)."""
+    return [None if np.isnan(v) else round(float(v) * 100, 2) for v in values]
+
+
+# =============================================================================
+# Refresh
+# =============================================================================
+
+def refresh_tiebreakers(cursor, tournament_ids=None):
+    """Recompute result_tiebreakers for the given tournaments.
+
+    Args:
+        cursor: psycopg2 cursor (caller commits)
+        tournament_ids: Tournaments to recompute (None = all)
+
+    Returns:
+        Dict with tournaments and results (rows written) counts
+    """
+    results, edges = load_match_graph(cursor, tournament_ids)
+    stats = compute_tiebreakers(results, edges)
+
+    if tournament_ids is None:
+        cursor.execute("DELETE FROM result_tiebreakers")
+    else:
+        cursor.execute("DELETE FROM result_tiebreakers WHERE tournament_id = ANY(%s)",
+                       (list(tournament_ids),))
+
+    sos = [None if np.isnan(v) else int(v) for v in stats["sos"]]
+    rows = list(zip(
+        results[:, 0].tolist(),
+        results[:, 1].tolist(),
+        stats["match_points"].tolist(),
+        _pct(stats["mw"]),
+        _pct(stats["omw"]),
+        _pct(stats["oomw"]),
+        sos,
+        stats["opponents"].tolist(),
+    ))
+    written = copy_rows(cursor, "result_tiebreakers",
+                        ["result_id", "tournament_id", "match_points", "mw_pct",
+                         "omw_pct", "oomw_pct", "sos", "opponents"],
+                        rows)
+    return {"tournaments": len(np.unique(results[:, 1])), "results": written}
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def parse_ids(value):
+    """Parse a comma-separated list of integer ids."""
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    from sync_limitless import get_connection
+
+    parser = argparse.ArgumentParser(description="Compute Swiss tiebreakers from match pairings")
+    parser.add_argument("--tournaments", type=parse_ids,
+                        help="Comma-separated tournament_ids to recompute")
+    parser.add_argument("--all", action="store_true",
+                        help="Recompute every tournament")
+    args = parser.parse_args()
+
+    if not args.all and not args.tournaments:
+        parser.error("Pass --tournaments or --all")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    stats = refresh_tiebreakers(cursor, None if args.all else args.tournaments)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    print(f"Tiebreakers: {stats['results']} results over {stats['tournaments']} tournaments")
+
+
+if __name__ == "__main__":
+    main()